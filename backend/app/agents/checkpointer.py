@@ -0,0 +1,166 @@
+"""
+LangGraph checkpointer selection.
+
+CHECKPOINTER=memory  → InMemorySaver (default; per process, unbounded)
+CHECKPOINTER=sqlite  → BoundedSqliteSaver: file-backed, shared across
+                       workers, keeps only the last K checkpoints per thread
+                       and drops threads idle for longer than the TTL
+"""
+import asyncio
+import logging
+import sqlite3
+import time
+from functools import lru_cache
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from app.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedSqliteSaver(SqliteSaver):
+    """
+    SqliteSaver that prunes old checkpoints and expired threads.
+
+    Only the newest `keep_last` checkpoints (and their pending writes) are
+    kept per thread; resuming an interrupted graph only needs the latest.
+    Threads with no checkpoint activity for `ttl_seconds` are swept every
+    `sweep_every` puts. Async methods run the synchronous ones in a worker
+    thread (the saver's lock serializes them), so SQLite I/O and busy
+    waits never block the event loop.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        keep_last: int = 2,
+        ttl_seconds: int = 86400,
+        sweep_every: int = 500,
+    ):
+        super().__init__(conn)
+        self.keep_last = max(keep_last, 1)
+        self.ttl_seconds = ttl_seconds
+        self.sweep_every = sweep_every
+        self._puts_since_sweep = 0
+
+    def setup(self) -> None:
+        if self.is_setup:
+            return
+        super().setup()
+        self.conn.executescript(
+            """
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS thread_activity (
+                thread_id TEXT PRIMARY KEY,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_thread_activity_updated
+                ON thread_activity(updated_at);
+            """
+        )
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = str(config["configurable"].get("checkpoint_ns", ""))
+        self._prune_thread(thread_id, checkpoint_ns)
+
+        self._puts_since_sweep += 1
+        if self._puts_since_sweep >= self.sweep_every:
+            self._puts_since_sweep = 0
+            self.delete_expired()
+        return next_config
+
+    def _prune_thread(self, thread_id: str, checkpoint_ns: str) -> None:
+        """Keep only the newest keep_last checkpoints for a thread namespace."""
+        with self.cursor() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO thread_activity (thread_id, updated_at) VALUES (?, ?)",
+                (thread_id, time.time()),
+            )
+            cur.execute(
+                """SELECT checkpoint_id FROM checkpoints
+                   WHERE thread_id = ? AND checkpoint_ns = ?
+                   ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?""",
+                (thread_id, checkpoint_ns, self.keep_last),
+            )
+            stale = [(thread_id, checkpoint_ns, row[0]) for row in cur.fetchall()]
+            if stale:
+                cur.executemany(
+                    "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    stale,
+                )
+                cur.executemany(
+                    "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    stale,
+                )
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        with self.cursor() as cur:
+            cur.execute("DELETE FROM thread_activity WHERE thread_id = ?", (str(thread_id),))
+
+    def delete_expired(self) -> int:
+        """Delete every thread idle for longer than ttl_seconds; returns the count."""
+        cutoff = time.time() - self.ttl_seconds
+        with self.cursor(transaction=False) as cur:
+            cur.execute("SELECT thread_id FROM thread_activity WHERE updated_at < ?", (cutoff,))
+            expired = [row[0] for row in cur.fetchall()]
+        for thread_id in expired:
+            self.delete_thread(thread_id)
+        return len(expired)
+
+    # ── Async API (the synchronous implementation, in a worker thread) ──
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+@lru_cache
+def get_checkpointer():
+    """Get the process-wide checkpointer configured from Settings."""
+    settings = get_settings()
+    if settings.checkpointer == "sqlite":
+        conn = sqlite3.connect(
+            settings.checkpoint_db_path, check_same_thread=False, timeout=10
+        )
+        return BoundedSqliteSaver(
+            conn,
+            keep_last=settings.checkpoint_keep_last,
+            ttl_seconds=settings.checkpoint_ttl_seconds,
+        )
+    if settings.checkpointer == "memory":
+        return InMemorySaver()
+    raise ValueError(
+        f"Unknown checkpointer: '{settings.checkpointer}'. Supported: ['memory', 'sqlite']"
+    )
+
+
+async def release_thread(thread_id: str) -> None:
+    """Drop all checkpoints for a finished interview thread."""
+    try:
+        await get_checkpointer().adelete_thread(thread_id)
+    except Exception as e:
+        logger.warning("Failed to delete checkpoints for %s: %s", thread_id, e)
@@ -0,0 +1,194 @@
+"""
+Local fake chat model for offline development and load testing.
+
+Selected with LLM_PROVIDER=fake; the fake providers are only registered
+when FAKE_LLM_ENABLED=true (the test suite and benchmarks set it), so a
+deployment can't select them by mistake. Returns canned, role-appropriate responses
+after a fixed latency (FAKE_LLM_LATENCY_MS) so the interview flow can be
+exercised end to end without API keys or network access. A share of calls
+(FAKE_LLM_TAIL_RATIO) can take FAKE_LLM_TAIL_MS instead, to model a slow
+tail. "fake-secondary" is a second fake provider with its own fixed
+latency (FAKE_SECONDARY_LATENCY_MS), for exercising request hedging.
+`with_structured_output` returns the canned JSON for the role validated
+against the requested schema, like a JSON-schema mode provider; queue
+outputs in `structured_outputs` (e.g. JSON that fails validation) to
+have successive structured calls return them first.
+"""
+import asyncio
+import json
+import random
+import time
+from typing import Any, AsyncIterator, Iterator
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import ValidationError
+
+from app.services.context_assembler import estimate_tokens
+
+
+FAKE_RESPONSES = {
+    "context": (
+        "1. Core concepts and terminology\n"
+        "2. Architecture and components\n"
+        "3. Common use cases and trade-offs"
+    ),
+    "question": "Can you explain the core concepts of this topic and when you would use it?",
+    "assessment": (
+        "SCORE: 80\n"
+        "FEEDBACK: Solid answer that covers the main points.\n"
+        "STRENGTHS: Clear explanation, Good structure\n"
+        "WEAKNESSES: Could include a concrete example\n"
+        "NEEDS_FOLLOWUP: NO"
+    ),
+}
+
+# Role models of the fake providers, merged into supervisor.MODEL_MAP
+# when FAKE_LLM_ENABLED=true
+FAKE_MODEL_MAP = {
+    "fake": {
+        "context": "fake-context",
+        "question": "fake-question",
+        "assessment": "fake-assessment",
+    },
+    # Second local fake with its own latency (hedging tests)
+    "fake-secondary": {
+        "context": "fake-secondary-context",
+        "question": "fake-secondary-question",
+        "assessment": "fake-secondary-assessment",
+    },
+}
+
+FAKE_STRUCTURED_RESPONSES = {
+    "assessment": json.dumps({
+        "score": 80,
+        "feedback": "Solid answer that covers the main points.",
+        "strengths": ["Clear explanation", "Good structure"],
+        "weaknesses": ["Could include a concrete example"],
+        "needs_followup": False,
+    }),
+}
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers with a canned response after a fixed delay."""
+
+    role: str = "question"
+    latency: float = 0.0
+    tail_latency: float = 0.0
+    tail_ratio: float = 0.0
+    response: str | None = None
+    # Returned in order by structured-output calls before the canned output
+    structured_outputs: list[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-interview-model"
+
+    def _sample_latency(self) -> float:
+        """Seconds this call takes: the tail latency for a tail_ratio share of calls."""
+        if self.tail_ratio and random.random() < self.tail_ratio:
+            return self.tail_latency
+        return self.latency
+
+    def _response_text(self) -> str:
+        if self.response is not None:
+            return self.response
+        return FAKE_RESPONSES.get(self.role, FAKE_RESPONSES["question"])
+
+    def _generate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        latency = self._sample_latency()
+        if latency:
+            time.sleep(latency)
+        message = AIMessage(content=self._response_text())
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        latency = self._sample_latency()
+        if latency:
+            await asyncio.sleep(latency)
+        message = AIMessage(content=self._response_text())
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def with_structured_output(self, schema, *, method: str = "json_schema", include_raw: bool = False, **kwargs: Any):
+        """Canned structured output for the role, validated against a pydantic schema."""
+        def build(text: str) -> Any:
+            raw = AIMessage(
+                content=text,
+                usage_metadata={
+                    "input_tokens": 0,
+                    "output_tokens": estimate_tokens(text),
+                    "total_tokens": estimate_tokens(text),
+                },
+            )
+            try:
+                parsed, error = schema.model_validate_json(text), None
+            except ValidationError as e:
+                parsed, error = None, e
+            if include_raw:
+                return {"raw": raw, "parsed": parsed, "parsing_error": error}
+            if error is not None:
+                raise error
+            return parsed
+
+        def text() -> str:
+            if self.structured_outputs:
+                return self.structured_outputs.pop(0)
+            return self.response if self.response is not None else FAKE_STRUCTURED_RESPONSES.get(self.role, "{}")
+
+        def run(messages) -> Any:
+            latency = self._sample_latency()
+            if latency:
+                time.sleep(latency)
+            return build(text())
+
+        async def arun(messages) -> Any:
+            latency = self._sample_latency()
+            if latency:
+                await asyncio.sleep(latency)
+            return build(text())
+
+        return RunnableLambda(run, afunc=arun)
+
+    def _tokens(self) -> list[str]:
+        """Split the response into word-sized tokens, keeping whitespace."""
+        text = self._response_text()
+        tokens = []
+        start = 0
+        for i, ch in enumerate(text):
+            if ch in " \n" and i > start:
+                tokens.append(text[start:i + 1])
+                start = i + 1
+        if start < len(text):
+            tokens.append(text[start:])
+        return tokens
+
+    def _stream(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        tokens = self._tokens()
+        delay = self._sample_latency() / max(len(tokens), 1)
+        for token in tokens:
+            if delay:
+                time.sleep(delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _astream(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        tokens = self._tokens()
+        delay = self._sample_latency() / max(len(tokens), 1)
+        for token in tokens:
+            if delay:
+                await asyncio.sleep(delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+def build_fake_model(provider: str, role: str, settings) -> FakeChatModel:
+    """Construct the fake model for a FAKE_MODEL_MAP provider and role."""
+    if provider == "fake-secondary":
+        return FakeChatModel(role=role, latency=settings.fake_secondary_latency_ms / 1000)
+    return FakeChatModel(
+        role=role,
+        latency=settings.fake_llm_latency_ms / 1000,
+        tail_latency=settings.fake_llm_tail_ms / 1000,
+        tail_ratio=settings.fake_llm_tail_ratio,
+    )
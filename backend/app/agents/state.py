@@ -1,6 +1,15 @@
 """Interview agent state definitions for StateGraph."""
 from typing import TypedDict, Annotated
-from operator import add
+
+
+def merge_messages(left: list | None, right) -> list:
+    """
+    Message reducer: appends like operator.add, but an update of the form
+    {"replace": [...]} overwrites the history (used by history compaction).
+    """
+    if isinstance(right, dict) and "replace" in right:
+        return list(right["replace"])
+    return (left or []) + list(right)
 
 
 class InterviewState(TypedDict):
@@ -10,22 +19,27 @@ class InterviewState(TypedDict):
     Uses TypedDict with Annotated reducers per LangGraph v1.0 patterns.
     """
     
-    # Message history (accumulates with add reducer)
-    messages: Annotated[list, add]
+    # Message history (accumulates; compaction replaces it with the last N turns)
+    messages: Annotated[list, merge_messages]
+    history_summary: dict  # folded older turns: {"turns_folded", "lines"}
     
     # Session configuration
     topic: str
     context: str  # RAG context from materials
+    context_is_digest: bool  # context is a precomputed key-areas digest
     max_followups: int
     
     # Question tracking
     current_question: str
     question_count: int
     followup_count: int
+    bank_asked: list[str]  # ids of questions served from the question bank
     
     # Answer and assessment
     current_answer: str
     last_assessment: dict | None
+    recent_assessments: list[dict]  # last K structured assessments
+    assessment_totals: dict  # running aggregates across all assessments
     needs_followup: bool
     
     # HITL (Human-in-the-Loop) flags
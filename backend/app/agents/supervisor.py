@@ -8,16 +8,26 @@ Uses StateGraph pattern from LangGraph v1.0 with:
 - Conditional edges for follow-up routing
 """
 from typing import TypedDict, Annotated, Literal
-from operator import add
+from collections import Counter
 from functools import lru_cache
+import threading
+import time
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.types import interrupt
 from langchain.chat_models import init_chat_model
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
+from pydantic import BaseModel, Field, StringConstraints
 from app.config import get_settings
+from app.agents.checkpointer import get_checkpointer
+from app.agents.state import merge_messages
+from app.services.context_assembler import estimate_tokens, truncate_to_tokens
+from app.services.llm_cache import CachedChatModel, get_llm_cache
+from app.services.llm_governor import GovernedChatModel, get_llm_governor
+from app.services.llm_hedging import HedgedChatModel, LatencyTracker
+from app.services.metrics import metrics
+from app.services.question_bank import QUESTION_SOURCES, BankQuestion, get_question_bank
 
 
 # ============ Swappable Model Provider Pattern ============
@@ -25,6 +35,12 @@ from app.config import get_settings
 # Switch ALL models between providers with a single env var:
 #   LLM_PROVIDER=openai   → OpenAI GPT models (default)
 #   LLM_PROVIDER=vertex   → Vertex AI Model Garden (mix of Gemini, Claude, Mistral)
+#   LLM_PROVIDER=fake     → local canned model; only with FAKE_LLM_ENABLED=true
+#                           (tests and benchmarks, see app.agents.fake_model)
+#
+# With LLM_HEDGE=true, a slow primary call is also sent to the same role's
+# model on LLM_SECONDARY_PROVIDER and the first answer wins (see
+# app.services.llm_hedging).
 #
 # The "vertex" provider demonstrates mix-and-match: each node uses a
 # different model family chosen for its strengths at that task.
@@ -49,29 +65,48 @@ MODEL_MAP = {
 }
 
 
-def get_model(role: str):
-    """
-    Get the appropriate chat model for a given node role.
-    
-    Swappable Provider Pattern:
-        - Reads LLM_PROVIDER from settings
-        - Maps the role to the optimized model for that provider
-        - Returns a LangChain-compatible chat model instance via init_chat_model
-    """
-    settings = get_settings()
-    llm_provider = settings.llm_provider
-    
-    if llm_provider not in MODEL_MAP:
-        raise ValueError(
-            f"Unknown model provider: '{llm_provider}'. "
-            f"Supported: {list(MODEL_MAP.keys())}"
+def _model_map(settings) -> dict:
+    """MODEL_MAP, plus the local fake providers when FAKE_LLM_ENABLED is set."""
+    if not settings.fake_llm_enabled:
+        return MODEL_MAP
+    from app.agents.fake_model import FAKE_MODEL_MAP
+    return {**MODEL_MAP, **FAKE_MODEL_MAP}
+
+
+# ============ Model Client Registry ============
+#
+# Chat model clients are built once per process and reused, keyed by
+# (provider, role, params). OpenAI clients share keep-alive httpx pools
+# sized from Settings so TLS sessions survive across node invocations.
+# Each client is wrapped by the shared LLM governor (concurrency, rate
+# limits, coalescing), then by the role's deadline / hedge when configured,
+# and then the response cache, so cache hits never queue for a slot.
+# close_model_clients() is called from the FastAPI lifespan on shutdown.
+#
+
+_model_registry: dict[tuple, object] = {}
+_model_registry_lock = threading.Lock()
+_http_clients: dict[str, object] = {}
+# Observed latencies per (provider, role), for hedge delays
+_latency_tracker = LatencyTracker()
+
+
+def _get_http_clients(settings) -> tuple:
+    """Get (or lazily create) the shared sync/async httpx clients."""
+    if not _http_clients:
+        import httpx
+        limits = httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive_connections,
+            keepalive_expiry=settings.llm_keepalive_expiry,
         )
-    
-    model_name = MODEL_MAP[llm_provider][role]
-    
-    # Configure init_chat_model parameters based on provider
-    common_kwargs = {"temperature": 0}
-    
+        _http_clients["sync"] = httpx.Client(limits=limits)
+        _http_clients["async"] = httpx.AsyncClient(limits=limits)
+    return _http_clients["sync"], _http_clients["async"]
+
+
+def _build_model(llm_provider: str, role: str, model_name: str, settings, **common_kwargs):
+    """Construct a new chat model client for a provider/role."""
     if llm_provider == "vertex":
         # Use google_genai provider with vertexai=True for the Unified SDK
         return init_chat_model(
@@ -84,36 +119,151 @@ def get_model(role: str):
         )
         
     elif llm_provider == "openai":
+         http_client, http_async_client = _get_http_clients(settings)
          return init_chat_model(
              model=model_name, 
              model_provider="openai", 
+             http_client=http_client,
+             http_async_client=http_async_client,
              **common_kwargs
          )
 
+    elif settings.fake_llm_enabled and llm_provider in ("fake", "fake-secondary"):
+        from app.agents.fake_model import build_fake_model
+        return build_fake_model(llm_provider, role, settings)
+
     raise ValueError(f"Provider {llm_provider} not fully configured in get_model")
 
 
+def _get_provider_model(llm_provider: str, role: str, settings):
+    """Get the pooled, governed client for a provider's model for a role."""
+    model_name = _model_map(settings)[llm_provider][role]
+    
+    # Configure init_chat_model parameters based on provider
+    common_kwargs = {"temperature": 0}
+    
+    key = (
+        llm_provider,
+        role,
+        model_name,
+        tuple(sorted(common_kwargs.items())),
+        settings.gcp_project_id if llm_provider == "vertex" else None,
+        (settings.fake_llm_latency_ms, settings.fake_llm_tail_ms, settings.fake_llm_tail_ratio)
+        if llm_provider == "fake" else None,
+        settings.fake_secondary_latency_ms if llm_provider == "fake-secondary" else None,
+    )
+    model = _model_registry.get(key)
+    if model is not None:
+        return model
+    
+    with _model_registry_lock:
+        model = _model_registry.get(key)
+        if model is None:
+            model = _build_model(llm_provider, role, model_name, settings, **common_kwargs)
+            model = GovernedChatModel(model, get_llm_governor(), llm_provider, model_name, role)
+            _model_registry[key] = model
+    return model
+
+
+def get_model(role: str):
+    """
+    Get the appropriate chat model for a given node role.
+    
+    Swappable Provider Pattern:
+        - Reads LLM_PROVIDER from settings
+        - Maps the role to the optimized model for that provider
+        - Returns a pooled LangChain-compatible chat model instance,
+          built via init_chat_model on first use
+        - Adds the role's deadline and hedging to LLM_SECONDARY_PROVIDER
+          when configured
+    """
+    settings = get_settings()
+    llm_provider = settings.llm_provider
+    secondary = settings.llm_secondary_provider if settings.llm_hedge else ""
+    
+    models = _model_map(settings)
+    for provider in filter(None, (llm_provider, secondary)):
+        if provider not in models:
+            raise ValueError(
+                f"Unknown model provider: '{provider}'. "
+                f"Supported: {list(models.keys())}"
+            )
+    if secondary == llm_provider:
+        secondary = ""
+    
+    deadline_ms = getattr(settings, f"llm_deadline_ms_{role}", 0)
+    key = ("role", llm_provider, secondary, role, deadline_ms, settings.llm_cache_enabled)
+    model = _model_registry.get(key)
+    if model is not None:
+        return model
+    
+    # Provider clients take the registry lock themselves
+    primary = _get_provider_model(llm_provider, role, settings)
+    secondary_model = _get_provider_model(secondary, role, settings) if secondary else None
+    
+    with _model_registry_lock:
+        model = _model_registry.get(key)
+        if model is None:
+            model = primary
+            if secondary_model is not None or deadline_ms:
+                model = HedgedChatModel(
+                    primary,
+                    secondary_model,
+                    role,
+                    (llm_provider, secondary),
+                    _latency_tracker,
+                    deadline_ms=deadline_ms,
+                    hedge_percentile=settings.llm_hedge_percentile,
+                    hedge_min_samples=settings.llm_hedge_min_samples,
+                    hedge_initial_ms=settings.llm_hedge_initial_ms,
+                )
+            if settings.llm_cache_enabled:
+                model = CachedChatModel(model, get_llm_cache(), models[llm_provider][role], role)
+            _model_registry[key] = model
+    return model
+
+
+async def close_model_clients() -> None:
+    """Drop pooled model clients and close the shared HTTP connection pools."""
+    with _model_registry_lock:
+        _model_registry.clear()
+        _structured_models.clear()
+        # Semaphores and buckets belong to the event loop that used them
+        get_llm_governor.cache_clear()
+        clients = dict(_http_clients)
+        _http_clients.clear()
+    if "async" in clients:
+        await clients["async"].aclose()
+    if "sync" in clients:
+        clients["sync"].close()
+
+
 # ============ State Definition ============
 
 class InterviewState(TypedDict):
     """State for the interview workflow using TypedDict."""
     
-    # Message history (accumulates with reducer)
-    messages: Annotated[list, add]
+    # Message history (accumulates; compaction replaces it with the last N turns)
+    messages: Annotated[list, merge_messages]
+    history_summary: dict
     
     # Session configuration
     topic: str
     context: str  # RAG context from materials
+    context_is_digest: bool  # context is a precomputed key-areas digest
     max_followups: int
     
     # Question tracking
     current_question: str
     question_count: int
     followup_count: int
+    bank_asked: list  # ids of questions served from the question bank
     
     # Answer and assessment
     current_answer: str
     last_assessment: dict | None
+    recent_assessments: list
+    assessment_totals: dict
     needs_followup: bool
     
     # HITL flags
@@ -134,28 +284,77 @@ def _get_content_string(response) -> str:
     return str(content).strip()
 
 
-def gather_context_node(state: InterviewState) -> dict:
-    """
-    Gather context from materials and/or research the topic.
-    This prepares the context for question generation.
-    """
+def _get_content_string_raw(chunk) -> str:
+    """Like _get_content_string but keeps whitespace (for streamed chunks)."""
+    content = chunk.content
+    if isinstance(content, list):
+        return "".join(
+            c.get("text", "") if isinstance(c, dict) else str(c) for c in content
+        )
+    return str(content)
+
+
+async def analyze_context(topic: str, context: str) -> str:
+    """Ask the context model for the key areas of a topic given source material."""
     model = get_model("context")
+    context = truncate_to_tokens(context, get_settings().prompt_context_tokens_context)
     
     messages = [
         SystemMessage(content="""You are a Document Analyst. Analyze the provided 
 context and topic to identify key concepts, definitions, and areas suitable 
 for interview questions. Summarize the most important points."""),
-        HumanMessage(content=f"""Topic: {state['topic']}
+        HumanMessage(content=f"""Topic: {topic}
 
 Available Context:
-{state.get('context', 'No materials provided. Use general knowledge.')}
+{context}
 
 Identify 3-5 key areas that should be assessed in an interview about this topic.""")
     ]
     
-    response = model.invoke(messages)
+    response = await model.ainvoke(messages)
+    
+    return _get_content_string(response)
+
+
+async def combine_key_areas(topic: str, analyses: list[str]) -> str:
+    """Merge key-area analyses of consecutive parts of one material into one."""
+    model = get_model("context")
+    parts = "\n\n".join(f"Part {i}:\n{analysis}" for i, analysis in enumerate(analyses, start=1))
+    parts = truncate_to_tokens(parts, get_settings().prompt_context_tokens_context)
+
+    messages = [
+        SystemMessage(content="""You are a Document Analyst. You are given the key
+areas identified in consecutive parts of one document. Merge them into an
+overview of the whole document, keeping the most important points."""),
+        HumanMessage(content=f"""Topic: {topic}
+
+Key areas by part:
+{parts}
+
+Identify 3-5 key areas that should be assessed in an interview about the whole document.""")
+    ]
+
+    response = await model.ainvoke(messages)
+
+    return _get_content_string(response)
+
+
+async def gather_context_node(state: InterviewState) -> dict:
+    """
+    Gather context from materials and/or research the topic.
+    This prepares the context for question generation.
     
-    content = _get_content_string(response)
+    If the session was started with a precomputed digest of the topic
+    (context_is_digest), the context already is the analysis and no model
+    call is made.
+    """
+    if state.get("context_is_digest"):
+        content = state["context"]
+    else:
+        content = await analyze_context(
+            state["topic"],
+            state.get('context', 'No materials provided. Use general knowledge.'),
+        )
     
     return {
         "messages": [AIMessage(content=f"[Context Analysis] {content}")],
@@ -163,29 +362,58 @@ Identify 3-5 key areas that should be assessed in an interview about this topic.
     }
 
 
-def generate_question_node(state: InterviewState) -> dict:
+def next_is_followup(state: InterviewState) -> bool:
+    """Whether the next question should be a follow-up to the last answer."""
+    return state.get("needs_followup", False) and state["followup_count"] < state["max_followups"]
+
+
+def _bank_turn(state: InterviewState) -> bool:
     """
-    Generate the next interview question based on context.
-    Returns ONE question at a time to simulate real interview.
+    Whether the next new question should come from the study-guide bank,
+    per QUESTION_SOURCE: "llm" never, "bank" always, "hybrid" for every
+    other question.
     """
-    model = get_model("question")
-    
+    source = get_settings().question_source
+    if source not in QUESTION_SOURCES:
+        raise ValueError(f"Unknown question source: '{source}'. Supported: {list(QUESTION_SOURCES)}")
+    return source == "bank" or (source == "hybrid" and state["question_count"] % 2 == 0)
+
+
+def serves_from_bank(state: InterviewState) -> bool:
+    """Whether the next new question is a bank question (no model call)."""
+    return _bank_turn(state) and get_question_bank().match_topic(state["topic"]) is not None
+
+
+def _pick_bank_question(state: InterviewState, is_followup: bool) -> BankQuestion | None:
+    """
+    Next question from the study-guide bank, or None to generate one.
+    Follow-ups always come from the model, since they depend on the
+    answer; so do new questions once the topic's bank questions run out.
+    """
+    if is_followup or not _bank_turn(state):
+        return None
+    return get_question_bank().next_question(state["topic"], state.get("bank_asked"))
+
+
+def _build_question_messages(state: InterviewState) -> tuple[list, bool]:
+    """Build the question prompt; returns (messages, is_followup)."""
     # Determine if this is a follow-up or new question
-    is_followup = state.get("needs_followup", False) and state["followup_count"] < state["max_followups"]
+    is_followup = next_is_followup(state)
+    context = truncate_to_tokens(state['context'], get_settings().prompt_context_tokens_question)
     
     if is_followup:
         prompt = f"""Generate a follow-up question to clarify the candidate's 
 previous answer. The answer was: "{state.get('current_answer', '')}"
 
 Topic: {state['topic']}
-Context: {state['context']}
+Context: {context}
 
 Generate ONE specific follow-up question that probes deeper into their understanding."""
     else:
         prompt = f"""Generate an interview question for the following topic.
 
 Topic: {state['topic']}
-Context: {state['context']}
+Context: {context}
 Questions asked so far: {state['question_count']}
 
 Generate ONE clear, focused question. Mix difficulty levels across questions.
@@ -197,10 +425,16 @@ interview practice. Generate clear, focused questions that test understanding,
 not just recall. Be encouraging but maintain professionalism."""),
         HumanMessage(content=prompt)
     ]
-    
-    response = model.invoke(messages)
-    question = _get_content_string(response)
-    
+    return messages, is_followup
+
+
+def _question_update(
+    state: InterviewState,
+    question: str,
+    is_followup: bool,
+    bank_question_id: str | None = None,
+) -> dict:
+    """Build the state update for a newly generated (or bank) question."""
     # Update counts based on question type
     new_question_count = state["question_count"]
     new_followup_count = state["followup_count"]
@@ -212,7 +446,7 @@ not just recall. Be encouraging but maintain professionalism."""),
         # Reset followup count for new question
         new_followup_count = 0
     
-    return {
+    update = {
         "messages": [AIMessage(content=f"[Question] {question}")],
         "current_question": question,
         "question_count": new_question_count,
@@ -220,25 +454,146 @@ not just recall. Be encouraging but maintain professionalism."""),
         "needs_followup": False,  # Reset after generating
         "awaiting_approval": False
     }
+    if bank_question_id:
+        update["bank_asked"] = [*state.get("bank_asked", []), bank_question_id]
+    return update
 
 
-def assess_answer_node(state: InterviewState) -> dict:
+async def generate_question_node(state: InterviewState) -> dict:
     """
-    Assess the candidate's answer and determine if follow-up is needed.
-    Uses structured output for consistent assessment format.
+    Generate the next interview question based on context.
+    Returns ONE question at a time to simulate real interview.
+    New questions may be served from the question bank without a model
+    call (see QUESTION_SOURCE).
     """
-    model = get_model("assessment")
+    bank_question = _pick_bank_question(state, next_is_followup(state))
+    if bank_question is not None:
+        metrics.incr("question_source.bank")
+        return _question_update(state, bank_question.question, False, bank_question.question_id)
     
-    messages = [
-        SystemMessage(content="""You are a Performance Critic assessing interview answers.
-Evaluate for: accuracy, completeness, clarity, and practical understanding.
+    metrics.incr("question_source.llm")
+    model = get_model("question")
+    messages, is_followup = _build_question_messages(state)
+    
+    response = await model.ainvoke(messages)
+    question = _get_content_string(response)
+    
+    return _question_update(state, question, is_followup)
+
+
+async def stream_question(state: InterviewState):
+    """
+    Streaming variant of generate_question_node.
+
+    Yields ("token", str) for each chunk as the model produces it, then
+    ("update", dict) with the same state update the node would return.
+    A bank question is yielded as a single token.
+    """
+    bank_question = _pick_bank_question(state, next_is_followup(state))
+    if bank_question is not None:
+        metrics.incr("question_source.bank")
+        yield "token", bank_question.question
+        yield "update", _question_update(state, bank_question.question, False, bank_question.question_id)
+        return
+    
+    metrics.incr("question_source.llm")
+    model = get_model("question")
+    messages, is_followup = _build_question_messages(state)
+    
+    parts = []
+    async for chunk in model.astream(messages):
+        token = _get_content_string_raw(chunk)
+        if token:
+            parts.append(token)
+            yield "token", token
+    
+    yield "update", _question_update(state, "".join(parts).strip(), is_followup)
+
+
+# ── Structured assessment output ──
+#
+# ASSESSMENT_OUTPUT=json_schema|function_calling asks the model for an
+# AssessmentOutput object instead of the SCORE/FEEDBACK text block. The
+# compact field limits bound the output tokens (and so latency); an output
+# that fails validation is retried with the error, and after
+# ASSESSMENT_MAX_RETRIES the text format is used instead.
+
+ASSESSMENT_OUTPUT_MODES = ("text", "json_schema", "function_calling")
+FEEDBACK_MAX_CHARS = 400
+ASSESSMENT_LIST_MAX_ITEMS = 3
+ASSESSMENT_ITEM_MAX_CHARS = 80
+
+_AssessmentItem = Annotated[str, StringConstraints(max_length=ASSESSMENT_ITEM_MAX_CHARS)]
+
 
-Provide your assessment in this exact format:
+class AssessmentOutput(BaseModel):
+    """Assessment of one interview answer."""
+    score: int = Field(ge=0, le=100, description="Overall score from 0 to 100")
+    feedback: str = Field(
+        max_length=FEEDBACK_MAX_CHARS,
+        description=f"Constructive feedback, at most {FEEDBACK_MAX_CHARS} characters",
+    )
+    strengths: list[_AssessmentItem] = Field(
+        max_length=ASSESSMENT_LIST_MAX_ITEMS,
+        description=f"Up to {ASSESSMENT_LIST_MAX_ITEMS} key strengths, each a short phrase",
+    )
+    weaknesses: list[_AssessmentItem] = Field(
+        max_length=ASSESSMENT_LIST_MAX_ITEMS,
+        description=f"Up to {ASSESSMENT_LIST_MAX_ITEMS} areas to improve, each a short phrase",
+    )
+    needs_followup: bool = Field(
+        description="True only if the answer was incomplete or unclear"
+    )
+
+
+_structured_models: dict[tuple, tuple] = {}
+
+
+def _get_structured_model(model, method: str):
+    """Structured-output runnable for a pooled model (built once per model and method)."""
+    key = (id(model), method)
+    entry = _structured_models.get(key)
+    if entry is None:
+        with _model_registry_lock:
+            entry = _structured_models.get(key)
+            if entry is None:
+                # Keep the model referenced so its id can't be reused
+                entry = (model, model.with_structured_output(
+                    AssessmentOutput, method=method, include_raw=True
+                ))
+                _structured_models[key] = entry
+    return entry[1]
+
+
+def _output_tokens(message) -> int:
+    """Output tokens of a model response (estimated if the provider didn't report usage)."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    if usage.get("output_tokens"):
+        return usage["output_tokens"]
+    text = _get_content_string(message) if message is not None else ""
+    tool_calls = getattr(message, "tool_calls", None) or []
+    return estimate_tokens(text + "".join(str(call.get("args", "")) for call in tool_calls))
+
+
+def _build_assessment_messages(state: InterviewState, structured: bool = False) -> list:
+    """Build the assessment prompt for the current question and answer."""
+    if structured:
+        instructions = f"""Return the assessment as the requested structured object. Be concise:
+feedback at most {FEEDBACK_MAX_CHARS} characters, at most {ASSESSMENT_LIST_MAX_ITEMS} strengths 
+and {ASSESSMENT_LIST_MAX_ITEMS} weaknesses of a few words each. Set needs_followup only if the 
+answer was incomplete or unclear."""
+    else:
+        instructions = """Provide your assessment in this exact format:
 SCORE: [0-100]
 FEEDBACK: [Detailed constructive feedback]
 STRENGTHS: [Key strengths, comma-separated]
 WEAKNESSES: [Areas for improvement, comma-separated]
-NEEDS_FOLLOWUP: [YES or NO - only YES if answer was incomplete or unclear]"""),
+NEEDS_FOLLOWUP: [YES or NO - only YES if answer was incomplete or unclear]"""
+    return [
+        SystemMessage(content=f"""You are a Performance Critic assessing interview answers.
+Evaluate for: accuracy, completeness, clarity, and practical understanding.
+
+{instructions}"""),
         HumanMessage(content=f"""Question: {state['current_question']}
 
 Candidate's Answer: {state['current_answer']}
@@ -247,12 +602,23 @@ Topic Context: {state['topic']}
 
 Assess this answer:""")
     ]
-    
-    response = model.invoke(messages)
-    assessment_text = _get_content_string(response)
-    
-    # Parse assessment (simple parsing - production would use structured output)
-    assessment = _parse_assessment(assessment_text)
+
+
+def _format_assessment(assessment: dict) -> str:
+    """Render a structured assessment in the text format (for message history)."""
+    return "\n".join([
+        f"SCORE: {assessment['score']}",
+        f"FEEDBACK: {assessment['feedback']}",
+        f"STRENGTHS: {', '.join(assessment['strengths'])}",
+        f"WEAKNESSES: {', '.join(assessment['weaknesses'])}",
+        f"NEEDS_FOLLOWUP: {'YES' if assessment['needs_followup'] else 'NO'}",
+    ])
+
+
+def _assessment_update(state: InterviewState, assessment_text: str, assessment: dict | None = None) -> dict:
+    """Build the state update for an assessment (parsed from text unless given)."""
+    if assessment is None:
+        assessment = _parse_assessment(assessment_text)
     
     # Determine if follow-up is needed and allowed
     needs_followup = (
@@ -260,14 +626,118 @@ Assess this answer:""")
         state["followup_count"] < state["max_followups"]
     )
     
+    settings = get_settings()
+    recent = (state.get("recent_assessments") or []) + [
+        {**assessment, "question": state.get("current_question", "")}
+    ]
+    
     return {
         "messages": [AIMessage(content=f"[Assessment] {assessment_text}")],
         "last_assessment": assessment,
+        "recent_assessments": recent[-settings.assessment_keep_recent:],
+        "assessment_totals": _update_assessment_totals(
+            state.get("assessment_totals"), assessment
+        ),
         "needs_followup": needs_followup,
         "awaiting_approval": True  # Trigger HITL
     }
 
 
+def _assessment_mode() -> str:
+    mode = get_settings().assessment_output
+    if mode not in ASSESSMENT_OUTPUT_MODES:
+        raise ValueError(f"Unknown assessment output: '{mode}'. Supported: {list(ASSESSMENT_OUTPUT_MODES)}")
+    return mode
+
+
+def _record_assessment_call(mode: str, started: float, response) -> None:
+    """Per-call latency and output tokens (tokens / calls gives the mean)."""
+    metrics.observe(f"assessment.{mode}.latency", (time.perf_counter() - started) * 1000)
+    metrics.incr(f"assessment.{mode}.calls")
+    metrics.incr(f"assessment.{mode}.output_tokens", _output_tokens(response))
+
+
+async def _structured_assessment(state: InterviewState, mode: str) -> dict | None:
+    """
+    Assess via structured output; None if every attempt failed validation.
+    The validated object maps one to one onto AssessmentResult.
+    """
+    runnable = _get_structured_model(get_model("assessment"), mode)
+    messages = _build_assessment_messages(state, structured=True)
+    for attempt in range(get_settings().assessment_max_retries + 1):
+        started = time.perf_counter()
+        result = await runnable.ainvoke(messages)
+        _record_assessment_call(mode, started, result["raw"])
+        if result["parsed"] is not None:
+            return result["parsed"].model_dump()
+        metrics.incr(f"assessment.{mode}.invalid")
+        error = str(result["parsing_error"])[:300]
+        messages = messages + [HumanMessage(
+            content=f"The previous output was invalid: {error}\nReturn the assessment again, "
+                    f"following the schema and its length limits."
+        )]
+    return None
+
+
+async def assess_answer_node(state: InterviewState) -> dict:
+    """
+    Assess the candidate's answer and determine if follow-up is needed.
+    Uses structured output (ASSESSMENT_OUTPUT) when configured, falling
+    back to the parsed text format.
+    """
+    mode = _assessment_mode()
+    if mode != "text":
+        assessment = await _structured_assessment(state, mode)
+        if assessment is not None:
+            return _assessment_update(state, _format_assessment(assessment), assessment)
+        metrics.incr("assessment.structured_fallback")
+    
+    model = get_model("assessment")
+    messages = _build_assessment_messages(state)
+    
+    started = time.perf_counter()
+    response = await model.ainvoke(messages)
+    _record_assessment_call("text", started, response)
+    assessment_text = _get_content_string(response)
+    
+    return _assessment_update(state, assessment_text)
+
+
+async def stream_assessment(state: InterviewState):
+    """
+    Streaming variant of assess_answer_node.
+
+    Yields ("token", str) for each chunk as the model produces it, then
+    ("update", dict) with the same state update the node would return.
+    In structured mode the object arrives whole, so its text rendering is
+    yielded as a single token.
+    """
+    mode = _assessment_mode()
+    if mode != "text":
+        assessment = await _structured_assessment(state, mode)
+        if assessment is not None:
+            text = _format_assessment(assessment)
+            yield "token", text
+            yield "update", _assessment_update(state, text, assessment)
+            return
+        metrics.incr("assessment.structured_fallback")
+    
+    model = get_model("assessment")
+    messages = _build_assessment_messages(state)
+    
+    started = time.perf_counter()
+    parts = []
+    async for chunk in model.astream(messages):
+        token = _get_content_string_raw(chunk)
+        if token:
+            parts.append(token)
+            yield "token", token
+    text = "".join(parts).strip()
+    _record_assessment_call("text", started, AIMessage(content=text))
+    
+    yield "update", _assessment_update(state, text)
+
+
 def _parse_assessment(text: str) -> dict:
     """Parse structured assessment from model response."""
     assessment = {
@@ -302,6 +772,79 @@ def _parse_assessment(text: str) -> dict:
     return assessment
 
 
+# ============ History Compaction ============
+#
+# Long practice sessions would otherwise grow state without bound. After
+# each question the history is compacted: the last N turns (a turn starts
+# at a [Question] message) stay verbatim, older turns are folded into a
+# bounded summary record, and structured assessments live in
+# recent_assessments / assessment_totals rather than in message text.
+#
+
+_SUMMARY_MAX_LINES = 20
+_TOTALS_MAX_TAGS = 20
+
+
+def _update_assessment_totals(totals: dict | None, assessment: dict) -> dict:
+    """Fold one assessment into the bounded running aggregates."""
+    totals = dict(totals or {"count": 0, "score_total": 0, "strengths": {}, "weaknesses": {}})
+    totals["count"] += 1
+    totals["score_total"] += assessment.get("score", 0)
+    for field in ("strengths", "weaknesses"):
+        counts = Counter(totals.get(field) or {})
+        counts.update(assessment.get(field, []))
+        totals[field] = dict(counts.most_common(_TOTALS_MAX_TAGS))
+    return totals
+
+
+def _message_text(msg) -> str:
+    return getattr(msg, "content", str(msg))
+
+
+def compact_history(state: InterviewState, keep_turns: int | None = None) -> dict:
+    """
+    Keep the last keep_turns turns verbatim and fold older ones into
+    history_summary. Returns an empty update when nothing needs folding.
+    """
+    if keep_turns is None:
+        keep_turns = get_settings().history_keep_turns
+    messages = state.get("messages") or []
+    
+    turn_starts = [
+        i for i, msg in enumerate(messages)
+        if _message_text(msg).startswith("[Question]")
+    ]
+    if len(turn_starts) <= keep_turns:
+        return {}
+    
+    cut = turn_starts[-keep_turns] if keep_turns > 0 else len(messages)
+    preamble = messages[:turn_starts[0]]
+    folded = messages[turn_starts[0]:cut]
+    
+    summary = dict(state.get("history_summary") or {"turns_folded": 0, "lines": []})
+    lines = list(summary.get("lines", []))
+    for msg in folded:
+        text = _message_text(msg)
+        if text.startswith("[Question]"):
+            question = text[len("[Question]"):].strip()
+            lines.append(f"Q: {question[:120]}")
+            summary["turns_folded"] = summary.get("turns_folded", 0) + 1
+        elif text.startswith("[Assessment]") and lines:
+            score = _parse_assessment(text[len("[Assessment]"):]).get("score")
+            lines[-1] = f"{lines[-1]} | score: {score}"
+    summary["lines"] = lines[-_SUMMARY_MAX_LINES:]
+    
+    return {
+        "messages": {"replace": preamble + messages[cut:]},
+        "history_summary": summary,
+    }
+
+
+def compact_history_node(state: InterviewState) -> dict:
+    """Graph node wrapper around compact_history."""
+    return compact_history(state)
+
+
 def hitl_approval_node(state: InterviewState) -> dict:
     """
     Human-in-the-Loop node for reviewing assessment before proceeding.
@@ -375,6 +918,7 @@ def build_interview_graph(checkpointer=None):
     Workflow:
     1. gather_context - Analyze topic and materials
     2. generate_question - Create interview question
+       (then compact_history - fold old turns into a bounded summary)
     3. [External: User provides answer]
     4. assess - Evaluate the answer
     5. hitl_approval - Human reviews assessment
@@ -387,6 +931,7 @@ def build_interview_graph(checkpointer=None):
     graph.add_node("generate_question", generate_question_node)
     graph.add_node("assess", assess_answer_node)
     graph.add_node("hitl_approval", hitl_approval_node)
+    graph.add_node("compact_history", compact_history_node)
     
     # Add edges
     graph.add_edge(START, "gather_context")
@@ -394,7 +939,8 @@ def build_interview_graph(checkpointer=None):
     
     # After question generation, we pause for user answer
     # The answer is provided externally via state update
-    graph.add_edge("generate_question", END)  # Pause for answer
+    graph.add_edge("generate_question", "compact_history")
+    graph.add_edge("compact_history", END)  # Pause for answer
     
     # Assessment flow (triggered separately with answer)
     graph.add_conditional_edges(
@@ -417,10 +963,11 @@ def build_interview_graph(checkpointer=None):
         }
     )
     
-    # Compile with checkpointer for persistence
+    # Compile with checkpointer for persistence (memory or bounded SQLite,
+    # selected by CHECKPOINTER)
     if checkpointer:
         return graph.compile(checkpointer=checkpointer)
-    return graph.compile(checkpointer=InMemorySaver())
+    return graph.compile(checkpointer=get_checkpointer())
 
 
 # ============ Graph Factory ============
@@ -437,14 +984,19 @@ def create_interview_session(settings=None) -> dict:
         settings = get_settings()
     return {
         "messages": [],
+        "history_summary": {"turns_folded": 0, "lines": []},
         "topic": "",
         "context": "",
+        "context_is_digest": False,
         "max_followups": settings.max_follow_ups,
         "current_question": "",
         "question_count": 0,
         "followup_count": 0,
+        "bank_asked": [],
         "current_answer": "",
         "last_assessment": None,
+        "recent_assessments": [],
+        "assessment_totals": {"count": 0, "score_total": 0, "strengths": {}, "weaknesses": {}},
         "needs_followup": False,
         "awaiting_approval": False,
         "approved": True
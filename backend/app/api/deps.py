@@ -5,6 +5,14 @@ from fastapi import Depends
 
 from app.config import Settings, get_settings
 from app.services.vectorstore import VectorStoreService
+from app.services.ingest_jobs import IngestionJobQueue
+from app.services.topic_digests import TopicDigests
+from app.services.question_prefetch import QuestionPrefetcher
+from app.services.session_store import (
+    SessionStore,
+    InMemorySessionStore,
+    SQLiteSessionStore,
+)
 
 
 # Settings dependency
@@ -16,19 +24,84 @@ SettingsDep = Annotated[Settings, Depends(get_settings)]
 def get_vectorstore_service() -> VectorStoreService:
     """Get cached vector store service instance."""
     settings = get_settings()
-    return VectorStoreService(persist_dir=settings.chroma_persist_dir)
+    return VectorStoreService(
+        persist_dir=settings.chroma_persist_dir,
+        index_batch_size=settings.index_batch_size,
+        embed_workers=settings.embed_workers,
+        pdf_workers=settings.pdf_workers,
+        pdf_pages_per_task=settings.pdf_pages_per_task,
+        query_cache_size=settings.query_cache_size,
+        retrieval_mode=settings.retrieval_mode,
+    )
 
 
 VectorStoreDep = Annotated[VectorStoreService, Depends(get_vectorstore_service)]
 
 
-# Session store for active interviews (in-memory for demo)
-_interview_sessions: dict[str, dict] = {}
+# Precomputed topic digests (singleton)
+@lru_cache
+def get_topic_digests() -> TopicDigests:
+    """Get the topic digest builder/matcher."""
+    return TopicDigests(
+        vectorstore=get_vectorstore_service(),
+        max_sections=get_settings().digest_max_sections,
+        max_parts=get_settings().digest_max_parts,
+    )
+
+
+TopicDigestsDep = Annotated[TopicDigests, Depends(get_topic_digests)]
+
+
+# Ingestion job queue (singleton)
+@lru_cache
+def get_ingestion_queue() -> IngestionJobQueue:
+    """Get the background ingestion job queue."""
+    settings = get_settings()
+    return IngestionJobQueue(
+        vectorstore=get_vectorstore_service(),
+        workers=settings.ingest_workers,
+        max_queued=settings.ingest_max_queued,
+        keep_finished=settings.ingest_jobs_keep,
+        digests=get_topic_digests() if settings.ingest_digests else None,
+    )
+
+
+IngestionQueueDep = Annotated[IngestionJobQueue, Depends(get_ingestion_queue)]
 
 
-def get_session_store() -> dict[str, dict]:
-    """Get the interview session store."""
-    return _interview_sessions
+# Per-session question prefetch queues (singleton)
+@lru_cache
+def get_question_prefetcher() -> QuestionPrefetcher:
+    """Get the background question prefetcher."""
+    settings = get_settings()
+    return QuestionPrefetcher(
+        depth=settings.prefetch_questions,
+        max_concurrent=settings.prefetch_max_concurrent,
+        max_sessions=settings.prefetch_max_sessions,
+        ttl_seconds=settings.prefetch_ttl_seconds,
+    )
+
+
+QuestionPrefetcherDep = Annotated[QuestionPrefetcher, Depends(get_question_prefetcher)]
+
+
+# Session store for active interviews (singleton)
+# SESSION_STORE=memory  → single worker, lost on restart (default)
+# SESSION_STORE=sqlite  → shared by all workers on the host, survives restarts
+@lru_cache
+def get_session_store() -> SessionStore:
+    """Get the configured interview session store."""
+    settings = get_settings()
+    if settings.session_store == "sqlite":
+        return SQLiteSessionStore(
+            db_path=settings.session_db_path,
+            cache_size=settings.session_cache_size,
+        )
+    if settings.session_store == "memory":
+        return InMemorySessionStore()
+    raise ValueError(
+        f"Unknown session store: '{settings.session_store}'. Supported: ['memory', 'sqlite']"
+    )
 
 
-SessionStoreDep = Annotated[dict[str, dict], Depends(get_session_store)]
+SessionStoreDep = Annotated[SessionStore, Depends(get_session_store)]
@@ -0,0 +1,147 @@
+"""Bulk offline assessment routes."""
+import io
+import json
+import tempfile
+import uuid
+from typing import Callable, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import SettingsDep
+from app.models.schemas import ErrorResponse
+from app.services.bulk_assessment import BulkAssessmentRun, aiter_jsonl, run_results_path
+
+
+router = APIRouter(prefix="/assessments", tags=["assessments"])
+
+# Runs currently streaming in this worker (a run's results file has one writer)
+_active_runs: set[str] = set()
+
+# Request bodies up to this size are spooled in memory, larger ones on disk
+SPOOL_MEMORY_BYTES = 8 * 1024 * 1024
+
+
+class _RunResponse(StreamingResponse):
+    """
+    Streams a run's results and releases the run when the response ends,
+    including when the client left before the body started (the body
+    generator's own `finally` never runs then).
+    """
+
+    def __init__(self, content, release: Callable[[], None], **kwargs):
+        super().__init__(content, **kwargs)
+        self.release = release
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
+            self.release()
+
+
+def _results_path_or_400(settings, run_id: str) -> str:
+    path = run_results_path(settings.bulk_runs_dir, run_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="run_id may only contain letters, digits, '-' and '_' (max 100)"
+        )
+    return path
+
+
+@router.post(
+    "/batch",
+    responses={400: {"model": ErrorResponse}, 409: {"model": ErrorResponse}, 413: {"model": ErrorResponse}},
+    summary="Bulk assess transcripts",
+    description="Assess a JSONL body of {id?, question, answer, topic?} records; results stream back as NDJSON."
+)
+async def assess_batch(
+    request: Request,
+    settings: SettingsDep,
+    run_id: Optional[str] = Query(None, description="Resume (or name) a run; records already assessed in it are skipped"),
+    concurrency: Optional[int] = Query(None, ge=1, le=64, description="Assessments in flight (default BULK_ASSESS_CONCURRENCY)"),
+) -> StreamingResponse:
+    """
+    Grade many recorded answers outside the live interview flow.
+
+    The body is spooled first (up to MAX_UPLOAD_MB): the request can't
+    be read while the streaming response is being sent. Each result line
+    is then sent as soon as its assessment completes (completion order,
+    not input order) and saved under the run id. Re-posting the same input
+    with the same run_id after a failure only assesses the records that
+    have no result yet. The run id is returned in the X-Run-Id header.
+    """
+    run_id = run_id or uuid.uuid4().hex
+    path = _results_path_or_400(settings, run_id)
+    if run_id in _active_runs:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Run {run_id} is already in progress"
+        )
+
+    # Claimed before the body is read, so a second request for the same
+    # run can't pass the check above while this one is still spooling
+    _active_runs.add(run_id)
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+
+    def release() -> None:
+        spool.close()
+        _active_runs.discard(run_id)
+
+    try:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.max_upload_mb * 1024 * 1024:
+                raise HTTPException(
+                    status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                    detail=f"Batch exceeds {settings.max_upload_mb} MB"
+                )
+            spool.write(chunk)
+        spool.seek(0)
+    except BaseException:
+        release()
+        raise
+
+    run = BulkAssessmentRun(path, concurrency=concurrency or settings.bulk_assess_concurrency)
+
+    async def result_stream():
+        lines = io.TextIOWrapper(spool, encoding="utf-8", errors="replace")
+        try:
+            async for result in run.run(aiter_jsonl(lines)):
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+        finally:
+            release()
+
+    return _RunResponse(
+        result_stream(),
+        release,
+        media_type="application/x-ndjson",
+        headers={"X-Run-Id": run_id, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/batch/{run_id}",
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+    summary="Bulk assessment run results",
+    description="All results saved for a run so far, as NDJSON."
+)
+async def get_batch_results(run_id: str, settings: SettingsDep) -> StreamingResponse:
+    """Stream the stored results of a (possibly still running) bulk run."""
+    run = BulkAssessmentRun(_results_path_or_400(settings, run_id))
+    lines = iter(run.iter_results())
+    first = next(lines, None)
+    if first is None and run_id not in _active_runs:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Run {run_id} not found"
+        )
+
+    def result_lines():
+        if first is not None:
+            yield first
+            yield from lines
+
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson")
@@ -1,11 +1,23 @@
 """Interview session management routes with StateGraph integration."""
+import asyncio
+import json
+import logging
+import time
 import uuid
 from fastapi import APIRouter, HTTPException, BackgroundTasks, status
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import SessionStoreDep, VectorStoreDep, SettingsDep
+from app.api.deps import (
+    QuestionPrefetcherDep,
+    SessionStoreDep,
+    SettingsDep,
+    TopicDigestsDep,
+    VectorStoreDep,
+)
 from app.models.schemas import (
     StartInterviewRequest,
     SubmitAnswerRequest,
+    StreamAnswerRequest,
     InterviewSessionResponse,
     QuestionResponse,
     SubmitAnswerResponse,
@@ -17,12 +29,75 @@ from app.models.schemas import (
 from app.agents.supervisor import (
     get_interview_graph,
     create_interview_session,
+    compact_history,
 )
+from app.agents.state import merge_messages
+from app.agents.checkpointer import release_thread
+from app.services.context_assembler import assemble_context
+from app.services.metrics import metrics
+from app.services.session_store import SessionConflictError
+
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/interview", tags=["interview"])
 
 
+def _merge_update(state: dict, update: dict) -> None:
+    """Merge a node's update into state, applying the messages reducer."""
+    for key, value in update.items():
+        if key == "messages":
+            state["messages"] = merge_messages(state.get("messages", []), value)
+        else:
+            state[key] = value
+
+
+async def _get_session_or_404(sessions, thread_id: str) -> dict:
+    """Load a session or raise 404."""
+    session = await sessions.aget(thread_id)
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session {thread_id} not found"
+        )
+    return session
+
+
+async def _save_session(sessions, session: dict) -> None:
+    """Persist a session, mapping concurrent modification to 409."""
+    try:
+        await sessions.asave(session)
+    except SessionConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+async def _restore_status(sessions, session: dict, previous_status) -> None:
+    """Put a session back to its status before a failed turn (best effort)."""
+    session["status"] = previous_status
+    try:
+        await _save_session(sessions, session)
+    except HTTPException:
+        pass  # modified concurrently; that newer save stands
+
+
+def _sse_event(event: str, data) -> str:
+    """Format one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _timed_question(node, state: dict) -> tuple[dict, float]:
+    """Run a question node and return its update with elapsed milliseconds."""
+    started = time.perf_counter()
+    update = await node(state)
+    return update, (time.perf_counter() - started) * 1000
+
+
+async def _cancel_task(task: asyncio.Task) -> None:
+    """Cancel a task and wait until it has finished unwinding."""
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
 @router.post(
     "/start",
     response_model=InterviewSessionResponse,
@@ -33,52 +108,66 @@ async def start_interview(
     request: StartInterviewRequest,
     sessions: SessionStoreDep,
     vectorstore: VectorStoreDep,
+    digests: TopicDigestsDep,
+    prefetcher: QuestionPrefetcherDep,
     settings: SettingsDep,
 ) -> InterviewSessionResponse:
     """
     Start a new interview preparation session.
     
     Workflow (StateGraph):
-    1. gather_context node analyzes materials
+    1. gather_context node analyzes materials (skipped when a precomputed
+       digest matches the topic)
     2. generate_question node creates first question
-    3. Returns question and pauses for answer
+    3. Returns question and pauses for answer (upcoming questions are
+       prefetched in the background if PREFETCH_QUESTIONS > 0)
     """
     thread_id = request.thread_id or str(uuid.uuid4())
     
-    if thread_id in sessions and sessions[thread_id].get("status") != InterviewStatus.COMPLETED:
+    existing = await sessions.aget(thread_id)
+    if existing and existing.get("status") != InterviewStatus.COMPLETED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Session {thread_id} already in progress."
         )
     
-    # Get context from materials
+    # Get context from materials: a precomputed digest of the topic if one
+    # matches, else retrieved chunks (diverse, de-overlapped, within budget)
     context = ""
-    if request.use_materials:
-        context = await vectorstore.query(
+    digest = digests.find(request.topic) if request.use_materials else None
+    if request.use_materials and digest is None:
+        chunks = await vectorstore.retrieve(
             query=f"Information about {request.topic}",
-            n_results=5
+            n_results=settings.context_candidates
+        )
+        context = assemble_context(
+            chunks,
+            token_budget=settings.prompt_context_tokens_context,
+            diversity=settings.context_mmr_diversity,
         )
     
     # Initialize state for StateGraph
     initial_state = create_interview_session(settings)
     initial_state["topic"] = request.topic
-    initial_state["context"] = context or "No materials provided. Use general knowledge."
+    initial_state["context"] = digest or context or "No materials provided. Use general knowledge."
+    initial_state["context_is_digest"] = digest is not None
     
     # Get the compiled graph
     graph = get_interview_graph()
     config = {"configurable": {"thread_id": thread_id}}
     
     # Run graph to generate first question
-    result = graph.invoke(initial_state, config)
+    result = await graph.ainvoke(initial_state, config)
     
     # Store session info
-    sessions[thread_id] = {
+    await sessions.asave({
         "thread_id": thread_id,
         "topic": request.topic,
         "status": InterviewStatus.AWAITING_ANSWER,
         "graph_state": result,
         "config": config,
-    }
+    })
+    prefetcher.fill(thread_id, result)
     
     return InterviewSessionResponse(
         thread_id=thread_id,
@@ -100,13 +189,7 @@ async def get_question(
     sessions: SessionStoreDep,
 ) -> QuestionResponse:
     """Get the current question from the graph state."""
-    if thread_id not in sessions:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {thread_id} not found"
-        )
-    
-    session = sessions[thread_id]
+    session = await _get_session_or_404(sessions, thread_id)
     state = session.get("graph_state", {})
     
     if session["status"] == InterviewStatus.COMPLETED:
@@ -135,6 +218,7 @@ async def submit_answer(
     request: SubmitAnswerRequest,
     background_tasks: BackgroundTasks,
     sessions: SessionStoreDep,
+    prefetcher: QuestionPrefetcherDep,
     settings: SettingsDep,
 ) -> SubmitAnswerResponse:
     """
@@ -145,54 +229,84 @@ async def submit_answer(
     2. Store assessment in session state
     3. Run generate_question to get next question
     """
-    if request.thread_id not in sessions:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {request.thread_id} not found"
-        )
-    
-    session = sessions[request.thread_id]
+    session = await _get_session_or_404(sessions, request.thread_id)
+    previous_status = session["status"]
     session["status"] = InterviewStatus.ASSESSING
-    
-    # Get current state and update with answer
-    graph = get_interview_graph()
-    config = session["config"]
-    current_state = session["graph_state"].copy()
-    current_state["current_answer"] = request.transcript
-    
-    # Import and run assess_answer_node directly
-    from app.agents.supervisor import assess_answer_node, generate_question_node
-    
-    print(f"[DEBUG submit_answer] Assessing answer: {request.transcript[:100]}...")
-    
-    # Run assessment
-    assessment_update = assess_answer_node(current_state)
-    
-    # Merge assessment into state
-    for key, value in assessment_update.items():
-        if key == "messages":
-            current_state["messages"] = current_state.get("messages", []) + value
-        else:
-            current_state[key] = value
-    
-    print(f"[DEBUG submit_answer] Assessment result: {current_state.get('last_assessment')}")
-    
-    # Store the updated state with assessment
-    session["graph_state"] = current_state
-    
-    # Now generate next question
-    question_update = generate_question_node(current_state)
-    
-    # Merge question into state
-    for key, value in question_update.items():
-        if key == "messages":
-            current_state["messages"] = current_state.get("messages", []) + value
+    await _save_session(sessions, session)
+    
+    # Restored if anything below fails, so the session isn't stuck in ASSESSING
+    speculative_task = None
+    try:
+        # Get current state and update with answer
+        graph = get_interview_graph()
+        config = session["config"]
+        current_state = session["graph_state"].copy()
+        current_state["current_answer"] = request.transcript
+    
+        # Import and run assess_answer_node directly
+        from app.agents.supervisor import assess_answer_node, generate_question_node, next_is_followup
+    
+        logger.debug("Assessing answer for %s: %.100s", request.thread_id, request.transcript)
+    
+        # Speculative mode: generate the next non-follow-up question while the
+        # assessment is still running. The non-follow-up prompt only depends on
+        # topic, context and question count, so it is valid whenever the
+        # assessment decides no follow-up is needed.
+        # (Not needed when the next question has already been prefetched.)
+        if settings.speculative_questions and not prefetcher.ready(request.thread_id, current_state):
+            speculative_state = {**current_state, "needs_followup": False}
+            speculative_task = asyncio.create_task(
+                _timed_question(generate_question_node, speculative_state)
+            )
+    
+        # Run assessment
+        assessment_update = await assess_answer_node(current_state)
+    
+        # Merge assessment into state
+        _merge_update(current_state, assessment_update)
+    
+        logger.debug("Assessment for %s: %s", request.thread_id, current_state.get("last_assessment"))
+    
+        # Now generate next question (or reuse the prefetched/speculative one)
+        question_update = None
+        if not next_is_followup(current_state):
+            question_update = await prefetcher.take(request.thread_id, current_state)
+        if question_update is not None:
+            if speculative_task:
+                await _cancel_task(speculative_task)
+        elif speculative_task and not current_state.get("needs_followup", False):
+            waited = time.perf_counter()
+            try:
+                question_update, elapsed_ms = await speculative_task
+            except Exception as e:
+                logger.warning("Speculative question failed for %s: %s", request.thread_id, e)
+                metrics.incr("speculative_question.failed")
+                question_update = await generate_question_node(current_state)
+            else:
+                # Only the part of the generation that overlapped the assessment
+                waited_ms = (time.perf_counter() - waited) * 1000
+                metrics.incr("speculative_question.hit")
+                metrics.observe("speculative_question.saved", max(elapsed_ms - waited_ms, 0.0))
         else:
-            current_state[key] = value
-    
-    # Update session with final state
-    session["graph_state"] = current_state
-    session["status"] = InterviewStatus.AWAITING_ANSWER
+            if speculative_task:
+                await _cancel_task(speculative_task)
+                metrics.incr("speculative_question.miss")
+            question_update = await generate_question_node(current_state)
+    
+        # Merge question into state, then fold old turns into the summary
+        _merge_update(current_state, question_update)
+        _merge_update(current_state, compact_history(current_state))
+    
+        # Update session with final state
+        session["graph_state"] = current_state
+        session["status"] = InterviewStatus.AWAITING_ANSWER
+        await _save_session(sessions, session)
+    except BaseException:
+        if speculative_task:
+            await _cancel_task(speculative_task)
+        await _restore_status(sessions, session, previous_status)
+        raise
+    prefetcher.fill(request.thread_id, current_state)
     
     has_followup = current_state.get("needs_followup", False)
     
@@ -204,6 +318,91 @@ async def submit_answer(
     )
 
 
+@router.post(
+    "/{thread_id}/stream",
+    responses={404: {"model": ErrorResponse}},
+    summary="Submit answer (streaming)",
+    description="Submit an answer and stream assessment and next-question tokens as Server-Sent Events."
+)
+async def stream_answer(
+    thread_id: str,
+    request: StreamAnswerRequest,
+    sessions: SessionStoreDep,
+    prefetcher: QuestionPrefetcherDep,
+) -> StreamingResponse:
+    """
+    Streaming variant of /answer.
+    
+    Events (text/event-stream):
+    - assessment_token: {"token"} as the assessment is generated
+    - assessment: final structured assessment
+    - question_token: {"token"} as the next question is generated
+    - question: final question with numbering
+    - done / error
+    """
+    from app.agents.supervisor import next_is_followup, stream_assessment, stream_question
+    
+    session = await _get_session_or_404(sessions, thread_id)
+    previous_status = session["status"]
+    session["status"] = InterviewStatus.ASSESSING
+    await _save_session(sessions, session)
+    
+    async def event_stream():
+        current_state = session["graph_state"].copy()
+        current_state["current_answer"] = request.transcript
+        
+        try:
+            async for kind, payload in stream_assessment(current_state):
+                if kind == "token":
+                    yield _sse_event("assessment_token", {"token": payload})
+                else:
+                    _merge_update(current_state, payload)
+            
+            yield _sse_event("assessment", {
+                "assessment": current_state.get("last_assessment"),
+                "needs_followup": current_state.get("needs_followup", False),
+            })
+            
+            is_followup = current_state.get("needs_followup", False)
+            prefetched = None
+            if not next_is_followup(current_state):
+                prefetched = await prefetcher.take(thread_id, current_state)
+            if prefetched is not None:
+                yield _sse_event("question_token", {"token": prefetched["current_question"]})
+                _merge_update(current_state, prefetched)
+            else:
+                async for kind, payload in stream_question(current_state):
+                    if kind == "token":
+                        yield _sse_event("question_token", {"token": payload})
+                    else:
+                        _merge_update(current_state, payload)
+            _merge_update(current_state, compact_history(current_state))
+            
+            session["graph_state"] = current_state
+            session["status"] = InterviewStatus.AWAITING_ANSWER
+            await _save_session(sessions, session)
+            prefetcher.fill(thread_id, current_state)
+            yield _sse_event("question", {
+                "question": current_state.get("current_question", ""),
+                "question_number": current_state.get("question_count", 1),
+                "is_followup": is_followup,
+            })
+            yield _sse_event("done", {"thread_id": thread_id})
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            yield _sse_event("error", {"detail": detail})
+        finally:
+            # Failed, or the client disconnected mid-stream
+            if session["status"] == InterviewStatus.ASSESSING:
+                await _restore_status(sessions, session, previous_status)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post(
     "/approve",
     summary="Approve assessment (HITL)",
@@ -213,6 +412,7 @@ async def approve_assessment(
     thread_id: str,
     action: str = "approve",  # approve, reject, end_interview
     sessions: SessionStoreDep = None,
+    prefetcher: QuestionPrefetcherDep = None,
 ) -> dict:
     """
     Resume the StateGraph after HITL approval.
@@ -222,18 +422,12 @@ async def approve_assessment(
     - reject: Re-run assessment
     - end_interview: Complete the session
     """
-    if thread_id not in sessions:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {thread_id} not found"
-        )
-    
-    session = sessions[thread_id]
+    session = await _get_session_or_404(sessions, thread_id)
     graph = get_interview_graph()
     config = session["config"]
     
     # Resume graph with approval decision
-    result = graph.invoke(
+    result = await graph.ainvoke(
         {"approved": action == "approve", "awaiting_approval": False},
         config
     )
@@ -242,9 +436,13 @@ async def approve_assessment(
     
     if action == "end_interview":
         session["status"] = InterviewStatus.COMPLETED
+        await _save_session(sessions, session)
+        await release_thread(thread_id)
+        prefetcher.discard(thread_id)
         return {"message": "Interview ended", "status": "completed"}
     
     session["status"] = InterviewStatus.AWAITING_ANSWER
+    await _save_session(sessions, session)
     
     return {
         "message": f"Assessment {action}d. Next question ready.",
@@ -263,29 +461,26 @@ async def approve_assessment(
 async def get_assessment(
     thread_id: str,
     sessions: SessionStoreDep,
+    prefetcher: QuestionPrefetcherDep,
 ) -> FinalAssessmentResponse:
     """Get the final interview assessment from all recorded assessments."""
-    if thread_id not in sessions:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {thread_id} not found"
-        )
-    
-    session = sessions[thread_id]
+    session = await _get_session_or_404(sessions, thread_id)
     state = session.get("graph_state", {})
     
-    # Debug logging
-    print(f"[DEBUG get_assessment] thread_id={thread_id}")
-    print(f"[DEBUG get_assessment] state keys: {state.keys() if state else 'NO STATE'}")
-    print(f"[DEBUG get_assessment] last_assessment: {state.get('last_assessment')}")
+    logger.debug(
+        "Final assessment for %s: state keys %s, last assessment %s",
+        thread_id, list(state) if state else "NO STATE", state.get("last_assessment"),
+    )
     
     # Extract assessment from messages (they're logged as [Assessment] messages)
     assessments = []
     
-    # Check for last_assessment in state first
-    last_assessment = state.get("last_assessment")
-    if last_assessment:
-        print(f"[DEBUG] Found last_assessment: {last_assessment}")
+    # Structured assessments are kept apart from message text (last K)
+    recorded = state.get("recent_assessments") or (
+        [state["last_assessment"]] if state.get("last_assessment") else []
+    )
+    for last_assessment in recorded:
+        logger.debug("Found assessment: %s", last_assessment)
         assessments.append(AnswerAssessment(
             score=last_assessment.get("score", 70),
             feedback=last_assessment.get("feedback", ""),
@@ -299,7 +494,7 @@ async def get_assessment(
     for msg in messages:
         content = getattr(msg, "content", str(msg))
         if "[Assessment]" in content and not assessments:
-            print(f"[DEBUG] Found assessment in message: {content[:100]}")
+            logger.debug("Found assessment in message: %.100s", content)
             # Parse inline assessment if no structured one found
             assessments.append(AnswerAssessment(
                 score=70,
@@ -313,8 +508,11 @@ async def get_assessment(
     if not assessments:
         question_count = state.get("question_count", 0)
         topic = session.get("topic", "Interview Practice")
-        print(f"[DEBUG] No assessments - returning early termination summary. Questions: {question_count}")
+        logger.debug("No assessments - returning early termination summary. Questions: %s", question_count)
         session["status"] = InterviewStatus.COMPLETED
+        await _save_session(sessions, session)
+        await release_thread(thread_id)
+        prefetcher.discard(thread_id)
         
         return FinalAssessmentResponse(
             thread_id=thread_id,
@@ -332,18 +530,26 @@ async def get_assessment(
             assessments=[]
         )
     
-    # Calculate overall score
-    scores = [a.score for a in assessments]
-    overall_score = sum(scores) // len(scores)
+    # Calculate overall score (running totals cover turns already compacted)
+    totals = state.get("assessment_totals") or {}
+    if totals.get("count"):
+        overall_score = totals["score_total"] // totals["count"]
+    else:
+        scores = [a.score for a in assessments]
+        overall_score = sum(scores) // len(scores)
     
     # Aggregate strengths/weaknesses
-    all_strengths = []
-    all_weaknesses = []
-    for a in assessments:
-        all_strengths.extend(a.strengths)
-        all_weaknesses.extend(a.weaknesses)
+    all_strengths = list(totals.get("strengths") or {})
+    all_weaknesses = list(totals.get("weaknesses") or {})
+    if not totals.get("count"):
+        for a in assessments:
+            all_strengths.extend(a.strengths)
+            all_weaknesses.extend(a.weaknesses)
     
     session["status"] = InterviewStatus.COMPLETED
+    await _save_session(sessions, session)
+    await release_thread(thread_id)
+    prefetcher.discard(thread_id)
     
     return FinalAssessmentResponse(
         thread_id=thread_id,
@@ -369,10 +575,12 @@ async def get_assessment(
 async def end_session(
     thread_id: str,
     sessions: SessionStoreDep,
+    prefetcher: QuestionPrefetcherDep,
 ) -> dict:
     """End an interview session."""
-    if thread_id in sessions:
-        del sessions[thread_id]
+    prefetcher.discard(thread_id)
+    if await sessions.adelete(thread_id):
+        await release_thread(thread_id)
         return {"message": f"Session {thread_id} ended"}
     
     raise HTTPException(
@@ -1,27 +1,69 @@
 """Materials upload and management routes."""
 import uuid
-from fastapi import APIRouter, UploadFile, File, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse
 
-from app.api.deps import VectorStoreDep, SettingsDep
-from app.models.schemas import MaterialUploadResponse, ErrorResponse
+from app.api.deps import IngestionQueueDep, VectorStoreDep, SettingsDep
+from app.models.schemas import IngestionJobResponse, MaterialUploadResponse, ErrorResponse
+from app.services.ingest_jobs import QueueFullError, ingest_upload
+from app.services.metrics import metrics
+from app.services.uploads import (
+    UploadError,
+    UploadTooLargeError,
+    spool_upload,
+)
 
 
 router = APIRouter(prefix="/materials", tags=["materials"])
 
+ALLOWED_EXTENSIONS = {".pdf", ".txt", ".md"}
+
 
 @router.post(
     "/upload",
     response_model=MaterialUploadResponse,
     responses={
+        202: {"model": IngestionJobResponse, "description": "Queued for background ingestion"},
         400: {"model": ErrorResponse, "description": "Invalid file type"},
+        413: {"model": ErrorResponse, "description": "File too large"},
+        429: {"model": ErrorResponse, "description": "Ingestion queue full"},
         500: {"model": ErrorResponse, "description": "Processing error"},
     },
     summary="Upload study materials",
-    description="Upload PDF or text files to be indexed for interview question generation."
+    description=(
+        "Upload PDF or text files to be indexed for interview question generation. "
+        "With `background=true` the file is indexed asynchronously: the response is "
+        "202 with a job to poll at `/materials/jobs/{job_id}`."
+    ),
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["file"],
+                        "properties": {
+                            "file": {
+                                "type": "string",
+                                "format": "binary",
+                                "description": "PDF or TXT file to upload",
+                            }
+                        },
+                    }
+                }
+            },
+        }
+    },
 )
 async def upload_material(
-    file: UploadFile = File(..., description="PDF or TXT file to upload"),
+    request: Request,
+    background: bool = Query(
+        default=False, description="Index in a background job and return 202 immediately"
+    ),
     vectorstore: VectorStoreDep = None,
+    jobs: IngestionQueueDep = None,
     settings: SettingsDep = None,
 ) -> MaterialUploadResponse:
     """
@@ -31,42 +73,61 @@ async def upload_material(
     - PDF (.pdf)
     - Text (.txt)
     - Markdown (.md)
+    
+    The upload is streamed to a temporary file as it arrives, and text is
+    extracted page by page (PDF) or in fixed-size pieces (text) straight
+    into chunking and indexing, so neither the file nor its text is ever
+    held in memory in full.
+    
+    Large files can exceed the request timeout; upload them with
+    `background=true` and poll the returned job instead.
     """
-    # Validate file type
-    allowed_extensions = {".pdf", ".txt", ".md"}
-    file_ext = "." + file.filename.split(".")[-1].lower() if "." in file.filename else ""
+    try:
+        upload = await spool_upload(
+            request,
+            max_bytes=settings.max_upload_mb * 1024 * 1024,
+            allowed_extensions=ALLOWED_EXTENSIONS,
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(e))
+    except UploadError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    if file_ext not in allowed_extensions:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
+    # Identical content already indexed: answer immediately, in either mode
+    existing = await vectorstore.find_document_by_hash(upload.sha256)
+    if existing is not None:
+        upload.cleanup()
+        metrics.incr("ingest.dedup.document")
+        return _duplicate_response(existing["id"], upload.filename, existing["chunk_count"])
+    
+    if background:
+        try:
+            job = jobs.submit(upload)
+        except QueueFullError as e:
+            upload.cleanup()
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=IngestionJobResponse(**job.to_dict()).model_dump(mode="json"),
+            headers={"Location": str(request.url_for("get_ingestion_job", job_id=job.job_id))},
         )
     
     try:
-        # Read file content
-        content = await file.read()
-        
-        # Process based on file type
-        if file_ext == ".pdf":
-            text_content = await vectorstore.process_pdf(content)
-        else:
-            text_content = content.decode("utf-8")
-        
         # Generate material ID
         material_id = str(uuid.uuid4())
         
-        # Index in vector store
-        chunks_created = await vectorstore.index_document(
-            document_id=material_id,
-            content=text_content,
-            metadata={"filename": file.filename, "type": file_ext}
-        )
+        # Extract and index, sharing ingestion slots with background jobs
+        async with jobs.slots:
+            result = await ingest_upload(vectorstore, upload, material_id, digests=jobs.digests)
         
+        if result.duplicate:
+            return _duplicate_response(result.material_id, upload.filename, result.chunks_created)
         return MaterialUploadResponse(
-            material_id=material_id,
-            filename=file.filename,
-            chunks_created=chunks_created,
-            message=f"Successfully indexed {chunks_created} chunks from {file.filename}"
+            material_id=result.material_id,
+            filename=upload.filename,
+            chunks_created=result.chunks_created,
+            failed_pages=result.failed_pages,
+            message=f"Successfully indexed {result.chunks_created} chunks from {upload.filename}"
         )
         
     except Exception as e:
@@ -74,19 +135,90 @@ async def upload_material(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing file: {str(e)}"
         )
+    finally:
+        upload.cleanup()
+
+
+def _duplicate_response(material_id: str, filename: str, chunk_count: int) -> MaterialUploadResponse:
+    """Response for an upload whose content is already indexed."""
+    return MaterialUploadResponse(
+        material_id=material_id,
+        filename=filename,
+        chunks_created=chunk_count,
+        duplicate=True,
+        message=f"Identical content already indexed as material {material_id}"
+    )
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=IngestionJobResponse,
+    responses={404: {"model": ErrorResponse, "description": "Job not found"}},
+    summary="Get ingestion job status",
+    description="Report the stage and progress of a background ingestion job."
+)
+async def get_ingestion_job(
+    job_id: str,
+    jobs: IngestionQueueDep = None,
+) -> IngestionJobResponse:
+    """Get the status of a background ingestion job."""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+    return IngestionJobResponse(**job.to_dict())
+
+
+@router.delete(
+    "/jobs/{job_id}",
+    responses={
+        404: {"model": ErrorResponse, "description": "Job not found"},
+        409: {"model": ErrorResponse, "description": "Job already finished"},
+    },
+    summary="Cancel an ingestion job",
+    description="Cancel a queued or running ingestion job; partially indexed chunks are removed."
+)
+async def cancel_ingestion_job(
+    job_id: str,
+    jobs: IngestionQueueDep = None,
+) -> dict:
+    """Cancel a background ingestion job."""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+    if not jobs.cancel(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job {job_id} already {job.stage.value}"
+        )
+    return {"message": f"Job {job_id} cancellation requested"}
 
 
 @router.get(
     "/list",
+    responses={400: {"model": ErrorResponse, "description": "Invalid cursor"}},
     summary="List uploaded materials",
-    description="Get a list of all uploaded study materials."
+    description=(
+        "Get uploaded study materials, newest first. Results are paginated: pass "
+        "`next_cursor` from a response as `cursor` to get the following page."
+    )
 )
 async def list_materials(
+    limit: int = Query(default=50, ge=1, le=500, description="Materials per page"),
+    cursor: Optional[str] = Query(default=None, description="Cursor from a previous page"),
     vectorstore: VectorStoreDep = None,
 ) -> dict:
-    """List all indexed materials."""
-    materials = await vectorstore.list_documents()
-    return {"materials": materials, "count": len(materials)}
+    """List indexed materials, one page at a time."""
+    try:
+        materials, next_cursor = await vectorstore.list_documents(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"materials": materials, "count": len(materials), "next_cursor": next_cursor}
 
 
 @router.delete(
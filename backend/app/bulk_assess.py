@@ -0,0 +1,63 @@
+"""
+Command-line bulk assessment of recorded transcripts.
+
+    python -m app.bulk_assess cohort.jsonl -o cohort.results.jsonl --concurrency 8
+
+Reads {id?, question, answer, topic?} records (one JSON object per line,
+"-" for stdin), assesses them with the configured model provider and
+appends one result line per record to the output file as each completes.
+Re-running with the same output file resumes: records that already have a
+result are skipped. A summary is printed to stderr at the end.
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from dotenv import load_dotenv
+
+from app.services.bulk_assessment import BulkAssessmentRun, aiter_jsonl
+from app.services.metrics import metrics
+
+
+async def _main(args: argparse.Namespace) -> int:
+    from app.agents.supervisor import close_model_clients
+    from app.config import get_settings
+
+    concurrency = args.concurrency or get_settings().bulk_assess_concurrency
+    run = BulkAssessmentRun(args.output, concurrency=concurrency)
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    completed = failed = 0
+    try:
+        async for result in run.run(aiter_jsonl(source)):
+            if "assessment" in result:
+                completed += 1
+            else:
+                failed += 1
+                print(f"error: {json.dumps(result)}", file=sys.stderr)
+            if args.verbose:
+                print(json.dumps(result, ensure_ascii=False))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        await close_model_clients()
+    print(
+        f"assessed {completed}, failed {failed}, skipped {int(metrics.get('bulk_assessment.skipped'))} "
+        f"already done; results in {args.output}",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+def main() -> None:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Bulk-assess recorded interview answers from JSONL.")
+    parser.add_argument("input", help="JSONL file of {id?, question, answer, topic?} records, or - for stdin")
+    parser.add_argument("-o", "--output", required=True, help="Results JSONL (appended; enables resume)")
+    parser.add_argument("-c", "--concurrency", type=int, default=None, help="Assessments in flight (default BULK_ASSESS_CONCURRENCY)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Also print each result to stdout")
+    sys.exit(asyncio.run(_main(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
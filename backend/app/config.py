@@ -9,13 +9,99 @@ class Settings(BaseSettings):
     # ── Model Provider (Swappable Pattern) ──
     # ── Model Provider (Swappable Pattern) ──
     # Set to "openai" or "vertex" to switch all models at once
+    # ("fake" runs a local canned model for offline testing)
     llm_provider: str = "openai"
+    # Registers the local fake providers ("fake", "fake-secondary"); set by
+    # the test suite and benchmarks, not meant for deployments
+    fake_llm_enabled: bool = False
+    fake_llm_latency_ms: int = 0
+    # Slow tail of the fake provider: this share of calls takes fake_llm_tail_ms
+    fake_llm_tail_ms: int = 0
+    fake_llm_tail_ratio: float = 0.0
+    # Latency of the second fake provider ("fake-secondary", for hedging)
+    fake_secondary_latency_ms: int = 0
+    
+    # LLM HTTP connection pool (shared keep-alive clients)
+    llm_max_connections: int = 100
+    llm_max_keepalive_connections: int = 20
+    llm_keepalive_expiry: float = 30.0
+    
+    # LLM governor (per worker): concurrent calls per provider and per role
+    # (0 = provider cap only), per-provider request/token rate limits per
+    # minute (0 = unlimited), and sharing of identical in-flight requests
+    llm_max_concurrent: int = 32
+    llm_max_concurrent_context: int = 0
+    llm_max_concurrent_question: int = 0
+    llm_max_concurrent_assessment: int = 0
+    llm_rpm: int = 0
+    llm_tpm: int = 0
+    llm_coalesce: bool = True
+    
+    # Hedged requests: if the primary hasn't answered after its observed
+    # latency percentile for the role (initial delay until enough samples),
+    # also ask the secondary provider and take the first answer
+    llm_hedge: bool = False
+    llm_secondary_provider: str = ""
+    llm_hedge_percentile: float = 0.9
+    llm_hedge_min_samples: int = 20
+    llm_hedge_initial_ms: int = 2000
+    # Per-role deadlines for a model call, hedge included (0 = none; 504 when hit)
+    llm_deadline_ms_context: int = 0
+    llm_deadline_ms_question: int = 0
+    llm_deadline_ms_assessment: int = 0
+    
+    # LLM response cache (temperature-0 responses; set path "" for memory only).
+    # Opt-in: repeated prompts get the stored response instead of a fresh one
+    llm_cache_enabled: bool = False
+    llm_cache_path: str = "./llm_cache.sqlite3"
+    llm_cache_memory_entries: int = 512
+    llm_cache_disk_entries: int = 10000
+    llm_cache_ttl_seconds: int = 86400
     
     # API Keys (required for OpenAI provider)
     openai_api_key: str = ""
     
     # Interview Settings
     max_follow_ups: int = 1
+    # History compaction: turns kept verbatim / structured assessments kept
+    history_keep_turns: int = 3
+    assessment_keep_recent: int = 10
+    # Generate the next question concurrently with the assessment and keep it
+    # when no follow-up is needed
+    speculative_questions: bool = False
+    # Question source: "llm" (generate every question), "bank" (serve new
+    # questions from the parsed study guides when the topic has any left) or
+    # "hybrid" (alternate bank and generated questions)
+    question_source: str = "llm"
+    question_bank_dir: str = "../docs/study-guides"
+    question_bank_path: str = "./question_bank.sqlite3"
+    # Background prefetch: upcoming new questions generated per session
+    # (0 disables) and the cap on prefetches running at once across sessions
+    prefetch_questions: int = 0
+    prefetch_max_concurrent: int = 2
+    # Prefetch queues of sessions idle this long are dropped (0 = no TTL),
+    # and at most this many sessions keep queues (least recently used go first)
+    prefetch_ttl_seconds: int = 1800
+    prefetch_max_sessions: int = 1000
+    # Assessment output: "text" (SCORE/FEEDBACK block, parsed) or structured
+    # output via "json_schema" / "function_calling", retried on invalid output
+    assessment_output: str = "text"
+    assessment_max_retries: int = 1
+    # Bulk offline assessment (POST /assessments/batch and python -m app.bulk_assess)
+    bulk_assess_concurrency: int = 8
+    bulk_runs_dir: str = "./bulk_runs"
+    
+    # Session store: "memory" (single worker) or "sqlite" (multi-worker, which
+    # also needs checkpointer="sqlite")
+    session_store: str = "memory"
+    session_db_path: str = "./sessions.sqlite3"
+    session_cache_size: int = 256
+    
+    # LangGraph checkpointer: "memory" or "sqlite" (bounded, file-backed)
+    checkpointer: str = "memory"
+    checkpoint_db_path: str = "./checkpoints.sqlite3"
+    checkpoint_keep_last: int = 2
+    checkpoint_ttl_seconds: int = 86400
     
     # GCP Settings (required for Vertex AI provider)
     gcp_project_id: str = ""
@@ -25,6 +111,27 @@ class Settings(BaseSettings):
     
     # ChromaDB
     chroma_persist_dir: str = "./chroma_db"
+    max_upload_mb: int = 200  # uploads larger than this are rejected with 413
+    index_batch_size: int = 64  # chunks per collection.add call
+    embed_workers: int = 4  # parallel embedding threads during ingestion
+    pdf_workers: int = 2  # processes for PDF text extraction
+    pdf_pages_per_task: int = 8  # pages per extraction task
+    ingest_workers: int = 2  # documents ingested concurrently (sync + background)
+    ingest_max_queued: int = 16  # background jobs waiting for a slot before 429
+    ingest_jobs_keep: int = 200  # finished jobs kept for status queries
+    query_cache_size: int = 256  # cached retrieval results (0 disables)
+    # vector | lexical (BM25, no embedding) | hybrid (rank fusion; opt-in since
+    # it changes which chunks are retrieved)
+    retrieval_mode: str = "vector"
+    ingest_digests: bool = False  # precompute "key areas" digests per material and section
+    digest_max_sections: int = 12  # section digests per material (after the whole-material one)
+    digest_max_parts: int = 16  # context-sized parts analyzed for the whole-material digest
+    
+    # Prompt context assembly: hard token budgets per model role (~4 chars/token)
+    context_candidates: int = 10  # chunks retrieved before MMR selection and merging
+    context_mmr_diversity: float = 0.3  # MMR weight on redundancy (0 = plain top-k)
+    prompt_context_tokens_context: int = 800  # retrieved material analysed by gather_context
+    prompt_context_tokens_question: int = 400  # analysed context in each question prompt
     
     # CORS
     cors_origins: str = "http://localhost:5173,http://localhost:3000"
@@ -1,14 +1,37 @@
 """Interview Preparedness API - Main Application."""
+import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
 from app.config import get_settings
-from app.api.routes import interview, materials
+from app.services.metrics import metrics
+from app.services.llm_cache import bypass_llm_cache, get_llm_cache
+from app.services.llm_hedging import LLMDeadlineExceeded
+from app.services.question_bank import get_question_bank
+from app.api.routes import assessments, interview, materials
+from app.api.deps import (
+    get_ingestion_queue,
+    get_question_prefetcher,
+    get_session_store,
+    get_vectorstore_service,
+)
+from app.agents.supervisor import close_model_clients
+from app.agents.checkpointer import get_checkpointer
 
 load_dotenv()  # Load .env into os.environ before any LangChain imports
 
+# Background services log under "app.*"; show their INFO messages next to uvicorn's
+app_logger = logging.getLogger("app")
+if not app_logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(levelname)s:     %(name)s - %(message)s"))
+    app_logger.addHandler(_handler)
+    app_logger.setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup/shutdown."""
@@ -31,9 +54,28 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             print(f"Vertex AI Check FAILED: Unexpected error importing langchain_google_genai. Error: {e}")
 
+    # Parse/load the question bank up front so the first bank question is instant
+    if settings.question_source != "llm":
+        logger.info("Question bank: %d questions (%s mode)", get_question_bank().size(), settings.question_source)
+
     yield
     # Shutdown
     print("Shutting down...")
+    if get_ingestion_queue.cache_info().currsize:
+        await get_ingestion_queue().shutdown()
+    if get_question_prefetcher.cache_info().currsize:
+        await get_question_prefetcher().shutdown()
+    await close_model_clients()
+    if get_llm_cache.cache_info().currsize:
+        get_llm_cache().close()
+    if get_question_bank.cache_info().currsize:
+        get_question_bank().close()
+    get_session_store().close()
+    if get_vectorstore_service.cache_info().currsize:
+        get_vectorstore_service().close()
+    checkpointer = get_checkpointer()
+    if hasattr(checkpointer, "close"):
+        checkpointer.close()
 
 
 def create_app() -> FastAPI:
@@ -58,15 +100,36 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    @app.middleware("http")
+    async def llm_cache_bypass(request: Request, call_next):
+        """Honour X-Bypass-LLM-Cache: true for the duration of a request."""
+        bypass = request.headers.get("x-bypass-llm-cache", "").lower() in ("1", "true", "yes")
+        token = bypass_llm_cache.set(bypass)
+        try:
+            return await call_next(request)
+        finally:
+            bypass_llm_cache.reset(token)
+    
+    @app.exception_handler(LLMDeadlineExceeded)
+    async def llm_deadline_exceeded(request: Request, exc: LLMDeadlineExceeded):
+        """A model call ran past its role deadline (LLM_DEADLINE_MS_<ROLE>)."""
+        return JSONResponse(status_code=504, content={"detail": str(exc)})
+    
     # Include routers
     app.include_router(interview.router, prefix="/api/v1")
     app.include_router(materials.router, prefix="/api/v1")
+    app.include_router(assessments.router, prefix="/api/v1")
     
     @app.get("/health", tags=["health"])
     async def health_check():
         """Health check endpoint."""
         return {"status": "healthy", "version": settings.app_version}
     
+    @app.get("/metrics", tags=["health"])
+    async def get_metrics():
+        """In-process performance counters (per worker)."""
+        return metrics.snapshot()
+    
     return app
 
 
@@ -1,9 +1,12 @@
 """Models package initialization."""
 from app.models.schemas import (
     InterviewStatus,
+    JobStage,
     MaterialUploadResponse,
+    IngestionJobResponse,
     StartInterviewRequest,
     SubmitAnswerRequest,
+    StreamAnswerRequest,
     InterviewSessionResponse,
     QuestionResponse,
     AnswerAssessment,
@@ -14,9 +17,12 @@ from app.models.schemas import (
 
 __all__ = [
     "InterviewStatus",
+    "JobStage",
     "MaterialUploadResponse",
+    "IngestionJobResponse",
     "StartInterviewRequest",
     "SubmitAnswerRequest",
+    "StreamAnswerRequest",
     "InterviewSessionResponse",
     "QuestionResponse",
     "AnswerAssessment",
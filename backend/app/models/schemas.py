@@ -15,6 +15,17 @@ class InterviewStatus(str, Enum):
     COMPLETED = "completed"
 
 
+class JobStage(str, Enum):
+    """Lifecycle stages of a background ingestion job."""
+    QUEUED = "queued"
+    EXTRACTING = "extracting"
+    INDEXING = "indexing"
+    DIGESTING = "digesting"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
 # ============ Materials ============
 
 class MaterialUploadResponse(BaseModel):
@@ -22,9 +33,38 @@ class MaterialUploadResponse(BaseModel):
     material_id: str = Field(description="Unique identifier for the uploaded material")
     filename: str = Field(description="Original filename")
     chunks_created: int = Field(description="Number of text chunks indexed")
+    failed_pages: list[int] = Field(
+        default_factory=list,
+        description="PDF pages (1-based) whose text could not be extracted"
+    )
+    duplicate: bool = Field(
+        default=False,
+        description="True if identical content was already indexed under material_id"
+    )
     message: str = Field(default="Material uploaded successfully")
 
 
+class IngestionJobResponse(BaseModel):
+    """Status of a background ingestion job."""
+    job_id: str = Field(description="Unique identifier for the ingestion job")
+    material_id: str = Field(description="ID the material will be indexed under")
+    filename: str = Field(description="Original filename")
+    stage: JobStage
+    progress: float = Field(ge=0, le=1, description="Fraction of the source read so far")
+    pages_total: Optional[int] = Field(default=None, description="Total pages (PDF only)")
+    pages_done: int = Field(default=0, description="Pages extracted so far (PDF only)")
+    chunks_indexed: int = Field(default=0, description="Chunks written so far")
+    failed_pages: list[int] = Field(default_factory=list)
+    duplicate: bool = Field(
+        default=False,
+        description="True if identical content was already indexed under material_id"
+    )
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
 # ============ Interview Requests ============
 
 class StartInterviewRequest(BaseModel):
@@ -52,6 +92,14 @@ class SubmitAnswerRequest(BaseModel):
     )
 
 
+class StreamAnswerRequest(BaseModel):
+    """Request to submit an answer and stream the assessment and next question."""
+    transcript: str = Field(
+        description="Voice-to-text transcript of user's answer",
+        min_length=1
+    )
+
+
 # ============ Interview Responses ============
 
 class InterviewSessionResponse(BaseModel):
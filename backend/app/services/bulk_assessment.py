@@ -0,0 +1,194 @@
+"""
+Bulk offline assessment of recorded question/answer transcripts.
+
+A run grades a JSONL stream of {"id"?, "question", "answer", "topic"?}
+records with the same logic as the live flow (`assess_answer_node`, so
+structured output mode, retries and the response cache all apply),
+keeping at most `concurrency` assessments in flight. Results are yielded
+in completion order as soon as each is ready and appended (one JSON line
+each, flushed) to the run's results file.
+
+The results file makes runs resumable: starting a run again with the
+same file skips every record whose id already has a result, so a crash
+costs at most the assessments that were in flight. Records without an
+"id" are identified by a hash of (topic, question, answer).
+
+Records are read lazily, so a run's memory is bounded by the in-flight
+window regardless of input size. LangChain's `abatch` on the configured
+providers is itself concurrent `ainvoke` under a max_concurrency cap and
+returns only when the whole batch is done; a sliding window gives the
+same fan-out with incremental results and no straggler stalls.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional
+
+from app.services.metrics import metrics
+
+
+DEFAULT_TOPIC = "General"
+
+
+def record_id(record: dict) -> str:
+    """Stable id of an input record."""
+    if record.get("id") not in (None, ""):
+        return str(record["id"])
+    payload = json.dumps(
+        [record.get("topic") or DEFAULT_TOPIC, record.get("question", ""), record.get("answer", "")],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+async def aiter_jsonl(lines: Iterable[str]) -> AsyncIterator[dict]:
+    """
+    Parse JSONL text lines (a file, stdin or a spooled request body).
+
+    Yields one dict per non-empty line; a line that isn't a JSON object
+    yields {"_line": n, "_error": message} so it can be reported.
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {"_line": number, "_error": f"Invalid JSON: {e}"}
+            continue
+        if not isinstance(record, dict):
+            yield {"_line": number, "_error": "Expected a JSON object"}
+            continue
+        yield record
+
+
+class BulkAssessmentRun:
+    """One resumable bulk assessment run backed by a JSONL results file."""
+
+    def __init__(self, results_path: str, concurrency: int = 8):
+        self.results_path = results_path
+        self.concurrency = max(concurrency, 1)
+
+    def completed_ids(self) -> set[str]:
+        """Ids that already have a successful result in the results file."""
+        done = set()
+        if not os.path.exists(self.results_path):
+            return done
+        with open(self.results_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line torn by a crash mid-write
+                if "assessment" in result:
+                    done.add(result["id"])
+        return done
+
+    def drop_torn_tail(self) -> None:
+        """
+        Cut an unterminated last line (a result torn by a crash mid-write),
+        so the next result is appended on a line of its own instead of
+        being glued onto the fragment.
+        """
+        if not os.path.exists(self.results_path):
+            return
+        with open(self.results_path, "rb+") as f:
+            end = pos = f.seek(0, os.SEEK_END)
+            cut = 0
+            while pos > 0:
+                step = min(pos, 64 * 1024)
+                f.seek(pos - step)
+                newline = f.read(step).rfind(b"\n")
+                if newline != -1:
+                    cut = pos - step + newline + 1
+                    break
+                pos -= step
+            if cut < end:
+                f.truncate(cut)
+
+    def iter_results(self) -> Iterable[str]:
+        """Stored result lines (complete ones only)."""
+        if not os.path.exists(self.results_path):
+            return
+        with open(self.results_path, encoding="utf-8") as f:
+            for line in f:
+                if line.endswith("\n"):
+                    yield line
+
+    async def run(self, records: AsyncIterable[dict]) -> AsyncIterator[dict]:
+        """
+        Assess records, yielding results as they complete.
+
+        Each result is {"id", "assessment", "elapsed_ms"} or {"id", "error"}
+        (failed records are not marked done, so a resumed run retries them).
+        """
+        await asyncio.to_thread(self.drop_torn_tail)
+        done = await asyncio.to_thread(self.completed_ids)
+        os.makedirs(os.path.dirname(os.path.abspath(self.results_path)), exist_ok=True)
+        pending: set[asyncio.Task] = set()
+        seen: set[str] = set()
+        with open(self.results_path, "a", encoding="utf-8") as out:
+            def emit(result: dict) -> dict:
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                return result
+
+            try:
+                async for record in records:
+                    if "_error" in record:
+                        metrics.incr("bulk_assessment.invalid")
+                        yield {"id": None, "line": record["_line"], "error": record["_error"]}
+                        continue
+                    rid = record_id(record)
+                    if rid in done or rid in seen:
+                        metrics.incr("bulk_assessment.skipped")
+                        continue
+                    seen.add(rid)
+                    if len(pending) >= self.concurrency:
+                        finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in finished:
+                            yield emit(task.result())
+                    pending.add(asyncio.create_task(self._assess(rid, record)))
+                while pending:
+                    finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in finished:
+                        yield emit(task.result())
+            finally:
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _assess(self, rid: str, record: dict) -> dict:
+        """Assess one record; errors are returned, not raised."""
+        from app.agents.supervisor import assess_answer_node, create_interview_session
+
+        question, answer = record.get("question"), record.get("answer")
+        if not isinstance(question, str) or not isinstance(answer, str):
+            metrics.incr("bulk_assessment.invalid")
+            return {"id": rid, "error": "Record needs string 'question' and 'answer' fields"}
+        state = create_interview_session()
+        state.update(
+            topic=str(record.get("topic") or DEFAULT_TOPIC),
+            current_question=question,
+            current_answer=answer,
+        )
+        started = time.perf_counter()
+        try:
+            update = await assess_answer_node(state)
+        except Exception as e:
+            metrics.incr("bulk_assessment.failed")
+            return {"id": rid, "error": str(e)}
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        metrics.incr("bulk_assessment.completed")
+        metrics.observe("bulk_assessment.assess", elapsed_ms)
+        return {"id": rid, "assessment": update["last_assessment"], "elapsed_ms": round(elapsed_ms, 1)}
+
+
+def run_results_path(runs_dir: str, run_id: str) -> Optional[str]:
+    """Results file for a server-side run id, or None if the id is unsafe."""
+    if not run_id or not all(c.isalnum() or c in "-_" for c in run_id) or len(run_id) > 100:
+        return None
+    return os.path.join(runs_dir, f"{run_id}.jsonl")
@@ -0,0 +1,185 @@
+"""
+Prompt context assembly from retrieved chunks.
+
+Retrieval returns overlapping, often redundant chunks (neighbouring
+chunks share `chunk_overlap` characters, and several chunks may say the
+same thing). Before they go into a prompt they are:
+
+1. selected with maximal marginal relevance (MMR), trading rank
+   relevance against similarity to the chunks already chosen;
+2. merged when they are consecutive chunks of the same document, with
+   the duplicated overlap removed;
+3. cut to a hard token budget.
+
+Token counts are estimated at ~4 characters per token, which is close
+for English text on the OpenAI and Gemini tokenizers and needs no
+tokenizer dependency.
+"""
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+
+CHARS_PER_TOKEN = 4
+PASSAGE_SEPARATOR = "\n\n---\n\n"
+
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class RetrievedChunk:
+    """A chunk returned by retrieval, best-ranked first."""
+    chunk_id: str
+    document_id: str
+    chunk_index: int
+    text: str
+
+    @classmethod
+    def from_id(cls, chunk_id: str, text: str) -> "RetrievedChunk":
+        """Build from a collection id of the form "<document_id>_<chunk_index>"."""
+        document_id, _, index = chunk_id.rpartition("_")
+        return cls(chunk_id, document_id, int(index) if index.isdigit() else 0, text)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a string."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to about max_tokens, preferring a sentence or word boundary."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    boundary = max(cut.rfind(". "), cut.rfind("\n"))
+    if boundary > max_chars // 2:
+        return cut[:boundary + 1].rstrip()
+    boundary = cut.rfind(" ")
+    return (cut[:boundary] if boundary > 0 else cut).rstrip()
+
+
+def _word_set(text: str) -> frozenset[str]:
+    return frozenset(_WORD_RE.findall(text.lower()))
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def select_mmr(
+    chunks: list[RetrievedChunk],
+    k: int,
+    diversity: float = 0.3,
+) -> list[RetrievedChunk]:
+    """
+    Pick k chunks by maximal marginal relevance.
+
+    Relevance is taken from rank (retrieval order); redundancy is the
+    highest word-set Jaccard similarity to an already selected chunk.
+    Jaccard rather than embeddings keeps this free for lexical hits,
+    which carry no vectors. `diversity` is the weight on redundancy
+    (0 = plain top-k).
+    """
+    if len(chunks) <= 1:
+        return chunks[:k]
+    words = [_word_set(chunk.text) for chunk in chunks]
+    relevance = [1.0 - rank / len(chunks) for rank in range(len(chunks))]
+    remaining = list(range(len(chunks)))
+    selected: list[int] = []
+    while remaining and len(selected) < k:
+        def mmr(i: int) -> float:
+            redundancy = max((_jaccard(words[i], words[j]) for j in selected), default=0.0)
+            return (1 - diversity) * relevance[i] - diversity * redundancy
+        best = max(remaining, key=mmr)
+        selected.append(best)
+        remaining.remove(best)
+    return [chunks[i] for i in selected]
+
+
+def _strip_overlap(previous: str, following: str, max_overlap: int) -> Optional[str]:
+    """
+    Return `following` minus the prefix that repeats the end of `previous`,
+    or None if they don't overlap.
+    """
+    limit = min(len(previous), len(following), max_overlap)
+    for size in range(limit, 0, -1):
+        if previous.endswith(following[:size]):
+            return following[size:]
+    return None
+
+
+def merge_adjacent(
+    chunks: list[RetrievedChunk],
+    max_overlap: int = 400,
+) -> list[tuple[int, str]]:
+    """
+    Merge runs of consecutive chunks from the same document.
+
+    Returns (best rank among the merged chunks, passage text) pairs, in
+    rank order. Chunk texts are stripped when indexed, so the overlap is
+    found by matching the longest suffix/prefix (up to max_overlap chars)
+    rather than assuming a fixed length.
+    """
+    by_position = sorted(
+        range(len(chunks)), key=lambda i: (chunks[i].document_id, chunks[i].chunk_index)
+    )
+    passages: list[tuple[int, str]] = []
+    run_rank, run_text, last = None, "", None
+    for i in by_position:
+        chunk = chunks[i]
+        if (
+            last is not None
+            and chunk.document_id == last.document_id
+            and chunk.chunk_index == last.chunk_index + 1
+        ):
+            # The remainder keeps the original whitespace at the seam
+            remainder = _strip_overlap(run_text, chunk.text, max_overlap)
+            run_text += remainder if remainder is not None else "\n" + chunk.text
+            run_rank = min(run_rank, i)
+        else:
+            if last is not None:
+                passages.append((run_rank, run_text))
+            run_rank, run_text = i, chunk.text
+        last = chunk
+    if last is not None:
+        passages.append((run_rank, run_text))
+    return sorted(passages)
+
+
+def assemble_context(
+    chunks: list[RetrievedChunk],
+    token_budget: int,
+    max_chunks: Optional[int] = None,
+    diversity: float = 0.3,
+) -> str:
+    """
+    Build a prompt context from ranked chunks within a token budget.
+
+    Args:
+        chunks: Retrieval results, best first
+        token_budget: Hard cap on the estimated tokens of the result
+        max_chunks: Chunks to keep after MMR (default: all candidates)
+        diversity: MMR redundancy weight
+
+    Returns:
+        Passages joined by separators, most relevant first
+    """
+    if not chunks or token_budget <= 0:
+        return ""
+    selected = select_mmr(chunks, max_chunks or len(chunks), diversity)
+    parts: list[str] = []
+    used = 0
+    for _, passage in merge_adjacent(selected):
+        cost = estimate_tokens(passage) + (estimate_tokens(PASSAGE_SEPARATOR) if parts else 0)
+        if used + cost > token_budget:
+            remaining = token_budget - used - (estimate_tokens(PASSAGE_SEPARATOR) if parts else 0)
+            # Only worth including a truncated passage if a useful amount fits
+            if remaining >= 50:
+                parts.append(truncate_to_tokens(passage, remaining))
+            break
+        parts.append(passage)
+        used += cost
+    return PASSAGE_SEPARATOR.join(parts)
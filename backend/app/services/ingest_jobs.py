@@ -0,0 +1,302 @@
+"""
+Material ingestion pipeline and background job queue.
+
+`ingest_upload` runs read → extract → chunk → embed → insert for a spooled
+upload. Synchronous uploads call it directly; `IngestionJobQueue` runs it
+as a background job so the upload request can return 202 immediately.
+A file whose SHA-256 matches an indexed material is not indexed again.
+If topic digests are enabled, they are computed as a final stage.
+
+Synchronous and background ingestions share one semaphore of
+`ingest_workers` slots, so however uploads arrive at most that many
+documents are being embedded at once and interview traffic keeps the rest
+of the CPU. Jobs waiting for a slot are bounded by `max_queued`.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.models.schemas import JobStage
+from app.services.metrics import metrics
+from app.services.topic_digests import TopicDigests
+from app.services.uploads import SpooledUpload, iter_text_file
+from app.services.vectorstore import VectorStoreService
+
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STAGES = {JobStage.COMPLETED, JobStage.FAILED, JobStage.CANCELLED}
+
+
+class QueueFullError(Exception):
+    """Raised when too many ingestion jobs are already waiting."""
+
+
+@dataclass
+class IngestResult:
+    """Outcome of ingesting one upload."""
+    material_id: str
+    chunks_created: int
+    failed_pages: list[int] = field(default_factory=list)
+    duplicate: bool = False  # identical content was already indexed
+
+
+@dataclass
+class IngestionJob:
+    """State of one background ingestion."""
+    job_id: str
+    material_id: str
+    filename: str
+    size_bytes: int
+    stage: JobStage = JobStage.QUEUED
+    pages_total: Optional[int] = None
+    pages_done: int = 0
+    bytes_read: int = 0
+    chunks_indexed: int = 0
+    failed_pages: list[int] = field(default_factory=list)
+    duplicate: bool = False
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the source read so far (0.0–1.0)."""
+        if self.stage == JobStage.COMPLETED:
+            return 1.0
+        if self.pages_total:
+            return min(self.pages_done / self.pages_total, 1.0)
+        if self.size_bytes:
+            return min(self.bytes_read / self.size_bytes, 1.0)
+        return 0.0
+
+    def to_dict(self) -> dict:
+        """Serializable status for the jobs endpoint."""
+        return {
+            "job_id": self.job_id,
+            "material_id": self.material_id,
+            "filename": self.filename,
+            "stage": self.stage,
+            "progress": round(self.progress, 4),
+            "pages_total": self.pages_total,
+            "pages_done": self.pages_done,
+            "chunks_indexed": self.chunks_indexed,
+            "failed_pages": self.failed_pages,
+            "duplicate": self.duplicate,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+async def ingest_upload(
+    vectorstore: VectorStoreService,
+    upload: SpooledUpload,
+    material_id: str,
+    job: Optional[IngestionJob] = None,
+    digests: Optional[TopicDigests] = None,
+) -> IngestResult:
+    """
+    Extract, chunk and index a spooled upload under `material_id`.
+
+    If a material with the same content hash is already indexed (or being
+    indexed concurrently), its id is returned instead. If `job` is given
+    its stage and progress counters are updated as the pipeline advances.
+    Chunks already written for `material_id` are removed if ingestion
+    fails or is cancelled. If `digests` is given, the new material's topic
+    digests are built last; a failure there doesn't fail the ingestion.
+    """
+    async with vectorstore.content_lock(upload.sha256):
+        existing = await vectorstore.find_document_by_hash(upload.sha256)
+        if existing is not None:
+            metrics.incr("ingest.dedup.document")
+            return IngestResult(
+                material_id=existing["id"],
+                chunks_created=existing["chunk_count"],
+                duplicate=True,
+            )
+        result = await _index_upload(vectorstore, upload, material_id, job)
+    
+    if digests is not None and result.chunks_created:
+        if job:
+            job.stage = JobStage.DIGESTING
+        try:
+            await digests.build(material_id, upload.filename)
+        except Exception as e:
+            # The material is usable without digests (live context fallback)
+            logger.warning("Digest build failed for %s: %s", material_id, e)
+            metrics.incr("digests.build_failed")
+    return result
+
+
+async def _index_upload(
+    vectorstore: VectorStoreService,
+    upload: SpooledUpload,
+    material_id: str,
+    job: Optional[IngestionJob],
+) -> IngestResult:
+    failed_pages = job.failed_pages if job else []
+
+    def on_pages(done: int, total: int) -> None:
+        if job:
+            job.pages_done, job.pages_total = done, total
+
+    def on_chunks(count: int) -> None:
+        if job:
+            job.stage = JobStage.INDEXING
+            job.chunks_indexed = count
+
+    if job:
+        job.stage = JobStage.EXTRACTING
+
+    # Text is extracted lazily from disk; PDF pages are extracted in
+    # parallel in the PDF process pool
+    if upload.extension == ".pdf":
+        text_content = vectorstore.aiter_pdf_text(upload.path, failed_pages, on_pages)
+    else:
+        text_content = _count_read(iter_text_file(upload.path), job)
+
+    # index_document removes whatever it wrote if it fails or is cancelled
+    chunks_created = await vectorstore.index_document(
+        document_id=material_id,
+        content=text_content,
+        metadata={
+            "filename": upload.filename,
+            "type": upload.extension,
+            "content_hash": upload.sha256,
+        },
+        progress=on_chunks,
+    )
+    return IngestResult(material_id, chunks_created, failed_pages)
+
+
+def _count_read(pieces, job: Optional[IngestionJob]):
+    """Pass text pieces through, tracking approximate bytes read on the job."""
+    for piece in pieces:
+        if job:
+            job.bytes_read += len(piece.encode("utf-8"))
+        yield piece
+
+
+class IngestionJobQueue:
+    """
+    Bounded in-process runner for background ingestion jobs.
+
+    Each job runs in its own task that first waits for an ingestion slot.
+    Cancelling a job cancels its task whether it is still queued or already
+    running; partial chunks are removed and the spooled file is deleted.
+    The newest `keep_finished` finished jobs stay queryable.
+    """
+
+    def __init__(
+        self,
+        vectorstore: VectorStoreService,
+        workers: int = 2,
+        max_queued: int = 16,
+        keep_finished: int = 200,
+        digests: Optional[TopicDigests] = None,
+    ):
+        self.vectorstore = vectorstore
+        self.digests = digests
+        self.workers = max(workers, 1)
+        self.max_queued = max_queued
+        self.keep_finished = keep_finished
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._jobs: OrderedDict[str, IngestionJob] = OrderedDict()
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        """Ingestion slots shared by background jobs and synchronous uploads."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        return self._slots
+
+    def queued_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.stage == JobStage.QUEUED)
+
+    def submit(self, upload: SpooledUpload) -> IngestionJob:
+        """
+        Queue a spooled upload for background ingestion.
+
+        The job takes ownership of the spooled file and deletes it when done.
+
+        Raises:
+            QueueFullError: if max_queued jobs are already waiting
+        """
+        if self.queued_count() >= self.max_queued:
+            raise QueueFullError(
+                f"Too many ingestion jobs queued ({self.max_queued}); retry later"
+            )
+        job = IngestionJob(
+            job_id=str(uuid.uuid4()),
+            material_id=str(uuid.uuid4()),
+            filename=upload.filename,
+            size_bytes=upload.size,
+        )
+        self._jobs[job.job_id] = job
+        job.task = asyncio.create_task(self._run(job, upload))
+        metrics.incr("ingest_jobs.submitted")
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation; returns False if the job is unknown or finished."""
+        job = self._jobs.get(job_id)
+        if job is None or job.stage in FINISHED_STAGES or job.task is None:
+            return False
+        job.task.cancel()
+        return True
+
+    async def shutdown(self) -> None:
+        """Cancel all unfinished jobs and wait for their cleanup."""
+        tasks = [
+            job.task for job in self._jobs.values()
+            if job.task is not None and not job.task.done()
+        ]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: IngestionJob, upload: SpooledUpload) -> None:
+        try:
+            async with self.slots:
+                job.started_at = time.time()
+                metrics.observe("ingest_jobs.queue_wait", (job.started_at - job.created_at) * 1000)
+                result = await ingest_upload(
+                    self.vectorstore, upload, job.material_id, job, self.digests
+                )
+            if result.duplicate:
+                job.material_id = result.material_id
+                job.chunks_indexed = result.chunks_created
+                job.duplicate = True
+            job.stage = JobStage.COMPLETED
+        except asyncio.CancelledError:
+            job.stage = JobStage.CANCELLED
+            # Swallowed: the job task ends here, cancellation is recorded on the job
+        except Exception as e:
+            logger.exception("Ingestion job %s failed", job.job_id)
+            job.stage = JobStage.FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            upload.cleanup()
+            metrics.incr(f"ingest_jobs.{job.stage.value}")
+            self._prune_finished()
+
+    def _prune_finished(self) -> None:
+        """Forget the oldest finished jobs beyond keep_finished."""
+        finished = [
+            job_id for job_id, job in self._jobs.items() if job.stage in FINISHED_STAGES
+        ]
+        for job_id in finished[:max(len(finished) - self.keep_finished, 0)]:
+            del self._jobs[job_id]
@@ -0,0 +1,208 @@
+"""
+BM25 inverted index over material chunks.
+
+Short keyword topics ("Cloud Run cold starts", "Artifact Registry") are
+matched better and far more cheaply by term statistics than by embedding
+similarity. This index mirrors the Chroma collection chunk for chunk:
+postings are written alongside each `collection.add` batch and removed
+with the document.
+
+The index is a WAL-mode SQLite file next to the Chroma data, so it
+survives restarts and is shared by every worker on the host. Postings are
+keyed by (term, chunk_id); a query reads only the postings of its own
+terms, so lexical search never embeds anything and its cost scales with
+the query terms' document frequencies, not the corpus size.
+"""
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Optional
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    """a an and are as at be but by can do does for from has have how i if in
+    into is it its of on or so that the their them then there these they this
+    to was what when where which while who why will with you your about""".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-case alphanumeric terms, without stopwords or single letters."""
+    return [
+        term for term in _TOKEN_RE.findall(text.lower())
+        if term not in _STOPWORDS and (len(term) > 1 or term.isdigit())
+    ]
+
+
+class BM25Index:
+    """SQLite-backed BM25 inverted index of chunks."""
+
+    def __init__(self, db_path: str, k1: float = 1.2, b: float = 0.75):
+        self.db_path = db_path
+        self.k1 = k1
+        self.b = b
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+            conn.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                CREATE TABLE IF NOT EXISTS lex_chunks (
+                    chunk_id TEXT PRIMARY KEY,
+                    document_id TEXT NOT NULL,
+                    length INTEGER NOT NULL,
+                    text TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_lex_chunks_document
+                    ON lex_chunks(document_id);
+                CREATE TABLE IF NOT EXISTS lex_postings (
+                    term TEXT NOT NULL,
+                    chunk_id TEXT NOT NULL,
+                    tf INTEGER NOT NULL,
+                    PRIMARY KEY (term, chunk_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_lex_postings_chunk
+                    ON lex_postings(chunk_id);
+                CREATE TABLE IF NOT EXISTS lex_stats (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO lex_stats (key, value) VALUES ('chunks', 0), ('length', 0);
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    # ── Writes ──
+
+    def add_chunks(
+        self,
+        document_id: str,
+        chunk_ids: list[str],
+        texts: list[str],
+    ) -> None:
+        """Index a batch of chunks (replacing any with the same ids)."""
+        rows = []
+        postings = []
+        for chunk_id, text in zip(chunk_ids, texts):
+            counts = Counter(tokenize(text))
+            rows.append((chunk_id, document_id, sum(counts.values()), text))
+            postings.extend((term, chunk_id, tf) for term, tf in counts.items())
+        with self._lock:
+            conn = self.conn
+            self._delete_chunk_ids(chunk_ids)
+            conn.executemany(
+                "INSERT INTO lex_chunks (chunk_id, document_id, length, text) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany(
+                "INSERT INTO lex_postings (term, chunk_id, tf) VALUES (?, ?, ?)", postings
+            )
+            self._adjust_stats(len(rows), sum(row[2] for row in rows))
+            conn.commit()
+
+    def delete_document(self, document_id: str) -> int:
+        """Remove all chunks of a document; returns the number removed."""
+        with self._lock:
+            removed = self._delete_where("document_id = ?", [document_id])
+            self.conn.commit()
+        return removed
+
+    def _delete_chunk_ids(self, chunk_ids: list[str]) -> None:
+        """Delete a batch of chunks and their postings (caller holds the lock)."""
+        if chunk_ids:
+            self._delete_where(f"chunk_id IN ({','.join('?' * len(chunk_ids))})", chunk_ids)
+
+    def _delete_where(self, condition: str, params: list) -> int:
+        """Delete the lex_chunks rows matching `condition` with their postings."""
+        count, length = self.conn.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(length), 0) FROM lex_chunks WHERE {condition}",
+            params,
+        ).fetchone()
+        if not count:
+            return 0
+        self.conn.execute(
+            f"DELETE FROM lex_postings WHERE chunk_id IN (SELECT chunk_id FROM lex_chunks WHERE {condition})",
+            params,
+        )
+        self.conn.execute(f"DELETE FROM lex_chunks WHERE {condition}", params)
+        self._adjust_stats(-count, -length)
+        return count
+
+    def _adjust_stats(self, chunks: int, length: int) -> None:
+        self.conn.executemany(
+            "UPDATE lex_stats SET value = value + ? WHERE key = ?",
+            [(chunks, "chunks"), (length, "length")],
+        )
+
+    # ── Reads ──
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM lex_chunks LIMIT 1").fetchone() is None
+
+    def search(
+        self,
+        query: str,
+        n_results: int = 5,
+        document_id: Optional[str] = None,
+    ) -> list[tuple[str, str, float]]:
+        """
+        Rank chunks for a query by BM25.
+
+        Returns:
+            [(chunk_id, text, score)] best first; empty if no term matches
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+        placeholders = ",".join("?" * len(terms))
+        doc_filter = " AND c.document_id = ?" if document_id else ""
+        with self._lock:
+            stats = dict(self.conn.execute("SELECT key, value FROM lex_stats"))
+            total_chunks = stats["chunks"]
+            if not total_chunks:
+                return []
+            doc_freqs = dict(self.conn.execute(
+                f"SELECT term, COUNT(*) FROM lex_postings WHERE term IN ({placeholders}) GROUP BY term",
+                terms,
+            ))
+            rows = self.conn.execute(
+                f"""SELECT p.term, p.chunk_id, p.tf, c.length
+                    FROM lex_postings p JOIN lex_chunks c ON c.chunk_id = p.chunk_id
+                    WHERE p.term IN ({placeholders}){doc_filter}""",
+                [*terms, document_id] if document_id else terms,
+            ).fetchall()
+
+        avg_length = stats["length"] / total_chunks or 1.0
+        scores: dict[str, float] = {}
+        for term, chunk_id, tf, length in rows:
+            df = doc_freqs[term]
+            idf = math.log(1 + (total_chunks - df + 0.5) / (df + 0.5))
+            norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+        top = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:n_results]
+        if not top:
+            return []
+        with self._lock:
+            texts = dict(self.conn.execute(
+                f"SELECT chunk_id, text FROM lex_chunks WHERE chunk_id IN ({','.join('?' * len(top))})",
+                [chunk_id for chunk_id, _ in top],
+            ))
+        return [(chunk_id, texts[chunk_id], score) for chunk_id, score in top]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
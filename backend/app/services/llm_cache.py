@@ -0,0 +1,368 @@
+"""
+Deterministic LLM response cache.
+
+All nodes call their models at temperature 0, so identical prompts yield
+(practically) identical responses. This module caches response text keyed
+by a hash of (model name, role, message contents) in two tiers:
+
+- a bounded in-memory LRU per process
+- an optional SQLite tier shared across workers, with TTL and size-based
+  eviction, read in a worker thread and written by a single writer thread
+
+Caching is opt-in (LLM_CACHE_ENABLED): serving a stored response replaces
+a fresh interviewer turn, which changes behaviour for repeated prompts.
+
+Structured output (`with_structured_output` with a pydantic schema) is
+cached too: a validated result is stored as its JSON, under a key that
+also covers the schema and options, and rebuilt from it on a hit. Results
+that failed validation are never stored.
+
+Callers can bypass the cache for the current request via the
+`bypass_llm_cache` context variable (set from the X-Bypass-LLM-Cache header).
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from app.config import get_settings
+from app.services.metrics import metrics
+
+
+# Per-request bypass switch (set by middleware in app.main)
+bypass_llm_cache: ContextVar[bool] = ContextVar("bypass_llm_cache", default=False)
+
+
+def make_cache_key(model_name: str, role: str, messages: list) -> str:
+    """Hash (model name, role, message types and contents) into a cache key."""
+    payload = [model_name, role] + [
+        [getattr(m, "type", type(m).__name__), getattr(m, "content", str(m))]
+        for m in messages
+    ]
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-tier (memory LRU + SQLite) cache of LLM response text.
+
+    Memory lookups happen inline. Disk reads run in a worker thread
+    (`aget`), and disk writes are queued to a single writer thread, so
+    SQLite I/O never blocks the event loop. The writer keeps a running row
+    count. Expired rows are dropped every `evict_every` writes, and the
+    table is trimmed to 90% of `disk_entries` whenever it grows past it.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "",
+        memory_entries: int = 512,
+        disk_entries: int = 10000,
+        ttl_seconds: int = 86400,
+        evict_every: int = 100,
+    ):
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.evict_every = max(evict_every, 1)
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()  # memory tier
+        self._db_lock = threading.Lock()  # SQLite connection
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._disk_count = 0
+        self._writes_since_evict = 0
+
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    role TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache(created_at)"
+            )
+            self._conn.commit()
+            # Counted once; the writer keeps it current from then on
+            (self._disk_count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-cache-write")
+
+    def _get_memory(self, key: str, now: float) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            response, created_at = entry
+            if now - created_at < self.ttl_seconds:
+                self._memory.move_to_end(key)
+                return response
+            del self._memory[key]
+            return None
+
+    def _get_disk(self, key: str, now: float) -> Optional[str]:
+        """Disk lookup, promoting hits into the memory tier (blocking)."""
+        with self._db_lock:
+            if self._conn is None:
+                return None
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        response, created_at = row
+        if now - created_at >= self.ttl_seconds:
+            return None  # dropped by the next eviction pass
+        with self._lock:
+            self._remember(key, response, created_at)
+        return response
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a response (blocking; use `aget` on the event loop)."""
+        now = time.time()
+        response = self._get_memory(key, now)
+        if response is None and self._conn is not None:
+            response = self._get_disk(key, now)
+        return response
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Look up a response, reading the disk tier in a worker thread."""
+        now = time.time()
+        response = self._get_memory(key, now)
+        if response is None and self._conn is not None:
+            response = await asyncio.to_thread(self._get_disk, key, now)
+        return response
+
+    def set(self, key: str, role: str, response: str) -> None:
+        """Store a response in memory now and queue the disk write."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+        if self._writer is not None:
+            try:
+                self._writer.submit(self._write_disk, key, role, response, now)
+            except RuntimeError:
+                pass  # shutting down
+
+    def flush(self) -> None:
+        """Wait for queued disk writes to finish."""
+        if self._writer is not None:
+            self._writer.submit(lambda: None).result()
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._memory.clear()
+        if self._conn is not None:
+            self.flush()
+            with self._db_lock:
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+                self._disk_count = 0
+
+    def close(self) -> None:
+        """Finish queued writes and close the SQLite connection."""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _remember(self, key: str, response: str, created_at: float) -> None:
+        """Insert into the memory LRU (caller holds the lock)."""
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _write_disk(self, key: str, role: str, response: str, now: float) -> None:
+        """Upsert one row and evict when due (writer thread)."""
+        with self._db_lock:
+            if self._conn is None:
+                return
+            updated = self._conn.execute(
+                "UPDATE llm_cache SET role = ?, response = ?, created_at = ? WHERE key = ?",
+                (role, response, now, key),
+            ).rowcount
+            if not updated:
+                self._conn.execute(
+                    "INSERT INTO llm_cache (key, role, response, created_at) VALUES (?, ?, ?, ?)",
+                    (key, role, response, now),
+                )
+                self._disk_count += 1
+            self._writes_since_evict += 1
+            if self._writes_since_evict >= self.evict_every or self._disk_count > self.disk_entries:
+                self._evict_disk(now)
+            self._conn.commit()
+
+    def _evict_disk(self, now: float) -> None:
+        """Drop expired rows and trim an overfull table (caller holds the db lock)."""
+        self._writes_since_evict = 0
+        self._disk_count -= self._conn.execute(
+            "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        if self._disk_count > self.disk_entries:
+            # Trim to 90% so a full table isn't trimmed again on every write
+            excess = self._disk_count - self.disk_entries * 9 // 10
+            self._disk_count -= self._conn.execute(
+                """DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY created_at ASC LIMIT ?
+                )""",
+                (excess,),
+            ).rowcount
+
+
+class _CachedStructuredRunnable:
+    """Structured-output runnable of a cached model; valid results are cached as JSON."""
+
+    def __init__(self, runnable, owner: "CachedChatModel", schema, include_raw: bool, variant: str):
+        self.runnable = runnable
+        self.owner = owner
+        self.schema = schema
+        self.include_raw = include_raw
+        self.variant = variant
+
+    def __getattr__(self, name):
+        return getattr(self.runnable, name)
+
+    def _from_cache(self, cached: str):
+        parsed = self.schema.model_validate_json(cached)
+        if self.include_raw:
+            return {"raw": AIMessage(content=cached), "parsed": parsed, "parsing_error": None}
+        return parsed
+
+    def _store(self, key: str, result) -> None:
+        parsed = result["parsed"] if self.include_raw else result
+        if parsed is not None:
+            self.owner.cache.set(key, self.owner.role, parsed.model_dump_json())
+
+    def invoke(self, messages, config=None, **kwargs):
+        key, cached = self.owner._lookup(messages, self.variant)
+        if cached is not None:
+            return self._from_cache(cached)
+        result = self.runnable.invoke(messages, config, **kwargs)
+        self._store(key, result)
+        return result
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        key, cached = await self.owner._alookup(messages, self.variant)
+        if cached is not None:
+            return self._from_cache(cached)
+        result = await self.runnable.ainvoke(messages, config, **kwargs)
+        self._store(key, result)
+        return result
+
+
+class CachedChatModel:
+    """
+    Wraps a chat model so invoke/ainvoke/astream (and structured-output
+    runnables with a pydantic schema) are served from the cache.
+
+    Anything else (bind_tools, ...) is delegated to the wrapped model
+    unchanged.
+    """
+
+    def __init__(self, model, cache: LLMResponseCache, model_name: str, role: str):
+        self.model = model
+        self.cache = cache
+        self.model_name = model_name
+        self.role = role
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def _bypassed(self) -> bool:
+        if bypass_llm_cache.get():
+            metrics.incr(f"llm_cache.{self.role}.bypass")
+            return True
+        return False
+
+    def _count(self, cached: Optional[str]) -> None:
+        metrics.incr(f"llm_cache.{self.role}.{'hit' if cached is not None else 'miss'}")
+
+    def _lookup(self, messages: list, variant: str = "") -> tuple[str, Optional[str]]:
+        key = make_cache_key(f"{self.model_name}{variant}", self.role, messages)
+        if self._bypassed():
+            return key, None
+        cached = self.cache.get(key)
+        self._count(cached)
+        return key, cached
+
+    async def _alookup(self, messages: list, variant: str = "") -> tuple[str, Optional[str]]:
+        key = make_cache_key(f"{self.model_name}{variant}", self.role, messages)
+        if self._bypassed():
+            return key, None
+        cached = await self.cache.aget(key)
+        self._count(cached)
+        return key, cached
+
+    def _store(self, key: str, response) -> None:
+        content = response.content
+        if isinstance(content, list):
+            content = "".join(
+                c.get("text", "") if isinstance(c, dict) else str(c) for c in content
+            )
+        self.cache.set(key, self.role, str(content))
+
+    def invoke(self, messages, config=None, **kwargs):
+        key, cached = self._lookup(messages)
+        if cached is not None:
+            return AIMessage(content=cached)
+        response = self.model.invoke(messages, config, **kwargs)
+        self._store(key, response)
+        return response
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        key, cached = await self._alookup(messages)
+        if cached is not None:
+            return AIMessage(content=cached)
+        response = await self.model.ainvoke(messages, config, **kwargs)
+        self._store(key, response)
+        return response
+
+    async def astream(self, messages, config=None, **kwargs):
+        key, cached = await self._alookup(messages)
+        if cached is not None:
+            yield AIMessageChunk(content=cached)
+            return
+        full = None
+        async for chunk in self.model.astream(messages, config, **kwargs):
+            full = chunk if full is None else full + chunk
+            yield chunk
+        if full is not None:
+            self._store(key, full)
+
+    def with_structured_output(self, schema, *, include_raw: bool = False, **kwargs):
+        runnable = self.model.with_structured_output(schema, include_raw=include_raw, **kwargs)
+        if not hasattr(schema, "model_validate_json"):
+            return runnable  # dict / JSON schemas: nothing to rebuild a hit into
+        variant = f":structured:{schema.__name__}:{include_raw}:{sorted(kwargs.items())}"
+        return _CachedStructuredRunnable(runnable, self, schema, include_raw, variant)
+
+
+@lru_cache
+def get_llm_cache() -> LLMResponseCache:
+    """Get the process-wide LLM response cache configured from Settings."""
+    settings = get_settings()
+    return LLMResponseCache(
+        db_path=settings.llm_cache_path,
+        memory_entries=settings.llm_cache_memory_entries,
+        disk_entries=settings.llm_cache_disk_entries,
+        ttl_seconds=settings.llm_cache_ttl_seconds,
+    )
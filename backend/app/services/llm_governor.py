@@ -0,0 +1,316 @@
+"""
+Process-wide governor for LLM calls.
+
+Every pooled chat model returned by `get_model` is wrapped so its async
+calls pass through one shared `LLMGovernor`:
+
+- concurrency: a semaphore per provider (`llm_max_concurrent`) and an
+  optional tighter one per (provider, role), so a burst of assessments
+  can't starve question generation or the other way round
+- rate: token buckets per provider for requests per minute and tokens
+  per minute. Prompt tokens are estimated (~4 chars/token) and charged up
+  front; the bucket is corrected from the response's reported usage
+  (or an estimate of the output) once the call returns
+- singleflight: identical `ainvoke` calls in flight (same model, role and
+  messages, e.g. `gather_context_node` for a popular topic) share one
+  upstream call. The shared call is cancelled only when every caller
+  waiting on it has gone
+- metrics: queued / in-flight gauges and peak queue depth per
+  provider and role, queue-wait timings, and counters for upstream calls
+  and coalesced requests
+
+Streams hold a slot for their whole duration but are not coalesced.
+Synchronous `invoke` is delegated unchanged (the app only calls models
+asynchronously). Limits are per worker process.
+"""
+import asyncio
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Optional
+
+from app.config import get_settings
+from app.services.context_assembler import estimate_tokens
+from app.services.llm_cache import make_cache_key
+from app.services.metrics import metrics
+
+
+class TokenBucket:
+    """Continuously refilled budget of `per_minute` units (0 = unlimited)."""
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.per_minute, self.tokens + (now - self.updated) * self.per_minute / 60)
+        self.updated = now
+
+    async def acquire(self, amount: float) -> None:
+        """Take `amount` units, waiting for the refill. Waiters are served in arrival order."""
+        if self.per_minute <= 0:
+            return
+        # A request larger than the whole budget still runs, on an empty bucket
+        amount = min(amount, self.per_minute)
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) * 60 / self.per_minute)
+                self._refill()
+            self.tokens -= amount
+
+    def adjust(self, amount: float) -> None:
+        """Charge (or refund, if negative) units after the fact; may go into debt."""
+        if self.per_minute <= 0:
+            return
+        self._refill()
+        self.tokens = min(self.per_minute, self.tokens - amount)
+
+
+def _message_tokens(messages: Any) -> int:
+    """Estimated prompt tokens of a message list."""
+    if not isinstance(messages, list):
+        return estimate_tokens(str(messages))
+    return sum(estimate_tokens(str(getattr(m, "content", m))) for m in messages)
+
+
+def _response_tokens(result: Any) -> Optional[int]:
+    """Total tokens reported by the provider, or an estimate of the output."""
+    if isinstance(result, dict) and "raw" in result:  # with_structured_output(include_raw=True)
+        result = result["raw"]
+    usage = getattr(result, "usage_metadata", None) or {}
+    if usage.get("total_tokens"):
+        return usage["total_tokens"]
+    content = getattr(result, "content", None)
+    if content is None:
+        return None
+    return estimate_tokens(str(content))
+
+
+class _Flight:
+    """One upstream call shared by every identical request in flight."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class LLMGovernor:
+    """Shared concurrency, rate and singleflight control for model calls."""
+
+    def __init__(
+        self,
+        max_concurrent: int = 32,
+        role_concurrency: Optional[dict[str, int]] = None,
+        rpm: int = 0,
+        tpm: int = 0,
+        coalesce: bool = True,
+    ):
+        self.max_concurrent = max_concurrent
+        self.role_concurrency = {role: n for role, n in (role_concurrency or {}).items() if n > 0}
+        self.rpm = rpm
+        self.tpm = tpm
+        self.coalesce = coalesce
+        self._semaphores: dict[tuple, asyncio.Semaphore] = {}
+        self._buckets: dict[tuple, TokenBucket] = {}
+        self._flights: dict[str, _Flight] = {}
+        self._queued: dict[tuple, int] = defaultdict(int)
+        self._running: dict[tuple, int] = defaultdict(int)
+        self._peak: dict[tuple, int] = defaultdict(int)
+
+    def _semaphore(self, key: tuple, limit: int) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(limit)
+        return semaphore
+
+    def _bucket(self, provider: str, kind: str) -> TokenBucket:
+        bucket = self._buckets.get((provider, kind))
+        if bucket is None:
+            bucket = self._buckets[(provider, kind)] = TokenBucket(self.rpm if kind == "rpm" else self.tpm)
+        return bucket
+
+    def _publish(self, provider: str, role: str) -> None:
+        key = (provider, role)
+        label = f"llm_governor.{provider}.{role}"
+        self._peak[key] = max(self._peak[key], self._queued[key])
+        metrics.gauge(f"{label}.queued", self._queued[key])
+        metrics.gauge(f"{label}.in_flight", self._running[key])
+        metrics.gauge(f"{label}.queued_peak", self._peak[key])
+
+    @asynccontextmanager
+    async def slot(self, provider: str, role: str, prompt_tokens: int):
+        """
+        Hold a concurrency slot (and rate budget) for one upstream call.
+        Yields a callback that reports the tokens the call actually used.
+        """
+        key = (provider, role)
+        label = f"llm_governor.{provider}.{role}"
+        self._queued[key] += 1
+        self._publish(provider, role)
+        started = time.perf_counter()
+        acquired = []
+        try:
+            try:
+                # Role slot first: waiting for it must not hold a provider slot
+                if role in self.role_concurrency:
+                    semaphore = self._semaphore(key, self.role_concurrency[role])
+                    await semaphore.acquire()
+                    acquired.append(semaphore)
+                if self.max_concurrent > 0:
+                    semaphore = self._semaphore((provider,), self.max_concurrent)
+                    await semaphore.acquire()
+                    acquired.append(semaphore)
+                await self._bucket(provider, "rpm").acquire(1)
+                await self._bucket(provider, "tpm").acquire(prompt_tokens)
+            finally:
+                self._queued[key] -= 1
+            waited_ms = (time.perf_counter() - started) * 1000
+            metrics.observe(f"{label}.wait", waited_ms)
+            metrics.incr(f"{label}.calls")
+            self._running[key] += 1
+            self._publish(provider, role)
+
+            def report(total_tokens: Optional[int]) -> None:
+                if total_tokens is not None:
+                    self._bucket(provider, "tpm").adjust(total_tokens - prompt_tokens)
+
+            try:
+                yield report
+            finally:
+                self._running[key] -= 1
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+            self._publish(provider, role)
+
+    async def _run(self, provider: str, role: str, prompt_tokens: int, call: Callable[[], Awaitable]) -> Any:
+        async with self.slot(provider, role, prompt_tokens) as report:
+            result = await call()
+            report(_response_tokens(result))
+            return result
+
+    async def call(
+        self,
+        provider: str,
+        role: str,
+        messages: Any,
+        call: Callable[[], Awaitable],
+        flight_key: Optional[str] = None,
+    ) -> Any:
+        """
+        Run `call()` under the limits. Concurrent calls with the same
+        `flight_key` share one upstream call and its result (or error).
+        """
+        prompt_tokens = _message_tokens(messages)
+        if flight_key is None or not self.coalesce:
+            return await self._run(provider, role, prompt_tokens, call)
+
+        flight = self._flights.get(flight_key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(self._run(provider, role, prompt_tokens, call)))
+            self._flights[flight_key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(flight_key, flight))
+        else:
+            metrics.incr(f"llm_governor.{provider}.{role}.coalesced")
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller gave up: stop the upstream call, and wait
+                # for it so its slot is free when the caller moves on
+                self._forget(flight_key, flight)
+                flight.task.cancel()
+                await asyncio.gather(flight.task, return_exceptions=True)
+
+    def _forget(self, flight_key: str, flight: _Flight) -> None:
+        if self._flights.get(flight_key) is flight:
+            del self._flights[flight_key]
+
+
+class _GovernedRunnable:
+    """A runnable derived from a governed model (e.g. structured output)."""
+
+    def __init__(self, runnable, owner: "GovernedChatModel", variant: str):
+        self.runnable = runnable
+        self.owner = owner
+        self.variant = variant
+
+    def __getattr__(self, name):
+        return getattr(self.runnable, name)
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        return await self.owner._call(
+            messages,
+            lambda: self.runnable.ainvoke(messages, config, **kwargs),
+            variant=self.variant,
+            coalesce=config is None and not kwargs,
+        )
+
+
+class GovernedChatModel:
+    """
+    Wraps a chat model so ainvoke/astream (and structured-output runnables
+    built from it) go through the governor. Anything else is delegated.
+    """
+
+    def __init__(self, model, governor: LLMGovernor, provider: str, model_name: str, role: str):
+        self.model = model
+        self.governor = governor
+        self.provider = provider
+        self.model_name = model_name
+        self.role = role
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    async def _call(self, messages, call: Callable[[], Awaitable], variant: str = "", coalesce: bool = True):
+        flight_key = None
+        if coalesce and isinstance(messages, list):
+            flight_key = make_cache_key(f"{self.model_name}{variant}", self.role, messages)
+        return await self.governor.call(self.provider, self.role, messages, call, flight_key)
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        return await self._call(
+            messages,
+            lambda: self.model.ainvoke(messages, config, **kwargs),
+            coalesce=config is None and not kwargs,
+        )
+
+    async def astream(self, messages, config=None, **kwargs):
+        async with self.governor.slot(self.provider, self.role, _message_tokens(messages)) as report:
+            full = None
+            async for chunk in self.model.astream(messages, config, **kwargs):
+                full = chunk if full is None else full + chunk
+                yield chunk
+            report(_response_tokens(full) if full is not None else None)
+
+    def with_structured_output(self, schema, **kwargs):
+        runnable = self.model.with_structured_output(schema, **kwargs)
+        variant = f":structured:{getattr(schema, '__name__', schema)}:{sorted(kwargs.items())}"
+        return _GovernedRunnable(runnable, self, variant)
+
+
+@lru_cache
+def get_llm_governor() -> LLMGovernor:
+    """Get the process-wide LLM governor configured from Settings."""
+    settings = get_settings()
+    return LLMGovernor(
+        max_concurrent=settings.llm_max_concurrent,
+        role_concurrency={
+            "context": settings.llm_max_concurrent_context,
+            "question": settings.llm_max_concurrent_question,
+            "assessment": settings.llm_max_concurrent_assessment,
+        },
+        rpm=settings.llm_rpm,
+        tpm=settings.llm_tpm,
+        coalesce=settings.llm_coalesce,
+    )
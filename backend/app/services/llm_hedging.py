@@ -0,0 +1,245 @@
+"""
+Per-role deadlines and hedged requests across LLM providers.
+
+`MODEL_MAP` defines equivalent role models for each provider. With
+LLM_HEDGE on and LLM_SECONDARY_PROVIDER set, `get_model` returns a
+`HedgedChatModel` that sends each call to the primary provider and, if no
+answer has come back after the primary's observed latency percentile for
+that role (LLM_HEDGE_PERCENTILE, p90 by default), sends the same request
+to the secondary. Whichever answers first wins and the other is
+cancelled. The secondary is also tried at once when the primary fails.
+Until the role has LLM_HEDGE_MIN_SAMPLES primary latencies,
+LLM_HEDGE_INITIAL_MS is used as the hedge delay.
+
+A primary call that loses is recorded with the time it had run when it
+was cancelled, a lower bound on its real latency. Leaving those calls out
+would drop the slow tail from the window. The percentile would then fall
+and hedging would happen more and more often.
+
+Per-role deadlines (LLM_DEADLINE_MS_<ROLE>) bound the whole call,
+including the hedge. When one expires, everything in flight is cancelled
+and `LLMDeadlineExceeded` is raised (HTTP 504). For streams the deadline
+and the race cover the time to the first chunk; after that the winning
+stream is read to the end.
+
+Metrics: per-provider latency timings (`llm.<provider>.<role>`),
+`llm_hedge.<role>.hedged`, `.failover`, `.won.primary` and
+`.won.secondary`, and `llm_deadline.<role>.exceeded`.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+from app.services.metrics import metrics
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """A model call did not finish within its role's deadline."""
+
+    def __init__(self, role: str, deadline_ms: int):
+        super().__init__(f"The {role} model did not respond within {deadline_ms} ms")
+        self.role = role
+        self.deadline_ms = deadline_ms
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies per (provider, role)."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: dict[tuple, deque] = {}
+
+    def record(self, provider: str, role: str, latency_ms: float) -> None:
+        samples = self._samples.get((provider, role))
+        if samples is None:
+            samples = self._samples[(provider, role)] = deque(maxlen=self.window)
+        samples.append(latency_ms)
+
+    def count(self, provider: str, role: str) -> int:
+        return len(self._samples.get((provider, role), ()))
+
+    def percentile(self, provider: str, role: str, q: float) -> Optional[float]:
+        """The q-quantile (0..1) of the window, or None if it is empty."""
+        samples = self._samples.get((provider, role))
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class HedgedChatModel:
+    """
+    Puts a role's deadline and optional hedging around a primary model
+    (and a secondary model for the same role on another provider).
+    Anything other than ainvoke/astream/with_structured_output is delegated
+    to the primary.
+    """
+
+    def __init__(
+        self,
+        primary,
+        secondary,
+        role: str,
+        providers: tuple[str, str],
+        tracker: LatencyTracker,
+        deadline_ms: int = 0,
+        hedge_percentile: float = 0.9,
+        hedge_min_samples: int = 20,
+        hedge_initial_ms: int = 2000,
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.role = role
+        self.providers = providers
+        self.tracker = tracker
+        self.deadline_ms = deadline_ms
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_initial_ms = hedge_initial_ms
+
+    def __getattr__(self, name):
+        return getattr(self.primary, name)
+
+    def hedge_delay_ms(self) -> float:
+        """How long the primary gets before the request is hedged."""
+        provider = self.providers[0]
+        if self.tracker.count(provider, self.role) < self.hedge_min_samples:
+            return self.hedge_initial_ms
+        return self.tracker.percentile(provider, self.role, self.hedge_percentile)
+
+    def _record(self, which: int, latency_ms: float) -> None:
+        provider = self.providers[which]
+        self.tracker.record(provider, self.role, latency_ms)
+        metrics.observe(f"llm.{provider}.{self.role}", latency_ms)
+
+    async def _race(
+        self,
+        primary: Callable[[], Awaitable],
+        secondary: Optional[Callable[[], Awaitable]],
+        discard: Optional[Callable[[Any], Awaitable]] = None,
+    ) -> Any:
+        """
+        Run primary(), hedging to secondary() if it is slow or fails; first
+        success wins. A losing call that also finished has its result passed
+        to `discard` (e.g. to close an opened stream).
+        """
+        calls = (primary, secondary)
+        tasks: dict[asyncio.Task, tuple[int, float]] = {}
+
+        def start(which: int) -> None:
+            tasks[asyncio.create_task(calls[which]())] = (which, time.perf_counter())
+
+        start(0)
+        hedge_at = time.perf_counter() + self.hedge_delay_ms() / 1000 if secondary is not None else None
+        hedged = False
+        error: Optional[BaseException] = None
+        finished_at: Optional[float] = None
+        try:
+            while tasks:
+                timeout = None
+                if hedge_at is not None and not hedged:
+                    timeout = max(hedge_at - time.perf_counter(), 0)
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                finished_at = time.perf_counter()
+                if not done:
+                    hedged = True
+                    metrics.incr(f"llm_hedge.{self.role}.hedged")
+                    start(1)
+                    continue
+                # Look at the primary first when both finished in the same round
+                for task in sorted(done, key=lambda task: tasks[task][0]):
+                    which, started = tasks.pop(task)
+                    if task.exception() is None:
+                        self._record(which, (finished_at - started) * 1000)
+                        if hedged:
+                            metrics.incr(f"llm_hedge.{self.role}.won.{('primary', 'secondary')[which]}")
+                        return task.result()
+                    error = task.exception()
+                    if which == 0 and secondary is not None and not hedged:
+                        hedged = True
+                        metrics.incr(f"llm_hedge.{self.role}.failover")
+                        start(1)
+            raise error
+        finally:
+            now = time.perf_counter()
+            running = []
+            for task, (which, started) in tasks.items():
+                if not task.done():
+                    task.cancel()
+                    running.append(task)
+                    if which == 0:
+                        # Censored sample: the primary had taken at least this long
+                        self.tracker.record(self.providers[0], self.role, (now - started) * 1000)
+                elif not task.cancelled() and task.exception() is None:
+                    # Finished alongside the winner: a real sample, and its
+                    # result must still be released
+                    self._record(which, ((finished_at or now) - started) * 1000)
+                    if discard is not None:
+                        await discard(task.result())
+            if running:
+                results = await asyncio.gather(*running, return_exceptions=True)
+                if discard is not None:
+                    for result in results:
+                        if not isinstance(result, BaseException):
+                            await discard(result)
+
+    async def _call(
+        self,
+        primary: Callable[[], Awaitable],
+        secondary: Optional[Callable[[], Awaitable]],
+        discard: Optional[Callable[[Any], Awaitable]] = None,
+    ) -> Any:
+        if not self.deadline_ms:
+            return await self._race(primary, secondary, discard)
+        try:
+            return await asyncio.wait_for(self._race(primary, secondary, discard), self.deadline_ms / 1000)
+        except asyncio.TimeoutError:
+            metrics.incr(f"llm_deadline.{self.role}.exceeded")
+            raise LLMDeadlineExceeded(self.role, self.deadline_ms) from None
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        secondary = None
+        if self.secondary is not None:
+            secondary = lambda: self.secondary.ainvoke(messages, config, **kwargs)
+        return await self._call(lambda: self.primary.ainvoke(messages, config, **kwargs), secondary)
+
+    async def astream(self, messages, config=None, **kwargs):
+        def opener(model):
+            async def first_chunk():
+                stream = model.astream(messages, config, **kwargs).__aiter__()
+                try:
+                    return stream, await stream.__anext__()
+                except StopAsyncIteration:
+                    return stream, None
+                except BaseException:
+                    await stream.aclose()
+                    raise
+            return first_chunk
+
+        async def close(opened) -> None:
+            await opened[0].aclose()
+
+        secondary = opener(self.secondary) if self.secondary is not None else None
+        stream, chunk = await self._call(opener(self.primary), secondary, discard=close)
+        try:
+            if chunk is None:
+                return
+            yield chunk
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    def with_structured_output(self, schema, **kwargs):
+        return HedgedChatModel(
+            self.primary.with_structured_output(schema, **kwargs),
+            self.secondary.with_structured_output(schema, **kwargs) if self.secondary is not None else None,
+            self.role,
+            self.providers,
+            self.tracker,
+            deadline_ms=self.deadline_ms,
+            hedge_percentile=self.hedge_percentile,
+            hedge_min_samples=self.hedge_min_samples,
+            hedge_initial_ms=self.hedge_initial_ms,
+        )
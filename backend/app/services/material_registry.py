@@ -0,0 +1,315 @@
+"""
+Persistent registry of indexed materials.
+
+One row per material (filename, type, content hash, chunk count, created
+at) in a WAL-mode SQLite file next to the Chroma data, so every worker
+and every restart sees the same list.
+
+Chroma and SQLite can't share a transaction, so rows are written in two
+phases around the Chroma inserts: `begin` records the material as
+"indexing" before its first chunk is written and `complete` flips it to
+"ready" with the final chunk count after the last one. Readers only see
+"ready" rows, so a partially indexed material is never listed or matched
+as a duplicate. Rows left "indexing" by a crashed worker are reported by
+`stale_ids` so their chunks can be removed.
+
+The connection is opened lazily on first use; listing is keyset-paginated
+on (created_at, material_id), so a page costs O(page size) regardless of
+how many materials exist.
+
+The registry also holds the collection generation: a counter bumped in
+the same SQLite transaction whenever a material becomes ready or is
+deleted. Caches of retrieval results compare it to detect changes made
+by any worker.
+
+Precomputed "key areas" digests (per material and per section heading)
+are stored alongside and deleted in the same transaction as their
+material, or when the material is re-indexed. They have their own digest
+generation, so storing digests does not invalidate cached retrieval
+results.
+"""
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+
+STATUS_INDEXING = "indexing"
+STATUS_READY = "ready"
+
+_COLUMNS = "material_id, filename, type, content_hash, chunk_count, created_at"
+
+
+def _row_to_dict(row: tuple) -> dict:
+    material_id, filename, type_, content_hash, chunk_count, created_at = row
+    return {
+        "id": material_id,
+        "filename": filename,
+        "type": type_,
+        "content_hash": content_hash,
+        "chunk_count": chunk_count,
+        "created_at": created_at,
+    }
+
+
+def encode_cursor(material: dict) -> str:
+    """Opaque pagination cursor pointing just past `material`."""
+    return f"{material['created_at']!r}|{material['id']}"
+
+
+def decode_cursor(cursor: str) -> tuple[float, str]:
+    """Parse a cursor from encode_cursor; raises ValueError if malformed."""
+    created_at, _, material_id = cursor.partition("|")
+    if not material_id:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return float(created_at), material_id
+
+
+class MaterialRegistry:
+    """SQLite-backed table of indexed materials."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+            conn.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                CREATE TABLE IF NOT EXISTS materials (
+                    material_id TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    content_hash TEXT,
+                    chunk_count INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_materials_hash
+                    ON materials(content_hash, status, created_at);
+                CREATE INDEX IF NOT EXISTS idx_materials_listing
+                    ON materials(status, created_at DESC, material_id DESC);
+                CREATE TABLE IF NOT EXISTS registry_meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO registry_meta (key, value) VALUES ('generation', 0);
+                INSERT OR IGNORE INTO registry_meta (key, value) VALUES ('digest_generation', 0);
+                CREATE TABLE IF NOT EXISTS material_digests (
+                    material_id TEXT NOT NULL,
+                    heading TEXT NOT NULL,
+                    key_terms TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (material_id, heading)
+                );
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    # ── Writes ──
+
+    def _bump_generation(self, key: str = "generation") -> None:
+        """Advance a generation counter (caller holds the lock, commits)."""
+        self.conn.execute(
+            "UPDATE registry_meta SET value = value + 1 WHERE key = ?", (key,)
+        )
+
+    def begin(self, material_id: str, metadata: Optional[dict] = None) -> None:
+        """Record a material as being indexed (not yet visible to readers)."""
+        metadata = metadata or {}
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                """INSERT OR REPLACE INTO materials
+                   (material_id, filename, type, content_hash, chunk_count, status, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, 0, ?, ?, ?)""",
+                (
+                    material_id,
+                    str(metadata.get("filename", "")),
+                    str(metadata.get("type", "")),
+                    metadata.get("content_hash"),
+                    STATUS_INDEXING,
+                    now,
+                    now,
+                ),
+            )
+            # Re-indexing replaces the material, so its digests are stale
+            self.conn.execute(
+                "DELETE FROM material_digests WHERE material_id = ?", (material_id,)
+            )
+            self._bump_generation("digest_generation")
+            self.conn.commit()
+
+    def complete(self, material_id: str, chunk_count: int) -> None:
+        """Mark a material ready once all its chunks are in Chroma."""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE materials SET status = ?, chunk_count = ?, updated_at = ? WHERE material_id = ?",
+                (STATUS_READY, chunk_count, time.time(), material_id),
+            )
+            self._bump_generation()
+            self.conn.commit()
+
+    def delete(self, material_id: str) -> bool:
+        """Remove a material's row; returns False if it did not exist."""
+        with self._lock:
+            cursor = self.conn.execute(
+                "DELETE FROM materials WHERE material_id = ?", (material_id,)
+            )
+            self.conn.execute(
+                "DELETE FROM material_digests WHERE material_id = ?", (material_id,)
+            )
+            self._bump_generation()
+            self._bump_generation("digest_generation")
+            self.conn.commit()
+            return cursor.rowcount > 0
+
+    def insert_ready(self, materials: Iterable[dict]) -> None:
+        """Bulk-insert already-complete materials (used when rebuilding)."""
+        now = time.time()
+        with self._lock:
+            self.conn.executemany(
+                """INSERT OR IGNORE INTO materials
+                   (material_id, filename, type, content_hash, chunk_count, status, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    (
+                        m["id"],
+                        str(m.get("filename", "")),
+                        str(m.get("type", "")),
+                        m.get("content_hash"),
+                        m["chunk_count"],
+                        STATUS_READY,
+                        m.get("created_at", now),
+                        now,
+                    )
+                    for m in materials
+                ],
+            )
+            self._bump_generation()
+            self.conn.commit()
+
+    def replace_digests(self, material_id: str, digests: list[tuple[str, str, str]]) -> bool:
+        """
+        Store (heading, key terms, digest) rows for a ready material.
+
+        Returns False (storing nothing) if the material was deleted or
+        re-indexed while the digests were being computed.
+        """
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM materials WHERE material_id = ? AND status = ?",
+                (material_id, STATUS_READY),
+            ).fetchone()
+            if row is None:
+                return False
+            self.conn.execute(
+                "DELETE FROM material_digests WHERE material_id = ?", (material_id,)
+            )
+            self.conn.executemany(
+                """INSERT INTO material_digests (material_id, heading, key_terms, digest, created_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(material_id, heading, terms, digest, now) for heading, terms, digest in digests],
+            )
+            self._bump_generation("digest_generation")
+            self.conn.commit()
+        return True
+
+    # ── Reads ──
+
+    def digests(self) -> list[dict]:
+        """All stored digests of ready materials, newest first."""
+        with self._lock:
+            rows = self.conn.execute(
+                """SELECT d.material_id, d.heading, d.key_terms, d.digest
+                   FROM material_digests d JOIN materials m ON m.material_id = d.material_id
+                   WHERE m.status = ?
+                   ORDER BY d.created_at DESC""",
+                (STATUS_READY,),
+            ).fetchall()
+        return [
+            {"material_id": material_id, "heading": heading, "key_terms": key_terms, "digest": digest}
+            for material_id, heading, key_terms, digest in rows
+        ]
+
+    def generation(self, key: str = "generation") -> int:
+        """Current collection generation (or the digest generation)."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT value FROM registry_meta WHERE key = ?", (key,)
+            ).fetchone()[0]
+
+    def digest_generation(self) -> int:
+        """Current digest generation, bumped whenever stored digests change."""
+        return self.generation("digest_generation")
+
+    def get(self, material_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT {_COLUMNS} FROM materials WHERE material_id = ? AND status = ?",
+                (material_id, STATUS_READY),
+            ).fetchone()
+        return _row_to_dict(row) if row else None
+
+    def find_by_hash(self, content_hash: str) -> Optional[dict]:
+        """Oldest ready material with this content hash, if any."""
+        with self._lock:
+            row = self.conn.execute(
+                f"""SELECT {_COLUMNS} FROM materials
+                    WHERE content_hash = ? AND status = ?
+                    ORDER BY created_at LIMIT 1""",
+                (content_hash, STATUS_READY),
+            ).fetchone()
+        return _row_to_dict(row) if row else None
+
+    def list_page(self, limit: int = 50, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """
+        Return one page of ready materials, newest first.
+
+        Returns:
+            (materials, cursor for the next page or None if this is the last)
+        """
+        params: list = [STATUS_READY]
+        where = "status = ?"
+        if cursor:
+            created_at, material_id = decode_cursor(cursor)
+            where += " AND (created_at, material_id) < (?, ?)"
+            params += [created_at, material_id]
+        with self._lock:
+            rows = self.conn.execute(
+                f"""SELECT {_COLUMNS} FROM materials WHERE {where}
+                    ORDER BY created_at DESC, material_id DESC LIMIT ?""",
+                (*params, limit + 1),
+            ).fetchall()
+        materials = [_row_to_dict(row) for row in rows[:limit]]
+        next_cursor = encode_cursor(materials[-1]) if len(rows) > limit else None
+        return materials, next_cursor
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM materials LIMIT 1").fetchone() is None
+
+    def stale_ids(self, older_than_seconds: float) -> list[str]:
+        """Materials stuck in "indexing" longer than the given age (crashed ingestions)."""
+        cutoff = time.time() - older_than_seconds
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT material_id FROM materials WHERE status = ? AND updated_at < ?",
+                (STATUS_INDEXING, cutoff),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,81 @@
+"""In-process metrics counters exposed via the /metrics endpoint."""
+import threading
+from collections import defaultdict
+
+
+class MetricsRegistry:
+    """Thread-safe named counters, gauges and simple latency aggregates."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = defaultdict(float)
+        self._timings: dict[str, dict] = {}
+        self._gauges: dict[str, float] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """Increment a counter."""
+        with self._lock:
+            self._counters[name] += value
+
+    def gauge(self, name: str, value: float) -> None:
+        """Set a gauge to its current value (e.g. a queue depth)."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value_ms: float) -> None:
+        """Record a latency sample in milliseconds."""
+        with self._lock:
+            timing = self._timings.setdefault(
+                name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            timing["count"] += 1
+            timing["total_ms"] += value_ms
+            timing["max_ms"] = max(timing["max_ms"], value_ms)
+
+    def get(self, name: str) -> float:
+        """Get the current value of a counter."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def ratio(self, hits: str, misses: str) -> float:
+        """Compute hits / (hits + misses) for two counters."""
+        with self._lock:
+            h = self._counters.get(hits, 0)
+            m = self._counters.get(misses, 0)
+        return h / (h + m) if (h + m) else 0.0
+
+    def snapshot(self) -> dict:
+        """
+        Return a copy of all counters, gauges and timing aggregates.
+
+        Every "<name>.hit" / "<name>.miss" counter pair also gets a derived
+        "<name>.hit_rate" entry under "rates".
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            timings = {
+                name: {
+                    **t,
+                    "avg_ms": t["total_ms"] / t["count"] if t["count"] else 0.0,
+                }
+                for name, t in self._timings.items()
+            }
+        rates = {}
+        for name in counters:
+            if name.endswith(".hit"):
+                prefix = name[:-len(".hit")]
+                rates[f"{prefix}.hit_rate"] = self.ratio(name, f"{prefix}.miss")
+            elif name.endswith(".miss") and f"{name[:-len('.miss')]}.hit" not in counters:
+                rates[f"{name[:-len('.miss')]}.hit_rate"] = 0.0
+        return {"counters": counters, "gauges": gauges, "timings": timings, "rates": rates}
+
+    def reset(self) -> None:
+        """Clear all metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+            self._gauges.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,102 @@
+"""
+Process-pool PDF text extraction.
+
+pypdf's extract_text is CPU-bound and holds the GIL, so running it on the
+event loop (or a thread) stalls every other request. Large PDFs are split
+into page ranges that worker processes extract in parallel; results are
+yielded back in page order. A page that fails to extract is reported as
+an error for that page only, not for the whole file.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
+
+
+@dataclass
+class PageText:
+    """Extracted text (or error) for one page."""
+    page: int  # zero-based page number
+    text: str
+    error: Optional[str] = None
+
+
+# ── Worker-side functions (run in child processes) ──
+
+def count_pages(path: str) -> int:
+    """Return the number of pages in a PDF file."""
+    from pypdf import PdfReader
+    with open(path, "rb") as stream:
+        return len(PdfReader(stream).pages)
+
+
+def extract_page_range(path: str, start: int, end: int) -> list[PageText]:
+    """Extract text for pages [start, end), capturing per-page errors."""
+    from pypdf import PdfReader
+    results = []
+    with open(path, "rb") as stream:
+        reader = PdfReader(stream)
+        for i in range(start, min(end, len(reader.pages))):
+            try:
+                results.append(PageText(page=i, text=reader.pages[i].extract_text() or ""))
+            except Exception as e:
+                results.append(PageText(page=i, text="", error=str(e)))
+    return results
+
+
+# ── Parent-side API ──
+
+def create_pdf_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Create the extraction pool. Uses the spawn start method because the
+    parent process runs threads (embedding, Chroma) that fork can't copy
+    safely.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max(workers, 1),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+async def aiter_pdf_pages(
+    path: str,
+    pool: ProcessPoolExecutor,
+    pages_per_task: int = 8,
+    max_in_flight: int = 8,
+    on_page_count: Optional[Callable[[int], None]] = None,
+) -> AsyncIterator[PageText]:
+    """
+    Extract a PDF's pages in a process pool and yield them in page order.
+
+    At most max_in_flight page ranges are queued at once, so a huge PDF
+    does not materialize all its text before indexing starts consuming it.
+    `on_page_count` is called with the total page count before extraction.
+    Raises BrokenProcessPool if a worker died; the pool must be recreated.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        total = await loop.run_in_executor(pool, count_pages, path)
+    except BrokenProcessPool:
+        raise
+    except Exception as e:
+        raise ValueError(f"Error processing PDF: {str(e)}")
+    if on_page_count:
+        on_page_count(total)
+
+    ranges = [(start, min(start + pages_per_task, total)) for start in range(0, total, pages_per_task)]
+    pending: list[asyncio.Future] = []
+    next_range = 0
+
+    try:
+        while next_range < len(ranges) or pending:
+            while next_range < len(ranges) and len(pending) < max_in_flight:
+                start, end = ranges[next_range]
+                pending.append(loop.run_in_executor(pool, extract_page_range, path, start, end))
+                next_range += 1
+            for page in await pending.pop(0):
+                yield page
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,332 @@
+"""
+Question bank parsed from the study-guide markdown corpus.
+
+Each `docs/study-guides/<topic>/quiz-questions.md` and
+`interview-questions.md` holds `###` questions under `##` sections, each
+followed by a `<details>` block with the answer (and, for quizzes, an
+explanation). They are parsed into rows of a WAL-mode SQLite file indexed
+by topic, section and difficulty. A source file is re-parsed only when its
+size or modification time changes, so startup after the first run is a
+single SELECT.
+
+Difficulty comes from the interview sections (Beginner / Intermediate /
+Advanced); quiz questions (weekly knowledge checks, multiple choice and
+true/false) are all "beginner".
+
+Serving is from an in-memory index loaded once per process: picking the
+next question for a session is a dict lookup plus a scan of that topic's
+few dozen questions, with no model call.
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.config import get_settings
+from app.services.lexical_index import tokenize
+
+
+logger = logging.getLogger(__name__)
+
+QUESTION_SOURCES = ("llm", "bank", "hybrid")
+DIFFICULTIES = ("beginner", "intermediate", "advanced")
+SOURCE_FILES = ("interview-questions.md", "quiz-questions.md")
+
+_TITLE_RE = re.compile(r"^#[ \t]+(.+?)\s*$")
+_SECTION_RE = re.compile(r"^##[ \t]+(.+?)\s*$")
+_QUESTION_RE = re.compile(r"^###[ \t]+(?:Q?\d+[.:][ \t]*)?(.+?)\s*$")
+_FIELD_RE = re.compile(r"^\*\*(Keywords|Hint):\*\*[ \t]*(.*)$")
+_ANSWER_RE = re.compile(r"^\*\*(?:Correct Answer|Answer):\*\*[ \t]*(.*)$")
+_EXPLANATION_RE = re.compile(r"^\*\*Explanation:\*\*[ \t]*")
+
+
+@dataclass(frozen=True)
+class BankQuestion:
+    """One parsed question with its reference answer."""
+    question_id: str  # "<topic>/<kind>/<n>", stable while the file is unchanged
+    topic: str  # study-guide directory, e.g. "cloud-run"
+    topic_title: str  # e.g. "Cloud Run"
+    kind: str  # "interview" or "quiz"
+    section: str
+    difficulty: str
+    question: str  # as presented to the candidate (with options, if any)
+    answer: str
+    explanation: str = ""
+    keywords: str = ""
+
+
+def _difficulty(kind: str, section: str) -> str:
+    lowered = section.lower()
+    for level in DIFFICULTIES:
+        if level in lowered:
+            return level
+    return "beginner" if kind == "quiz" else "intermediate"
+
+
+def parse_questions(path: Path) -> list[BankQuestion]:
+    """Parse one study-guide question file."""
+    topic = path.parent.name
+    kind = "quiz" if path.name.startswith("quiz") else "interview"
+    topic_title, section = topic.replace("-", " ").title(), ""
+    questions: list[BankQuestion] = []
+    heading: Optional[str] = None
+    prompt: list[str] = []
+    details: Optional[list[str]] = None
+    keywords = ""
+
+    def finish() -> None:
+        if heading is None or details is None:
+            return
+        answer, explanation, rest = "", [], []
+        for line in details:
+            match = _ANSWER_RE.match(line)
+            if match and not answer:
+                answer = match.group(1).strip()
+            elif _EXPLANATION_RE.match(line) or explanation:
+                explanation.append(_EXPLANATION_RE.sub("", line))
+            else:
+                rest.append(line)
+        if not answer:
+            answer = "\n".join(rest).strip()
+        question = heading
+        if section.lower().startswith("part 2") or "true/false" in section.lower():
+            question = f"True or false: {heading}"
+        options = [line.strip().removeprefix("- [ ]").strip() for line in prompt if line.strip().startswith("- [")]
+        if options:
+            question += "\n" + "\n".join(options)
+        questions.append(BankQuestion(
+            question_id=f"{topic}/{kind}/{len(questions) + 1}",
+            topic=topic,
+            topic_title=topic_title,
+            kind=kind,
+            section=section,
+            difficulty=_difficulty(kind, section),
+            question=question,
+            answer=answer,
+            explanation="\n".join(explanation).strip(),
+            keywords=keywords,
+        ))
+
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if details is not None and heading is not None:
+            if line.strip() == "</details>":
+                finish()
+                heading, details = None, None
+            elif not line.strip().startswith("<summary"):
+                details.append(line)
+            continue
+        if match := _QUESTION_RE.match(line):
+            heading, prompt, details, keywords = match.group(1), [], None, ""
+        elif match := _SECTION_RE.match(line):
+            section, heading = match.group(1), None
+        elif match := _TITLE_RE.match(line):
+            # "Interview Questions: Cloud Run" -> "Cloud Run"
+            topic_title = match.group(1).rpartition(":")[2].strip() or topic_title
+        elif heading is not None:
+            if line.strip() == "<details>":
+                details = []
+            elif match := _FIELD_RE.match(line):
+                if match.group(1) == "Keywords":
+                    keywords = match.group(2).strip()
+            else:
+                prompt.append(line)
+    return questions
+
+
+class QuestionBank:
+    """On-disk question bank with an in-memory serving index."""
+
+    def __init__(self, db_path: str, source_dir: str):
+        self.db_path = db_path
+        self.source_dir = Path(source_dir)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # topic -> (topic key terms, [(question, its terms)] in serving order)
+        self._index: Optional[dict[str, tuple[frozenset, list[tuple[BankQuestion, frozenset]]]]] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+            conn.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                CREATE TABLE IF NOT EXISTS bank_questions (
+                    question_id TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    topic TEXT NOT NULL,
+                    topic_title TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    section TEXT NOT NULL,
+                    difficulty TEXT NOT NULL,
+                    question TEXT NOT NULL,
+                    answer TEXT NOT NULL,
+                    explanation TEXT NOT NULL,
+                    keywords TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_bank_topic
+                    ON bank_questions(topic, difficulty);
+                CREATE INDEX IF NOT EXISTS idx_bank_section
+                    ON bank_questions(topic, section);
+                CREATE INDEX IF NOT EXISTS idx_bank_difficulty
+                    ON bank_questions(difficulty);
+                CREATE TABLE IF NOT EXISTS bank_sources (
+                    source TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL
+                );
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def sync(self) -> int:
+        """
+        Re-parse source files added or changed since the last sync and drop
+        questions of removed ones. Returns the number of files parsed.
+        """
+        files = {
+            str(path.relative_to(self.source_dir)): path
+            for name in SOURCE_FILES
+            for path in sorted(self.source_dir.glob(f"*/{name}"))
+        }
+        parsed = 0
+        with self._lock:
+            conn = self.conn
+            known = {
+                source: (size, mtime)
+                for source, size, mtime in conn.execute("SELECT source, size, mtime FROM bank_sources")
+            }
+            for source in known.keys() - files.keys():
+                conn.execute("DELETE FROM bank_questions WHERE source = ?", (source,))
+                conn.execute("DELETE FROM bank_sources WHERE source = ?", (source,))
+            for source, path in files.items():
+                stat = path.stat()
+                if known.get(source) == (stat.st_size, stat.st_mtime):
+                    continue
+                conn.execute("DELETE FROM bank_questions WHERE source = ?", (source,))
+                conn.executemany(
+                    """INSERT OR REPLACE INTO bank_questions
+                       (question_id, source, topic, topic_title, kind, section, difficulty,
+                        question, answer, explanation, keywords)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    [
+                        (q.question_id, source, q.topic, q.topic_title, q.kind, q.section,
+                         q.difficulty, q.question, q.answer, q.explanation, q.keywords)
+                        for q in parse_questions(path)
+                    ],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO bank_sources (source, size, mtime) VALUES (?, ?, ?)",
+                    (source, stat.st_size, stat.st_mtime),
+                )
+                parsed += 1
+            conn.commit()
+            self._index = None
+        return parsed
+
+    def questions(
+        self,
+        topic: Optional[str] = None,
+        section: Optional[str] = None,
+        difficulty: Optional[str] = None,
+    ) -> list[BankQuestion]:
+        """Stored questions, optionally filtered, in file order."""
+        where, params = [], []
+        for column, value in (("topic", topic), ("section", section), ("difficulty", difficulty)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        with self._lock:
+            rows = self.conn.execute(
+                f"""SELECT question_id, topic, topic_title, kind, section, difficulty,
+                           question, answer, explanation, keywords
+                    FROM bank_questions {'WHERE ' + ' AND '.join(where) if where else ''}
+                    ORDER BY source, rowid""",
+                params,
+            ).fetchall()
+        return [BankQuestion(*row) for row in rows]
+
+    def _load_index(self) -> dict[str, tuple[frozenset, list[tuple[BankQuestion, frozenset]]]]:
+        if self._index is None:
+            by_topic: dict[str, list[BankQuestion]] = {}
+            for question in self.questions():
+                by_topic.setdefault(question.topic, []).append(question)
+            index = {}
+            for topic, questions in by_topic.items():
+                # Easiest first; open interview questions before quiz items
+                questions.sort(key=lambda q: (DIFFICULTIES.index(q.difficulty), q.kind != "interview"))
+                keys = frozenset(tokenize(f"{topic} {questions[0].topic_title}"))
+                index[topic] = (keys, [
+                    (q, frozenset(tokenize(f"{q.question} {q.keywords}"))) for q in questions
+                ])
+            self._index = index
+        return self._index
+
+    def size(self) -> int:
+        """Number of questions in the serving index."""
+        return sum(len(questions) for _, questions in self._load_index().values())
+
+    def match_topic(self, topic: str) -> Optional[str]:
+        """
+        Bank topic for an interview topic, or None.
+
+        Matches when either term set contains the other ("Cloud Run" and
+        "Cloud Run cold starts" both map to cloud-run); the largest overlap wins.
+        """
+        terms = frozenset(tokenize(topic))
+        if not terms:
+            return None
+        best, best_overlap = None, 0
+        for bank_topic, (keys, _) in self._load_index().items():
+            overlap = len(terms & keys)
+            if (terms <= keys or keys <= terms) and overlap > best_overlap:
+                best, best_overlap = bank_topic, overlap
+        return best
+
+    def next_question(self, topic: str, asked: Optional[list[str]] = None) -> Optional[BankQuestion]:
+        """
+        The next unasked bank question for an interview topic, or None if
+        the topic has no bank questions left.
+
+        Questions progress beginner → advanced; within a level, those
+        sharing the most terms with the topic come first.
+        """
+        bank_topic = self.match_topic(topic)
+        if bank_topic is None:
+            return None
+        asked_ids = set(asked or ())
+        terms = frozenset(tokenize(topic))
+        best, best_key = None, None
+        for position, (question, question_terms) in enumerate(self._load_index()[bank_topic][1]):
+            if question.question_id in asked_ids:
+                continue
+            overlap = len(terms & question_terms)
+            key = (DIFFICULTIES.index(question.difficulty), -overlap, position)
+            if best_key is None or key < best_key:
+                best, best_key = question, key
+        return best
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+@lru_cache
+def get_question_bank() -> QuestionBank:
+    """Get the process-wide question bank, synced with its source files."""
+    settings = get_settings()
+    bank = QuestionBank(settings.question_bank_path, settings.question_bank_dir)
+    if os.path.isdir(settings.question_bank_dir):
+        bank.sync()
+    else:
+        logger.warning("Question bank source not found: %s", settings.question_bank_dir)
+    return bank
@@ -0,0 +1,195 @@
+"""
+Per-session background prefetch of upcoming interview questions.
+
+A non-follow-up question prompt depends only on topic, context and the
+question count, so the next K new questions of a session can be generated
+while the candidate is still answering. After `/interview/start` (and
+after each question is used) the session's queue is topped up to
+`prefetch_questions` entries; `/answer` and `/stream` take the entry for
+the current question count instead of calling the model when no
+follow-up is needed.
+
+Entries are keyed by (topic, context, question count), so a prefetched
+question is only used for exactly the state it was generated from.
+Prefetch tasks run under a process-wide cap (`prefetch_max_concurrent`);
+a live request never waits for a prefetch that hasn't started yet, it
+cancels it and generates the question itself. Questions served from the
+question bank are instant and never prefetched. A session's queue is
+discarded when it ends or is deleted. Sessions that are abandoned instead
+are dropped once idle for `prefetch_ttl_seconds`, and at most
+`prefetch_max_sessions` sessions are kept (least recently used go first).
+Queues live in the worker process, so a request landing on another worker
+just misses.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.services.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class _Prefetch:
+    """One question being (or already) generated ahead of time."""
+    key: tuple  # (topic, context, question count)
+    task: asyncio.Task = field(repr=False)
+    started: bool = False
+
+
+class QuestionPrefetcher:
+    """Keeps up to `depth` upcoming new questions generated per session."""
+
+    def __init__(
+        self,
+        depth: int = 2,
+        max_concurrent: int = 2,
+        max_sessions: int = 1000,
+        ttl_seconds: float = 1800,
+    ):
+        self.depth = depth
+        self.max_concurrent = max(max_concurrent, 1)
+        self.max_sessions = max(max_sessions, 1)
+        self.ttl_seconds = ttl_seconds
+        self._slots: Optional[asyncio.Semaphore] = None
+        # thread_id -> {question count: prefetch}, least recently used first
+        self._sessions: OrderedDict[str, dict[int, _Prefetch]] = OrderedDict()
+        # thread_id -> monotonic time the session was last filled or taken from
+        self._touched: dict[str, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.depth > 0
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        return self._slots
+
+    def _expire(self) -> None:
+        """Drop sessions idle past the TTL, then the oldest over the cap."""
+        if self.ttl_seconds > 0:
+            cutoff = time.monotonic() - self.ttl_seconds
+            while self._sessions:
+                thread_id = next(iter(self._sessions))
+                if self._touched.get(thread_id, 0) > cutoff:
+                    break
+                self.discard(thread_id)
+                metrics.incr("prefetch.expired")
+        while len(self._sessions) > self.max_sessions:
+            self.discard(next(iter(self._sessions)))
+            metrics.incr("prefetch.evicted")
+
+    def _touch(self, thread_id: str) -> None:
+        if thread_id in self._sessions:
+            self._sessions.move_to_end(thread_id)
+            self._touched[thread_id] = time.monotonic()
+
+    @staticmethod
+    def _key(state: dict, question_count: int) -> tuple:
+        return (state.get("topic", ""), state.get("context", ""), question_count)
+
+    def fill(self, thread_id: str, state: dict) -> None:
+        """Top up the session's queue for the questions after `state`."""
+        if not self.enabled:
+            return
+        from app.agents.supervisor import serves_from_bank
+
+        self._expire()
+        queue = self._sessions.setdefault(thread_id, {})
+        self._touch(thread_id)
+        current = state.get("question_count", 0)
+        # Drop entries for questions already passed or built from other context
+        for count in list(queue):
+            if count < current or queue[count].key != self._key(state, count):
+                queue.pop(count).task.cancel()
+        for count in range(current, current + self.depth):
+            if count in queue:
+                continue
+            future_state = {
+                **state,
+                "question_count": count,
+                "followup_count": 0,
+                "needs_followup": False,
+            }
+            if serves_from_bank(future_state):
+                continue
+            entry = _Prefetch(key=self._key(state, count), task=None)
+            entry.task = asyncio.create_task(self._generate(entry, future_state))
+            queue[count] = entry
+        if not queue:
+            self.discard(thread_id)
+        self._expire()
+
+    async def _generate(self, entry: _Prefetch, state: dict) -> dict:
+        from app.agents.supervisor import generate_question_node
+
+        async with self.slots:
+            entry.started = True
+            started = time.perf_counter()
+            update = await generate_question_node(state)
+            metrics.observe("prefetch.generate", (time.perf_counter() - started) * 1000)
+            return update
+
+    def ready(self, thread_id: str, state: dict) -> bool:
+        """Whether a started prefetch exists for the next new question."""
+        entry = self._sessions.get(thread_id, {}).get(state.get("question_count", 0))
+        return (
+            entry is not None
+            and entry.started
+            and entry.key == self._key(state, state.get("question_count", 0))
+        )
+
+    async def take(self, thread_id: str, state: dict) -> Optional[dict]:
+        """
+        The prefetched question update for the next new question of
+        `state`, or None if there is no usable one (the caller generates
+        the question live). The caller checks that no follow-up is due.
+        """
+        if not self.enabled:
+            return None
+        self._expire()
+        self._touch(thread_id)
+        count = state.get("question_count", 0)
+        entry = self._sessions.get(thread_id, {}).pop(count, None)
+        if entry is None or entry.key != self._key(state, count) or not entry.started:
+            # Missing, stale, or still waiting for a slot: don't queue behind
+            # other sessions' prefetches
+            if entry is not None:
+                entry.task.cancel()
+            metrics.incr("prefetch.miss")
+            return None
+        try:
+            update = await entry.task
+        except asyncio.CancelledError:
+            if not entry.task.cancelled():
+                raise
+            metrics.incr("prefetch.miss")
+            return None
+        except Exception as e:
+            logger.warning("Question prefetch failed for %s: %s", thread_id, e)
+            metrics.incr("prefetch.failed")
+            return None
+        metrics.incr("prefetch.hit")
+        return update
+
+    def discard(self, thread_id: str) -> None:
+        """Cancel and forget a session's prefetched questions."""
+        self._touched.pop(thread_id, None)
+        for entry in self._sessions.pop(thread_id, {}).values():
+            entry.task.cancel()
+
+    async def shutdown(self) -> None:
+        """Cancel all prefetches and wait for them to finish."""
+        tasks = [entry.task for queue in self._sessions.values() for entry in queue.values()]
+        self._sessions.clear()
+        self._touched.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
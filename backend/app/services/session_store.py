@@ -0,0 +1,251 @@
+"""
+Interview session stores.
+
+Sessions are plain dicts:
+    {"thread_id", "topic", "status", "graph_state", "config", "version"}
+
+`get()` returns a copy; callers mutate it and call `save()`. Saves are
+optimistic: a session whose "version" no longer matches the stored one
+raises SessionConflictError instead of silently overwriting a concurrent
+update. A session without a "version" key is created (or replaces any
+existing session with the same thread_id). Routes use the async variants
+(aget/asave/adelete), which SQLiteSessionStore runs in a worker thread so
+disk I/O never blocks the event loop.
+
+Backends:
+- InMemorySessionStore: single process, lost on restart
+- SQLiteSessionStore: WAL-mode SQLite file shared by all workers on a host,
+  with a hot in-process LRU tier of deserialized sessions
+
+Running several workers also needs CHECKPOINTER=sqlite: /approve resumes
+the LangGraph thread from its checkpoint, which a worker other than the
+one that wrote it can only find in the shared checkpoint file.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+from langchain_core.messages import messages_from_dict, messages_to_dict
+
+
+class SessionConflictError(Exception):
+    """Raised when a session was modified concurrently since it was read."""
+
+
+def _copy_session(session: dict) -> dict:
+    """Copy a session deep enough that callers can mutate it freely."""
+    copied = dict(session)
+    if isinstance(copied.get("graph_state"), dict):
+        copied["graph_state"] = dict(copied["graph_state"])
+    return copied
+
+
+class SessionStore(ABC):
+    """Interface for interview session persistence."""
+
+    @abstractmethod
+    def get(self, thread_id: str) -> Optional[dict]:
+        """Return a copy of the session, or None if it does not exist."""
+
+    @abstractmethod
+    def save(self, session: dict) -> dict:
+        """Persist a session and bump its version in place."""
+
+    @abstractmethod
+    def delete(self, thread_id: str) -> bool:
+        """Delete a session; returns False if it did not exist."""
+
+    async def aget(self, thread_id: str) -> Optional[dict]:
+        """Async get(); stores doing blocking I/O override this."""
+        return self.get(thread_id)
+
+    async def asave(self, session: dict) -> dict:
+        """Async save(); stores doing blocking I/O override this."""
+        return self.save(session)
+
+    async def adelete(self, thread_id: str) -> bool:
+        """Async delete(); stores doing blocking I/O override this."""
+        return self.delete(thread_id)
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+    def __contains__(self, thread_id: str) -> bool:
+        return self.get(thread_id) is not None
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local session store (single worker only)."""
+
+    def __init__(self):
+        self._sessions: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, thread_id: str) -> Optional[dict]:
+        with self._lock:
+            session = self._sessions.get(thread_id)
+            return _copy_session(session) if session is not None else None
+
+    def save(self, session: dict) -> dict:
+        thread_id = session["thread_id"]
+        with self._lock:
+            current = self._sessions.get(thread_id)
+            if "version" in session:
+                if current is None or current["version"] != session["version"]:
+                    raise SessionConflictError(f"Session {thread_id} was modified concurrently")
+                session["version"] += 1
+            else:
+                session["version"] = current["version"] + 1 if current else 1
+            self._sessions[thread_id] = _copy_session(session)
+        return session
+
+    def delete(self, thread_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(thread_id, None) is not None
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite-backed session store safe for multiple uvicorn workers.
+
+    Rows hold a zlib-compressed compact JSON blob. A hot LRU of decoded
+    sessions avoids re-deserializing on every request; it is validated
+    against the row version with a cheap indexed lookup, so a session
+    updated by another worker is always re-read.
+    """
+
+    def __init__(self, db_path: str, cache_size: int = 256):
+        self.cache_size = cache_size
+        self._hot: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS interview_sessions (
+                thread_id TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                data BLOB NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    # ── Serialization ──
+
+    @staticmethod
+    def _dumps(session: dict) -> bytes:
+        payload = {k: v for k, v in session.items() if k != "version"}
+        state = payload.get("graph_state")
+        if isinstance(state, dict):
+            state = dict(state)
+            state["messages"] = messages_to_dict(state.get("messages", []))
+            payload["graph_state"] = state
+        raw = json.dumps(payload, separators=(",", ":"), default=str)
+        return zlib.compress(raw.encode("utf-8"))
+
+    @staticmethod
+    def _loads(data: bytes, version: int) -> dict:
+        session = json.loads(zlib.decompress(data).decode("utf-8"))
+        state = session.get("graph_state")
+        if isinstance(state, dict):
+            state["messages"] = messages_from_dict(state.get("messages", []))
+        session["version"] = version
+        return session
+
+    # ── Hot tier ──
+
+    def _remember(self, session: dict) -> None:
+        self._hot[session["thread_id"]] = _copy_session(session)
+        self._hot.move_to_end(session["thread_id"])
+        while len(self._hot) > self.cache_size:
+            self._hot.popitem(last=False)
+
+    # ── SessionStore API ──
+
+    def get(self, thread_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM interview_sessions WHERE thread_id = ?", (thread_id,)
+            ).fetchone()
+            if row is None:
+                self._hot.pop(thread_id, None)
+                return None
+
+            cached = self._hot.get(thread_id)
+            if cached is not None and cached["version"] == row[0]:
+                self._hot.move_to_end(thread_id)
+                return _copy_session(cached)
+
+            row = self._conn.execute(
+                "SELECT version, data FROM interview_sessions WHERE thread_id = ?", (thread_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            session = self._loads(row[1], row[0])
+            self._remember(session)
+            return _copy_session(session)
+
+    def save(self, session: dict) -> dict:
+        thread_id = session["thread_id"]
+        data = self._dumps(session)
+        status = str(getattr(session.get("status"), "value", session.get("status", "")))
+        now = time.time()
+        with self._lock:
+            if "version" in session:
+                cursor = self._conn.execute(
+                    """UPDATE interview_sessions
+                       SET version = version + 1, status = ?, updated_at = ?, data = ?
+                       WHERE thread_id = ? AND version = ?""",
+                    (status, now, data, thread_id, session["version"]),
+                )
+                if cursor.rowcount == 0:
+                    self._conn.rollback()
+                    self._hot.pop(thread_id, None)
+                    raise SessionConflictError(f"Session {thread_id} was modified concurrently")
+                session["version"] += 1
+            else:
+                # Replacing keeps versions increasing so stale hot-tier
+                # copies in other workers are never mistaken for current
+                (version,) = self._conn.execute(
+                    """INSERT INTO interview_sessions
+                       (thread_id, version, status, updated_at, data) VALUES (?, 1, ?, ?, ?)
+                       ON CONFLICT(thread_id) DO UPDATE SET
+                           version = version + 1, status = excluded.status,
+                           updated_at = excluded.updated_at, data = excluded.data
+                       RETURNING version""",
+                    (thread_id, status, now, data),
+                ).fetchone()
+                session["version"] = version
+            self._conn.commit()
+            self._remember(session)
+        return session
+
+    def delete(self, thread_id: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM interview_sessions WHERE thread_id = ?", (thread_id,)
+            )
+            self._conn.commit()
+            self._hot.pop(thread_id, None)
+            return cursor.rowcount > 0
+
+    async def aget(self, thread_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.get, thread_id)
+
+    async def asave(self, session: dict) -> dict:
+        return await asyncio.to_thread(self.save, session)
+
+    async def adelete(self, thread_id: str) -> bool:
+        return await asyncio.to_thread(self.delete, thread_id)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
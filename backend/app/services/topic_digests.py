@@ -0,0 +1,222 @@
+"""
+Precomputed "key areas" digests of indexed materials.
+
+Starting an interview normally retrieves context for the topic and asks
+the context model for the key areas to assess, which is one model call on
+the critical path of every session. When the optional digest stage is
+enabled (INGEST_DIGESTS), that analysis is done once at ingestion time
+instead: once per material (titled by its first heading or filename) and
+once per markdown section heading. `start_interview` uses a stored digest
+when the topic matches one and falls back to the live context node
+otherwise.
+
+The context model only sees `prompt_context_tokens_context` tokens, so
+the whole-material digest is a map-reduce: each context-sized part of the
+material is analyzed, and the part analyses are combined (in groups that
+fit the budget) until one is left. Past `max_parts` parts, evenly spaced
+ones (always the first and last) stand in for the rest, which bounds the
+model calls per material.
+
+Digests live in the material registry, so they are deleted in the same
+transaction as their material and dropped when it is re-indexed. A topic
+matches a digest when every topic term (as tokenized for BM25) appears in
+the digest's key terms; among matches the most specific key wins, so
+"Cloud Run cold starts" prefers that section over the whole guide.
+"""
+import asyncio
+import logging
+import re
+import threading
+import time
+from pathlib import PurePath
+from typing import Optional
+
+from app.services.context_assembler import CHARS_PER_TOKEN
+from app.services.lexical_index import tokenize
+from app.services.metrics import metrics
+from app.services.vectorstore import VectorStoreService
+
+
+logger = logging.getLogger(__name__)
+
+# Headings that start a section (levels 1-2; deeper ones stay inside it)
+_HEADING_RE = re.compile(r"^(#{1,2})[ \t]+(.+?)[ \t#]*$", re.MULTILINE)
+# Sections shorter than this are too thin to analyze on their own
+MIN_SECTION_CHARS = 300
+
+
+def key_terms(text: str) -> str:
+    """Normalized, sorted, space-separated terms used for topic matching."""
+    return " ".join(sorted(set(tokenize(text))))
+
+
+def split_sections(text: str, max_sections: int = 12) -> tuple[Optional[str], list[tuple[str, str]]]:
+    """
+    Split markdown text on level 1-2 headings.
+
+    Returns:
+        (first heading or None, [(heading, section text)] in document
+        order, at most max_sections, repeated headings merged)
+    """
+    matches = list(_HEADING_RE.finditer(text))
+    title = matches[0].group(2).strip() if matches else None
+    sections: dict[str, str] = {}
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        heading = match.group(2).strip()
+        body = text[match.end():end].strip()
+        sections[heading] = f"{sections[heading]}\n\n{body}" if heading in sections else body
+    kept = [
+        (heading, body) for heading, body in sections.items()
+        if len(body) >= MIN_SECTION_CHARS
+    ]
+    return title, kept[:max_sections]
+
+
+def split_parts(text: str, max_chars: int, max_parts: int) -> list[str]:
+    """
+    Consecutive parts of at most max_chars covering the text, cut at a
+    paragraph break where one falls in the part's second half. Beyond
+    max_parts, evenly spaced parts (first and last included) are kept.
+    """
+    parts = []
+    start = 0
+    while start < len(text):
+        # Start at the next paragraph, not on the break the last part ended at
+        while start < len(text) and text[start].isspace():
+            start += 1
+        end = min(start + max_chars, len(text))
+        if end < len(text):
+            cut = text.rfind("\n\n", start + max_chars // 2, end)
+            if cut != -1:
+                end = cut
+        part = text[start:end].strip()
+        if part:
+            parts.append(part)
+        start = end
+    max_parts = max(max_parts, 1)
+    if len(parts) > max_parts:
+        if max_parts == 1:
+            return parts[:1]
+        step = (len(parts) - 1) / (max_parts - 1)
+        parts = [parts[round(i * step)] for i in range(max_parts)]
+    return parts
+
+
+class TopicDigests:
+    """Builds digests at ingestion time and matches interview topics to them."""
+
+    def __init__(
+        self,
+        vectorstore: VectorStoreService,
+        max_sections: int = 12,
+        max_parts: int = 16,
+        concurrency: int = 4,
+    ):
+        self.vectorstore = vectorstore
+        self.max_sections = max_sections
+        self.max_parts = max_parts
+        self.concurrency = max(concurrency, 1)
+        # (digest generation, [(key term set, digest)]) of the registry's digests
+        self._entries: tuple[int, list[tuple[frozenset, str]]] = (-1, [])
+        self._entries_lock = threading.Lock()
+
+    async def build(self, material_id: str, filename: str) -> int:
+        """
+        Compute and store the digests of one indexed material.
+
+        Returns the number stored (0 if the material was deleted or
+        re-indexed meanwhile, in which case nothing is stored).
+        """
+        # Imported here: the agents package imports the services package
+        from app.agents.supervisor import analyze_context, combine_key_areas
+        from app.config import get_settings
+
+        started = time.perf_counter()
+        text = await self.vectorstore.get_document_text(material_id)
+        if not text.strip():
+            return 0
+        title, sections = split_sections(text, self.max_sections)
+        title = title or PurePath(filename).stem.replace("-", " ").replace("_", " ")
+        budget_chars = get_settings().prompt_context_tokens_context * CHARS_PER_TOKEN
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def analyze(topic: str, body: str) -> str:
+            async with semaphore:
+                return await analyze_context(topic, body)
+
+        async def combine(analyses: list[str]) -> str:
+            async with semaphore:
+                return await combine_key_areas(title, analyses)
+
+        async def material_digest() -> str:
+            parts = split_parts(text, budget_chars, self.max_parts)
+            analyses = await asyncio.gather(*(analyze(title, part) for part in parts))
+            analyses = [analysis for analysis in analyses if analysis.strip()]
+            while len(analyses) > 1:
+                # Groups of at least two that fit the budget, so each round shrinks
+                groups, size = [[]], 0
+                for analysis in analyses:
+                    if len(groups[-1]) >= 2 and size + len(analysis) > budget_chars:
+                        groups.append([])
+                        size = 0
+                    groups[-1].append(analysis)
+                    size += len(analysis)
+                if len(groups) > 1 and len(groups[-1]) == 1:
+                    groups[-2].extend(groups.pop())
+                analyses = list(await asyncio.gather(*(combine(group) for group in groups)))
+            metrics.incr("digests.parts", len(parts))
+            return analyses[0] if analyses else ""
+
+        # The whole-material digest is keyed by title and filename
+        targets = [("", f"{title} {filename}")]
+        targets += [(heading, f"{title} {heading}") for heading, _ in sections]
+        digests = await asyncio.gather(
+            material_digest(),
+            *(analyze(heading, body) for heading, body in sections),
+        )
+        rows = [
+            (heading, key_terms(key), digest)
+            for (heading, key), digest in zip(targets, digests)
+            if digest.strip()
+        ]
+        stored = await asyncio.to_thread(
+            self.vectorstore.registry.replace_digests, material_id, rows
+        )
+        metrics.observe("digests.build", (time.perf_counter() - started) * 1000)
+        if not stored:
+            logger.info("Discarded digests for %s: deleted or re-indexed meanwhile", material_id)
+            return 0
+        logger.info("Stored %d digests for %s", len(rows), material_id)
+        return len(rows)
+
+    def _load(self) -> list[tuple[frozenset, str]]:
+        """Stored digests, re-read only when the digest generation moves."""
+        registry = self.vectorstore.registry
+        generation = registry.digest_generation()
+        with self._entries_lock:
+            if self._entries[0] == generation:
+                return self._entries[1]
+        entries = [
+            (frozenset(row["key_terms"].split()), row["digest"])
+            for row in registry.digests()
+        ]
+        with self._entries_lock:
+            self._entries = (generation, entries)
+        return entries
+
+    def find(self, topic: str) -> Optional[str]:
+        """The digest best matching an interview topic, or None."""
+        terms = set(tokenize(topic))
+        if not terms:
+            return None
+        best, best_score = None, 0.0
+        # Entries are newest first; on a tie the newest material wins
+        for keys, digest in self._load():
+            if terms <= keys:
+                score = len(terms) / len(keys)
+                if score > best_score:
+                    best, best_score = digest, score
+        metrics.incr("digests.hit" if best is not None else "digests.miss")
+        return best
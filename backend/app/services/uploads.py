@@ -0,0 +1,180 @@
+"""
+Streaming multipart upload handling.
+
+Uploads are parsed straight off the request stream and spooled to a
+temporary file as the bytes arrive, so the full file is never held in
+memory. The size limit is enforced from Content-Length before reading and
+again while streaming (for chunked or mis-declared requests). The file's
+SHA-256 is computed as it is spooled, for deduplication.
+"""
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Iterator
+
+from fastapi import Request
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+
+TEXT_READ_SIZE = 64 * 1024  # characters per read when streaming text files
+
+
+class UploadError(ValueError):
+    """Malformed or disallowed upload (maps to 400)."""
+
+
+class UploadTooLargeError(UploadError):
+    """Upload exceeds the configured maximum size (maps to 413)."""
+
+
+@dataclass
+class SpooledUpload:
+    """An uploaded file spooled to disk."""
+    filename: str
+    extension: str
+    path: str
+    size: int
+    sha256: str
+
+    def cleanup(self) -> None:
+        """Delete the spooled file."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def file_extension(filename: str) -> str:
+    """Lower-cased extension including the dot, or "" if none."""
+    return "." + filename.split(".")[-1].lower() if "." in filename else ""
+
+
+async def spool_upload(
+    request: Request,
+    max_bytes: int,
+    allowed_extensions: set[str],
+    field_name: str = "file",
+) -> SpooledUpload:
+    """
+    Stream a multipart/form-data request and spool one file field to disk.
+
+    Raises:
+        UploadTooLargeError: if the body or file exceeds max_bytes
+        UploadError: if the request is not multipart, the file field is
+            missing, or its extension is not allowed
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise UploadTooLargeError(f"Upload exceeds maximum size of {max_bytes} bytes")
+
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise UploadError("Expected a multipart/form-data upload")
+
+    state = {
+        "header_field": b"",
+        "header_value": b"",
+        "headers": {},
+        "in_target": False,
+        "filename": None,
+        "error": None,
+        "complete": False,
+    }
+    spool = tempfile.NamedTemporaryFile(prefix="upload_", delete=False)
+    digest = hashlib.sha256()
+    size = 0
+
+    def on_part_begin():
+        state["headers"] = {}
+
+    def on_header_field(data, start, end):
+        state["header_field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["header_value"] += data[start:end]
+
+    def on_header_end():
+        state["headers"][state["header_field"].lower()] = state["header_value"]
+        state["header_field"] = b""
+        state["header_value"] = b""
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(state["headers"].get(b"content-disposition", b""))
+        name = disposition.get(b"name", b"").decode("utf-8", "replace")
+        filename = disposition.get(b"filename")
+        state["in_target"] = name == field_name and filename is not None and state["filename"] is None
+        if state["in_target"]:
+            state["filename"] = filename.decode("utf-8", "replace")
+            if file_extension(state["filename"]) not in allowed_extensions:
+                state["error"] = UploadError(
+                    f"Invalid file type. Allowed: {', '.join(sorted(allowed_extensions))}"
+                )
+
+    def on_part_data(data, start, end):
+        nonlocal size
+        if not state["in_target"] or state["error"]:
+            return
+        size += end - start
+        if size > max_bytes:
+            state["error"] = UploadTooLargeError(f"Upload exceeds maximum size of {max_bytes} bytes")
+            return
+        spool.write(data[start:end])
+        digest.update(data[start:end])
+
+    def on_part_end():
+        state["in_target"] = False
+
+    def on_end():
+        state["complete"] = True
+
+    parser = MultipartParser(params[b"boundary"], {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+        "on_end": on_end,
+    })
+
+    try:
+        try:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                if state["error"]:
+                    raise state["error"]
+            parser.finalize()
+        except FormParserError as e:
+            raise UploadError("Invalid multipart data") from e
+        # finalize() doesn't check that the closing boundary arrived, so a
+        # truncated body would otherwise pass as a shorter file
+        if not state["complete"]:
+            raise UploadError("Invalid multipart data")
+        if state["filename"] is None:
+            raise UploadError(f"Missing file field '{field_name}'")
+    except BaseException:
+        spool.close()
+        os.unlink(spool.name)
+        raise
+
+    spool.close()
+    return SpooledUpload(
+        filename=state["filename"],
+        extension=file_extension(state["filename"]),
+        path=spool.name,
+        size=size,
+        sha256=digest.hexdigest(),
+    )
+
+
+def iter_text_file(path: str, encoding: str = "utf-8") -> Iterator[str]:
+    """Yield a text file's contents in fixed-size pieces."""
+    with open(path, "r", encoding=encoding) as f:
+        while True:
+            piece = f.read(TEXT_READ_SIZE)
+            if not piece:
+                return
+            yield piece
@@ -1,141 +1,591 @@
 """ChromaDB Vector Store Service for RAG."""
-import io
-from typing import Optional
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
 import chromadb
 from chromadb.config import Settings as ChromaSettings
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+from app.services.context_assembler import RetrievedChunk, merge_adjacent
+from app.services.lexical_index import BM25Index
+from app.services.material_registry import MaterialRegistry
+from app.services.metrics import metrics
+from app.services.pdf_extract import aiter_pdf_pages, create_pdf_pool
+
+
+logger = logging.getLogger(__name__)
+
+# Ingestions still "indexing" after this long are assumed to have crashed
+STALE_INDEXING_SECONDS = 6 * 3600
+
+RETRIEVAL_MODES = ("vector", "lexical", "hybrid")
+# Hybrid mode fuses the top n_results * HYBRID_CANDIDATES of each ranker
+HYBRID_CANDIDATES = 4
+# Reciprocal rank fusion constant (Cormack et al.; 60 is the usual choice)
+RRF_K = 60
+
+
+def _fuse_ranks(rankings: list[list[tuple[str, str]]], n_results: int) -> list[tuple[str, str]]:
+    """Reciprocal rank fusion of several [(chunk id, text)] rankings."""
+    scores: dict[str, float] = {}
+    texts: dict[str, str] = {}
+    for ranking in rankings:
+        for rank, (chunk_id, text) in enumerate(ranking):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (RRF_K + rank + 1)
+            texts[chunk_id] = text
+    best = sorted(scores, key=lambda chunk_id: (-scores[chunk_id], chunk_id))[:n_results]
+    return [(chunk_id, texts[chunk_id]) for chunk_id in best]
+
+
+class TextChunker:
+    """
+    Incremental splitter producing overlapping chunks from fed text pieces.
+    
+    Only the unconsumed tail of the text is buffered. A chunk is cut once
+    more than chunk_size characters are buffered past its start, so the
+    sentence-boundary decision sees exactly what it would on the full
+    string.
+    """
+    
+    def __init__(self, chunk_size: int, chunk_overlap: int):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self._buffer = ""
+        self._start = 0
+    
+    def feed(self, piece: str) -> list[str]:
+        """Add text and return any chunks that are now complete."""
+        if not piece:
+            return []
+        self._buffer += piece
+        chunks = self._cut(final=False)
+        # Drop consumed text so the buffer stays ~chunk_size
+        if self._start > self.chunk_size:
+            self._buffer = self._buffer[self._start:]
+            self._start = 0
+        return chunks
+    
+    def finish(self) -> list[str]:
+        """Return the remaining chunks at end of input."""
+        return self._cut(final=True)
+    
+    def _cut(self, final: bool) -> list[str]:
+        chunks = []
+        buffer, chunk_size = self._buffer, self.chunk_size
+        start = self._start
+        while start < len(buffer) and (final or len(buffer) - start > chunk_size):
+            end = start + chunk_size
+            chunk = buffer[start:end]
+            
+            # Try to break at sentence boundary
+            if end < len(buffer):
+                last_period = chunk.rfind(". ")
+                if last_period > chunk_size // 2:
+                    chunk = chunk[:last_period + 1]
+                    end = start + last_period + 1
+            
+            chunk = chunk.strip()
+            if chunk:
+                chunks.append(chunk)
+            if end >= len(buffer) and final:
+                start = len(buffer)
+                break
+            start = end - self.chunk_overlap
+        self._start = start
+        return chunks
 
 
 class VectorStoreService:
     """Service for managing document embeddings with ChromaDB."""
     
-    def __init__(self, persist_dir: str = "./chroma_db"):
+    def __init__(
+        self,
+        persist_dir: str = "./chroma_db",
+        index_batch_size: int = 64,
+        embed_workers: int = 4,
+        pdf_workers: int = 2,
+        pdf_pages_per_task: int = 8,
+        query_cache_size: int = 256,
+        retrieval_mode: str = "vector",
+    ):
         """Initialize ChromaDB client with persistence."""
+        self.index_batch_size = index_batch_size
+        self.embed_workers = max(embed_workers, 1)
+        self.pdf_workers = max(pdf_workers, 1)
+        self.pdf_pages_per_task = max(pdf_pages_per_task, 1)
+        self._pdf_pool = None  # created on first PDF
         self.client = chromadb.PersistentClient(
             path=persist_dir,
             settings=ChromaSettings(anonymized_telemetry=False)
         )
+        # Embeddings are computed explicitly during indexing (in parallel),
+        # and by the collection for queries - both with the same function
+        self.embedding_function = DefaultEmbeddingFunction()
         self.collection = self.client.get_or_create_collection(
             name="interview_materials",
-            metadata={"description": "Study materials for interview preparation"}
+            metadata={"description": "Study materials for interview preparation"},
+            embedding_function=self.embedding_function,
+        )
+        self._embed_pool = ThreadPoolExecutor(
+            max_workers=self.embed_workers, thread_name_prefix="embed"
         )
-        self._document_registry: dict[str, dict] = {}
+        # Single writer thread keeps Chroma inserts ordered and off the event loop
+        self._write_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chroma-write")
+        # Persistent material registry, kept next to the Chroma data
+        self.registry = MaterialRegistry(os.path.join(persist_dir, "materials.sqlite3"))
+        self._registry_ready = False
+        self._registry_lock = threading.Lock()
+        # BM25 index mirroring the collection, for lexical/hybrid retrieval
+        self.lexical = BM25Index(os.path.join(persist_dir, "lexical.sqlite3"))
+        if retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(
+                f"Unknown retrieval mode: '{retrieval_mode}'. Supported: {list(RETRIEVAL_MODES)}"
+            )
+        self.retrieval_mode = retrieval_mode
+        # Retrieval cache: (query, n_results, filter, mode) → (generation, chunks)
+        self.query_cache_size = query_cache_size
+        self._query_cache: OrderedDict[tuple, tuple[int, tuple[RetrievedChunk, ...]]] = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        # Per-content-hash locks so identical concurrent uploads index once
+        self._content_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+    
+    # ============ Material Registry ============
+    
+    def _ensure_registry(self) -> MaterialRegistry:
+        """
+        Prepare the registry on first use.
+        
+        Rebuilds it (and the BM25 index) from the collection if it is empty
+        but Chroma holds chunks (data indexed before they existed), and
+        removes materials whose ingestion crashed midway.
+        """
+        if self._registry_ready:
+            return self.registry
+        with self._registry_lock:
+            if self._registry_ready:
+                return self.registry
+            if self.registry.is_empty() and self.collection.count():
+                self._rebuild_registry()
+            if self.lexical.is_empty() and self.collection.count():
+                self._rebuild_lexical_index()
+            for material_id in self.registry.stale_ids(STALE_INDEXING_SECONDS):
+                logger.info("Removing partially indexed material %s", material_id)
+                self._delete_document_sync(material_id)
+            self._registry_ready = True
+        return self.registry
+    
+    def _rebuild_registry(self, page_size: int = 5000) -> None:
+        """Aggregate chunk metadata per document into registry rows."""
+        materials: dict[str, dict] = {}
+        offset = 0
+        while True:
+            page = self.collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            if not page["ids"]:
+                break
+            for metadata in page["metadatas"]:
+                document_id = metadata.get("document_id")
+                if document_id is None:
+                    continue
+                material = materials.setdefault(document_id, {
+                    "id": document_id,
+                    "filename": metadata.get("filename", ""),
+                    "type": metadata.get("type", ""),
+                    "content_hash": metadata.get("content_hash"),
+                    "chunk_count": 0,
+                })
+                material["chunk_count"] += 1
+            offset += len(page["ids"])
+        self.registry.insert_ready(materials.values())
+        logger.info("Rebuilt material registry: %d materials", len(materials))
+    
+    def _rebuild_lexical_index(self, page_size: int = 1000) -> None:
+        """Index every chunk in the collection into the BM25 index."""
+        offset = 0
+        while True:
+            page = self.collection.get(
+                include=["documents", "metadatas"], limit=page_size, offset=offset
+            )
+            if not page["ids"]:
+                break
+            by_document: dict[str, tuple[list[str], list[str]]] = {}
+            for chunk_id, text, metadata in zip(page["ids"], page["documents"], page["metadatas"]):
+                ids, texts = by_document.setdefault(metadata.get("document_id", ""), ([], []))
+                ids.append(chunk_id)
+                texts.append(text)
+            for document_id, (ids, texts) in by_document.items():
+                self.lexical.add_chunks(document_id, ids, texts)
+            offset += len(page["ids"])
+        logger.info("Rebuilt lexical index: %d chunks", offset)
+    
+    # ============ Deduplication ============
+    
+    def content_lock(self, content_hash: str) -> asyncio.Lock:
+        """Lock serializing ingestion of documents with the same content hash."""
+        lock = self._content_locks.get(content_hash)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._content_locks[content_hash] = lock
+        return lock
+    
+    async def find_document_by_hash(self, content_hash: str) -> Optional[dict]:
+        """Find an indexed document whose source file had this SHA-256."""
+        return self._ensure_registry().find_by_hash(content_hash)
+    
+    def _embed_batch(self, chunks: list[str]) -> tuple[list, list[str]]:
+        """
+        Embed a batch, reusing stored embeddings of identical chunks.
+        
+        Chunks are keyed by the SHA-256 of their text; embeddings already in
+        the collection (from any document) or repeated within the batch are
+        not recomputed. Returns (embeddings, chunk hashes).
+        """
+        hashes = [hashlib.sha256(chunk.encode("utf-8")).hexdigest() for chunk in chunks]
+        known: dict[str, object] = {}
+        stored = self.collection.get(
+            where={"chunk_hash": {"$in": list(set(hashes))}},
+            include=["embeddings", "metadatas"],
+        )
+        for metadata, embedding in zip(stored["metadatas"], stored["embeddings"]):
+            known[metadata["chunk_hash"]] = embedding
+        
+        missing: dict[str, str] = {}
+        for chunk_hash, chunk in zip(hashes, chunks):
+            if chunk_hash not in known:
+                missing.setdefault(chunk_hash, chunk)
+        if missing:
+            known.update(zip(missing, self.embedding_function(list(missing.values()))))
+        
+        metrics.incr("ingest.embed_reuse.hit", len(chunks) - len(missing))
+        metrics.incr("ingest.embed_reuse.miss", len(missing))
+        return [known[chunk_hash] for chunk_hash in hashes], hashes
     
-    async def process_pdf(self, content: bytes) -> str:
-        """Extract text from PDF bytes."""
+    async def aiter_pdf_text(
+        self,
+        path: str,
+        failed_pages: Optional[list[int]] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Yield PDF text page by page, extracted in the PDF process pool.
+        
+        Pages are split into ranges extracted in parallel and yielded in
+        order. A page that fails to extract contributes no text; its
+        (1-based) number is appended to `failed_pages` if given.
+        `progress` is called with (pages done, total pages) per page.
+        """
+        if self._pdf_pool is None:
+            self._pdf_pool = create_pdf_pool(self.pdf_workers)
+        pool = self._pdf_pool
+        total_pages = 0
+        
+        def on_page_count(total: int) -> None:
+            nonlocal total_pages
+            total_pages = total
+        
         try:
-            from pypdf import PdfReader
-            pdf_reader = PdfReader(io.BytesIO(content))
-            text_parts = []
-            for page in pdf_reader.pages:
-                text_parts.append(page.extract_text() or "")
-            return "\n\n".join(text_parts)
-        except ImportError:
-            raise ValueError("pypdf not installed. Run: pip install pypdf")
-        except Exception as e:
-            raise ValueError(f"Error processing PDF: {str(e)}")
+            async for page in aiter_pdf_pages(
+                path,
+                pool,
+                pages_per_task=self.pdf_pages_per_task,
+                max_in_flight=self.pdf_workers * 2,
+                on_page_count=on_page_count,
+            ):
+                if page.error is not None:
+                    logger.warning("PDF page %d failed to extract: %s", page.page + 1, page.error)
+                    if failed_pages is not None:
+                        failed_pages.append(page.page + 1)
+                if page.page:
+                    yield "\n\n"
+                yield page.text
+                if progress:
+                    progress(page.page + 1, total_pages)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a pathological PDF); start fresh next time
+            if self._pdf_pool is pool:
+                self._pdf_pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise ValueError("Error processing PDF: extraction worker crashed")
+    
+    def close(self) -> None:
+        """Shut down the worker pools and close the material registry."""
+        if self._pdf_pool is not None:
+            self._pdf_pool.shutdown(cancel_futures=True)
+            self._pdf_pool = None
+        self._embed_pool.shutdown(cancel_futures=True)
+        self._write_pool.shutdown()
+        self.registry.close()
+        self.lexical.close()
     
     async def index_document(
         self,
         document_id: str,
-        content: str,
+        content: Union[str, Iterable[str], AsyncIterable[str]],
         metadata: Optional[dict] = None,
         chunk_size: int = 1000,
         chunk_overlap: int = 200,
+        progress: Optional[Callable[[int], None]] = None,
     ) -> int:
         """
         Index document content into vector store.
         
         Args:
             document_id: Unique identifier for the document
-            content: Text content to index
+            content: Text content to index, or a (sync or async) iterable
+                of text pieces (e.g. pages) that is chunked lazily
             metadata: Optional metadata for the document
             chunk_size: Size of text chunks
             chunk_overlap: Overlap between chunks
+            progress: Optional callback called with the number of chunks
+                indexed so far after each batch is written
             
         Returns:
             Number of chunks created
         """
-        # Simple chunking (in production use LangChain text splitters)
-        chunks = self._chunk_text(content, chunk_size, chunk_overlap)
+        # Pipeline: chunk lazily → embed batches in a thread pool → write
+        # batches in order on a single writer thread. Up to embed_workers
+        # batches are in flight, so memory is bounded by the batch size
+        # rather than the document size.
+        loop = asyncio.get_running_loop()
+        pieces = [content] if isinstance(content, str) else content
+        in_flight: deque = deque()
+        chunk_count = 0
+        submitted = 0
+        started = time.perf_counter()
         
-        if not chunks:
-            return 0
+        async def write_oldest() -> None:
+            nonlocal chunk_count
+            first_index, batch, embed_future = in_flight.popleft()
+            embeddings, chunk_hashes = await embed_future
+            await loop.run_in_executor(
+                self._write_pool,
+                self._add_batch,
+                document_id, batch, first_index, metadata, embeddings, chunk_hashes,
+            )
+            chunk_count += len(batch)
+            if progress:
+                progress(chunk_count)
         
-        # Generate IDs for each chunk
-        chunk_ids = [f"{document_id}_{i}" for i in range(len(chunks))]
+        if hasattr(pieces, "__aiter__"):
+            batches = self._aiter_batches(
+                self._aiter_chunks(pieces, chunk_size, chunk_overlap)
+            )
+        else:
+            batches = self._aiter_batches(
+                self._iter_chunks(pieces, chunk_size, chunk_overlap)
+            )
         
-        # Prepare metadata for each chunk
-        chunk_metadata = [
-            {
-                **(metadata or {}),
-                "document_id": document_id,
-                "chunk_index": i,
-            }
-            for i in range(len(chunks))
-        ]
+        self._ensure_registry().begin(document_id, metadata)
+        try:
+            async for batch in batches:
+                embed_future = loop.run_in_executor(
+                    self._embed_pool, self._embed_batch, batch
+                )
+                in_flight.append((submitted, batch, embed_future))
+                submitted += len(batch)
+                if len(in_flight) >= self.embed_workers:
+                    await write_oldest()
+            
+            while in_flight:
+                await write_oldest()
+        except BaseException:
+            # Don't leave embeddings running for an aborted ingestion
+            for _, _, embed_future in in_flight:
+                embed_future.cancel()
+            # A batch write already handed to the writer thread still runs;
+            # the delete is queued behind it, so nothing of this document is
+            # left in the collection, the BM25 index or the registry.
+            # Shielded so a cancellation can't interrupt the cleanup itself
+            await asyncio.shield(self.delete_document(document_id))
+            raise
         
-        # Add to collection
+        elapsed = time.perf_counter() - started
+        metrics.incr("ingest.chunks", chunk_count)
+        metrics.observe("ingest.document", elapsed * 1000)
+        
+        # Make the document visible now that all its chunks are written
+        if chunk_count:
+            self.registry.complete(document_id, chunk_count)
+        else:
+            self.registry.delete(document_id)
+        
+        return chunk_count
+    
+    async def _aiter_batches(
+        self, chunks: Union[Iterator[str], AsyncIterator[str]]
+    ) -> AsyncIterator[list[str]]:
+        """Group a (sync or async) chunk stream into lists of index_batch_size."""
+        batch: list[str] = []
+        if hasattr(chunks, "__aiter__"):
+            async for chunk in chunks:
+                batch.append(chunk)
+                if len(batch) >= self.index_batch_size:
+                    yield batch
+                    batch = []
+        else:
+            for chunk in chunks:
+                batch.append(chunk)
+                if len(batch) >= self.index_batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+    
+    def _add_batch(
+        self,
+        document_id: str,
+        chunks: list[str],
+        first_index: int,
+        metadata: Optional[dict],
+        embeddings: list,
+        chunk_hashes: list[str],
+    ) -> None:
+        """Add one batch of consecutive chunks to the collection and BM25 index."""
+        indices = range(first_index, first_index + len(chunks))
+        ids = [f"{document_id}_{i}" for i in indices]
         self.collection.add(
-            ids=chunk_ids,
+            ids=ids,
             documents=chunks,
-            metadatas=chunk_metadata,
+            embeddings=embeddings,
+            metadatas=[
+                {
+                    **(metadata or {}),
+                    "document_id": document_id,
+                    "chunk_index": i,
+                    "chunk_hash": chunk_hash,
+                }
+                for i, chunk_hash in zip(indices, chunk_hashes)
+            ],
         )
-        
-        # Register document
-        self._document_registry[document_id] = {
-            "id": document_id,
-            "chunk_count": len(chunks),
-            **(metadata or {})
-        }
-        
-        return len(chunks)
+        self.lexical.add_chunks(document_id, ids, chunks)
     
-    def _chunk_text(
+    def _iter_chunks(
         self,
-        text: str,
+        pieces: Iterable[str],
         chunk_size: int,
         chunk_overlap: int
-    ) -> list[str]:
-        """Split text into overlapping chunks."""
-        if not text:
-            return []
-        
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = start + chunk_size
-            chunk = text[start:end]
-            
-            # Try to break at sentence boundary
-            if end < len(text):
-                last_period = chunk.rfind(". ")
-                if last_period > chunk_size // 2:
-                    chunk = chunk[:last_period + 1]
-                    end = start + last_period + 1
-            
-            chunks.append(chunk.strip())
-            start = end - chunk_overlap
-        
-        return chunks
+    ) -> Iterator[str]:
+        """Lazily split a stream of text pieces into overlapping chunks."""
+        chunker = TextChunker(chunk_size, chunk_overlap)
+        for piece in pieces:
+            yield from chunker.feed(piece)
+        yield from chunker.finish()
     
-    async def query(
+    async def _aiter_chunks(
+        self,
+        pieces: AsyncIterable[str],
+        chunk_size: int,
+        chunk_overlap: int
+    ) -> AsyncIterator[str]:
+        """Async variant of _iter_chunks for pieces produced asynchronously."""
+        chunker = TextChunker(chunk_size, chunk_overlap)
+        async for piece in pieces:
+            for chunk in chunker.feed(piece):
+                yield chunk
+        for chunk in chunker.finish():
+            yield chunk
+    
+    async def retrieve(
         self,
         query: str,
         n_results: int = 5,
         document_id: Optional[str] = None,
-    ) -> str:
+        mode: Optional[str] = None,
+    ) -> list[RetrievedChunk]:
         """
-        Query the vector store for relevant content.
+        Retrieve the best-matching chunks, best first.
         
         Args:
             query: Search query
-            n_results: Number of results to return
+            n_results: Number of chunks to return
             document_id: Optional filter by document
-            
-        Returns:
-            Concatenated relevant content
+            mode: "vector" (embedding similarity), "lexical" (BM25 only, no
+                embedding; falls back to vector if no term matches) or
+                "hybrid" (reciprocal rank fusion of both). Defaults to the
+                service's retrieval_mode.
+        
+        Results are cached per (query, n_results, filter, mode) and tagged
+        with the collection generation they were computed at; any completed
+        index or delete (in any worker) bumps the generation, so a cached
+        result is only served while the collection is unchanged.
         """
+        mode = mode or self.retrieval_mode
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: '{mode}'. Supported: {list(RETRIEVAL_MODES)}")
+        
+        cache_key = (query, n_results, document_id, mode)
+        # The first call may rebuild the registry from the collection
+        registry = self.registry if self._registry_ready else await asyncio.to_thread(self._ensure_registry)
+        generation = registry.generation()
+        if self.query_cache_size > 0:
+            with self._query_cache_lock:
+                entry = self._query_cache.get(cache_key)
+                if entry is not None and entry[0] == generation:
+                    self._query_cache.move_to_end(cache_key)
+                    metrics.incr("query_cache.hit")
+                    return list(entry[1])
+            metrics.incr("query_cache.miss")
+        
+        # Embedding the query and searching Chroma / BM25 block, so off the loop
+        hits = await asyncio.to_thread(self._search, query, n_results, document_id, mode)
+        
+        chunks = tuple(RetrievedChunk.from_id(chunk_id, text) for chunk_id, text in hits)
+        
+        if self.query_cache_size > 0:
+            # Tagged with the generation read *before* querying, so a write
+            # that lands mid-query invalidates this entry
+            with self._query_cache_lock:
+                self._query_cache[cache_key] = (generation, chunks)
+                self._query_cache.move_to_end(cache_key)
+                while len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+        return list(chunks)
+    
+    def _search(
+        self, query: str, n_results: int, document_id: Optional[str], mode: str
+    ) -> list[tuple[str, str]]:
+        """Uncached search in the given mode; returns [(chunk id, text)] best first."""
+        started = time.perf_counter()
+        if mode == "lexical":
+            hits = self._lexical_search(query, n_results, document_id)
+            if not hits:
+                metrics.incr("retrieval.lexical_fallback")
+                hits = self._vector_search(query, n_results, document_id)
+        elif mode == "hybrid":
+            candidates = n_results * HYBRID_CANDIDATES
+            hits = _fuse_ranks(
+                [
+                    self._vector_search(query, candidates, document_id),
+                    self._lexical_search(query, candidates, document_id),
+                ],
+                n_results,
+            )
+        else:
+            hits = self._vector_search(query, n_results, document_id)
+        metrics.observe(f"retrieval.{mode}", (time.perf_counter() - started) * 1000)
+        return hits
+    
+    def _vector_search(
+        self, query: str, n_results: int, document_id: Optional[str]
+    ) -> list[tuple[str, str]]:
+        """Embedding-similarity search; returns [(chunk id, text)] best first."""
         where_filter = None
         if document_id:
             where_filter = {"document_id": document_id}
@@ -147,23 +597,72 @@ class VectorStoreService:
         )
         
         if not results["documents"] or not results["documents"][0]:
-            return ""
+            return []
+        return list(zip(results["ids"][0], results["documents"][0]))
+    
+    def _lexical_search(
+        self, query: str, n_results: int, document_id: Optional[str]
+    ) -> list[tuple[str, str]]:
+        """BM25 search; returns [(chunk id, text)] best first."""
+        return [
+            (chunk_id, text)
+            for chunk_id, text, _ in self.lexical.search(query, n_results, document_id)
+        ]
+    
+    async def list_documents(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[dict], Optional[str]]:
+        """
+        List indexed documents, newest first, one page at a time.
         
-        return "\n\n---\n\n".join(results["documents"][0])
+        Returns:
+            (documents, cursor for the next page or None)
+        """
+        return self._ensure_registry().list_page(limit=limit, cursor=cursor)
     
-    async def list_documents(self) -> list[dict]:
-        """List all indexed documents."""
-        return list(self._document_registry.values())
+    async def get_document_text(self, document_id: str) -> str:
+        """
+        Reassemble a document's text from its stored chunks.
+        
+        Consecutive chunks are joined with their shared overlap removed,
+        so the result matches the extracted text up to whitespace at chunk
+        boundaries.
+        """
+        results = self.collection.get(
+            where={"document_id": document_id},
+            include=["documents"],
+        )
+        chunks = [
+            RetrievedChunk.from_id(chunk_id, text)
+            for chunk_id, text in zip(results["ids"], results["documents"] or [])
+        ]
+        chunks.sort(key=lambda chunk: chunk.chunk_index)
+        return "\n".join(text for _, text in merge_adjacent(chunks))
     
     async def delete_document(self, document_id: str) -> None:
-        """Delete a document and all its chunks."""
-        # Get all chunk IDs for this document
+        """
+        Delete a document and all its chunks.
+        
+        Runs on the writer thread, after any batch of the document that
+        is still being written.
+        """
+        await asyncio.get_running_loop().run_in_executor(
+            self._write_pool, self._delete_document_sync, document_id
+        )
+    
+    def _delete_document_sync(self, document_id: str) -> None:
+        self._delete_chunks(document_id)
+        self.registry.delete(document_id)
+    
+    def _delete_chunks(self, document_id: str) -> None:
+        """Delete all chunks for a document from the collection and BM25 index."""
         results = self.collection.get(
-            where={"document_id": document_id}
+            where={"document_id": document_id},
+            include=[],
         )
         
         if results["ids"]:
             self.collection.delete(ids=results["ids"])
-        
-        if document_id in self._document_registry:
-            del self._document_registry[document_id]
+        self.lexical.delete_document(document_id)
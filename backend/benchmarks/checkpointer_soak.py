@@ -0,0 +1,119 @@
+"""
+Soak test for the LangGraph checkpointer.
+
+Runs rounds of interview sessions (start, answers, /approve) against the
+fake provider. A share of the sessions is abandoned instead of ended,
+like candidates closing the tab. Every --report-every rounds it prints
+turn latency, the current resident set size (RSS, from /proc/self/statm)
+and how many checkpoints are stored. With CHECKPOINTER=memory,
+which was the only option before, the store grows with every session
+ever started. With sqlite it holds at most CHECKPOINT_KEEP_LAST
+checkpoints per live thread, and idle threads expire after
+CHECKPOINT_TTL_SECONDS. Sessions are kept in SESSION_STORE=sqlite (whose
+in-process tier is bounded), so abandoned sessions don't add to the RSS
+measured for the checkpointer.
+
+    python -m benchmarks.checkpointer_soak --checkpointer sqlite --rounds 50 --sessions 200
+    python -m benchmarks.checkpointer_soak --checkpointer memory --rounds 50 --sessions 200
+"""
+import argparse
+import asyncio
+import gc
+import os
+import random
+import time
+
+from benchmarks.common import configure, summarize
+
+
+def current_rss_mb() -> float:
+    """Resident set size right now (ru_maxrss is the peak, which can't fall)."""
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def stored_checkpoints(saver) -> int:
+    """Checkpoints currently held by either saver type."""
+    if hasattr(saver, "storage"):  # InMemorySaver: thread -> namespace -> checkpoints
+        return sum(len(checkpoints) for namespaces in saver.storage.values() for checkpoints in namespaces.values())
+    with saver.cursor(transaction=False) as cur:
+        cur.execute("SELECT COUNT(*) FROM checkpoints")
+        return cur.fetchone()[0]
+
+
+async def run(args) -> None:
+    import httpx
+    from app.agents.checkpointer import get_checkpointer
+    from app.main import app, lifespan
+
+    rng = random.Random(0)
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+
+            async def session(thread_id: str, turn_ms: list[float]) -> None:
+                response = await client.post(
+                    "/api/v1/interview/start",
+                    json={"topic": "Python basics", "thread_id": thread_id, "use_materials": False},
+                )
+                response.raise_for_status()
+                for _ in range(args.turns):
+                    started = time.perf_counter()
+                    response = await client.post(
+                        "/api/v1/interview/answer",
+                        json={"thread_id": thread_id, "transcript": "Lists are mutable, tuples are not."},
+                    )
+                    response.raise_for_status()
+                    response = await client.post("/api/v1/interview/approve", params={"thread_id": thread_id})
+                    response.raise_for_status()
+                    turn_ms.append((time.perf_counter() - started) * 1000)
+                if rng.random() >= args.abandon:
+                    await client.delete(f"/api/v1/interview/{thread_id}")
+
+            # Warm-up: builds the services once before requests run concurrently
+            await session("warmup", [])
+            saver = get_checkpointer()
+            gc.collect()
+            print(f"after warm-up: rss={current_rss_mb():6.1f} MB")
+            turn_ms: list[float] = []
+            for round_number in range(args.rounds):
+                await asyncio.gather(*(
+                    session(f"r{round_number}-s{i}", turn_ms) for i in range(args.sessions)
+                ))
+                if hasattr(saver, "delete_expired"):
+                    saver.delete_expired()
+                if (round_number + 1) % args.report_every and round_number + 1 < args.rounds:
+                    continue
+                gc.collect()
+                sessions_done = (round_number + 1) * args.sessions
+                print(
+                    f"{summarize(f'{sessions_done} sessions', turn_ms)}"
+                    f"  rss={current_rss_mb():6.1f} MB  checkpoints={stored_checkpoints(saver)}"
+                )
+                turn_ms = []
+    if args.checkpointer == "sqlite":
+        print(f"checkpoint db: {os.path.getsize(os.environ['CHECKPOINT_DB_PATH']) / 1024:.0f} KiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--checkpointer", choices=("memory", "sqlite"), default="sqlite")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=200, help="concurrent sessions per round")
+    parser.add_argument("--report-every", type=int, default=5, help="rounds between report lines")
+    parser.add_argument("--turns", type=int, default=3, help="answers per session")
+    parser.add_argument("--abandon", type=float, default=0.3, help="share of sessions never ended")
+    parser.add_argument("--ttl-seconds", type=int, default=60, help="CHECKPOINT_TTL_SECONDS for sqlite")
+    args = parser.parse_args()
+    configure(
+        CHECKPOINTER=args.checkpointer,
+        CHECKPOINT_TTL_SECONDS=str(args.ttl_seconds),
+        SESSION_STORE="sqlite",
+        FAKE_LLM_LATENCY_MS="20",
+    )
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Peak memory of chunking a large document: baseline versus streaming.
+
+"baseline" joins every page into one string and builds the complete
+chunk list with the original `_chunk_text` loop (copied here, since the
+service's `_chunk_text` now wraps TextChunker), as index_document did
+before. "streaming" feeds the pages through TextChunker and hands each
+chunk on as soon as it is complete, as index_document does now (batches
+are embedded and written as they fill). Peak memory is measured with
+tracemalloc, for each document size in turn.
+
+    python -m benchmarks.chunking_memory --sizes-mib 10 100 1024
+"""
+import argparse
+import time
+import tracemalloc
+
+from app.services.vectorstore import TextChunker
+
+
+def pages(count: int, page_chars: int):
+    """Synthetic page texts, generated lazily like PDF extraction."""
+    sentence = "Cloud Run scales container instances to zero when idle. "
+    for i in range(count):
+        yield f"Page {i}. " + sentence * (page_chars // len(sentence))
+
+
+def baseline_chunk_text(text: str, chunk_size: int, chunk_overlap: int) -> list[str]:
+    """VectorStoreService._chunk_text before streaming chunking."""
+    if not text:
+        return []
+
+    chunks = []
+    start = 0
+
+    while start < len(text):
+        end = start + chunk_size
+        chunk = text[start:end]
+
+        # Try to break at sentence boundary
+        if end < len(text):
+            last_period = chunk.rfind(". ")
+            if last_period > chunk_size // 2:
+                chunk = chunk[:last_period + 1]
+                end = start + last_period + 1
+
+        chunks.append(chunk.strip())
+        start = end - chunk_overlap
+
+    return chunks
+
+
+def baseline(count: int, page_chars: int, chunk_size: int, chunk_overlap: int) -> int:
+    text = "\n\n".join(pages(count, page_chars))
+    return len(baseline_chunk_text(text, chunk_size, chunk_overlap))
+
+
+def streaming(count: int, page_chars: int, chunk_size: int, chunk_overlap: int) -> int:
+    chunker = TextChunker(chunk_size, chunk_overlap)
+    produced = 0
+    for i, page in enumerate(pages(count, page_chars)):
+        produced += len(chunker.feed(("\n\n" if i else "") + page))
+    return produced + len(chunker.finish())
+
+
+def measure(label: str, run, count: int, page_chars: int, *args) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    chunks = run(count, page_chars, *args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"  {label:<10} chunks={chunks:<8} peak={peak / 2**10:10.0f} KiB  "
+        f"time={elapsed:6.2f} s  ({count * page_chars / 2**20 / elapsed:5.1f} MiB/s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes-mib", type=int, nargs="+", default=[10, 100, 1024])
+    parser.add_argument("--page-chars", type=int, default=3000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    args = parser.parse_args()
+    for size_mib in args.sizes_mib:
+        count = size_mib * 2**20 // args.page_chars
+        print(f"document: {size_mib} MiB of text ({count} pages)")
+        params = (count, args.page_chars, args.chunk_size, args.chunk_overlap)
+        measure("baseline", baseline, *params)
+        measure("streaming", streaming, *params)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Per-call model construction versus pooled clients (get_model).
+
+"fresh" builds a new OpenAI chat model for every call, as the nodes did
+before clients were pooled: each instance gets its own HTTP connection
+pool, so every call pays client construction and a new connection.
+"pooled" uses get_model, which reuses one client per role over shared
+keep-alive connections. By default calls go to a local OpenAI-compatible
+stub (no key needed); pass --base-url and set OPENAI_API_KEY to measure a
+real endpoint instead.
+
+    python -m benchmarks.client_pool --calls 200
+"""
+import argparse
+import asyncio
+import os
+import socket
+import threading
+import time
+
+from benchmarks.common import configure, summarize
+
+
+def start_stub_server() -> str:
+    """Serve a canned chat completion on a free local port; returns the base URL."""
+    import uvicorn
+    from fastapi import FastAPI
+
+    stub = FastAPI()
+
+    @stub.post("/v1/chat/completions")
+    async def completions(body: dict) -> dict:
+        return {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "What is a closure?"},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+        }
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(stub, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/v1"
+
+
+async def run(calls: int) -> None:
+    from langchain.chat_models import init_chat_model
+    from langchain_core.messages import HumanMessage
+
+    from app.agents.supervisor import MODEL_MAP, close_model_clients, get_model
+
+    messages = [HumanMessage(content="Ask one interview question about Python.")]
+    model_name = MODEL_MAP["openai"]["question"]
+
+    async def fresh() -> None:
+        model = init_chat_model(model=model_name, model_provider="openai", temperature=0)
+        await model.ainvoke(messages)
+
+    async def pooled() -> None:
+        await get_model("question").ainvoke(messages)
+
+    for label, call in (("fresh client per call", fresh), ("pooled (get_model)", pooled)):
+        await call()  # warm-up
+        samples = []
+        for _ in range(calls):
+            started = time.perf_counter()
+            await call()
+            samples.append((time.perf_counter() - started) * 1000)
+        print(summarize(label, samples))
+    await close_model_clients()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--base-url", default="", help="OpenAI-compatible endpoint (default: local stub)")
+    args = parser.parse_args()
+    base_url = args.base_url or start_stub_server()
+    configure(LLM_PROVIDER="openai", OPENAI_BASE_URL=base_url)
+    if not args.base_url:
+        os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    asyncio.run(run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
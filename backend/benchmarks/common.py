@@ -0,0 +1,94 @@
+"""
+Shared setup for the benchmark scripts.
+
+Benchmarks run the app in-process against the fake model provider
+(LLM_PROVIDER=fake, registered by FAKE_LLM_ENABLED=true), so they need no
+API keys or network. `configure` must be called before anything under
+`app` is imported: Settings are read from the environment once.
+"""
+import asyncio
+import hashlib
+import os
+import statistics
+import tempfile
+import time
+from typing import Awaitable, Callable, Iterable, TypeVar
+
+
+T = TypeVar("T")
+
+
+def configure(**env: str) -> str:
+    """Point the app at a fresh temporary data directory; returns its path."""
+    data_dir = tempfile.mkdtemp(prefix="bench-")
+    defaults = {
+        "LLM_PROVIDER": "fake",
+        "FAKE_LLM_ENABLED": "true",
+        "LLM_CACHE_ENABLED": "false",
+        "CHROMA_PERSIST_DIR": os.path.join(data_dir, "chroma_db"),
+        "SESSION_DB_PATH": os.path.join(data_dir, "sessions.sqlite3"),
+        "CHECKPOINT_DB_PATH": os.path.join(data_dir, "checkpoints.sqlite3"),
+        "QUESTION_BANK_PATH": os.path.join(data_dir, "question_bank.sqlite3"),
+        "BULK_RUNS_DIR": os.path.join(data_dir, "bulk_runs"),
+    }
+    os.environ.update({**defaults, **env})
+    return data_dir
+
+
+def use_hash_embeddings(dim: int = 64) -> None:
+    """
+    Replace Chroma's default (ONNX, downloaded on first use) embedding
+    function with bag-of-words hashing, for benchmarks that measure the
+    pipeline around the embedding rather than the model itself.
+    """
+    import numpy as np
+    from chromadb.utils import embedding_functions
+
+    def embed(self, input):
+        vectors = []
+        for text in input:
+            vector = np.zeros(dim, dtype=np.float32)
+            for word in text.lower().split():
+                vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % dim] += 1
+            norm = np.linalg.norm(vector)
+            vectors.append(vector / norm if norm else vector)
+        return vectors
+
+    embedding_functions.DefaultEmbeddingFunction.__call__ = embed
+
+
+def percentile(values: Iterable[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def summarize(label: str, samples_ms: list[float]) -> str:
+    """One result line: count, p50, p95 and max in milliseconds."""
+    return (
+        f"{label:<28} n={len(samples_ms):<5} p50={statistics.median(samples_ms):8.1f} ms"
+        f"  p95={percentile(samples_ms, 0.95):8.1f} ms  max={max(samples_ms):8.1f} ms"
+    )
+
+
+async def max_stall_ms(run: Callable[[], Awaitable[T]]) -> tuple[float, T]:
+    """Run `run()` while measuring the longest gap between 10 ms ticks."""
+    worst = 0.0
+    done = False
+
+    async def ticker() -> None:
+        nonlocal worst
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            worst = max(worst, (now - last) * 1000 - 10)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    try:
+        result = await run()
+    finally:
+        done = True
+        await task
+    return worst, result
@@ -0,0 +1,73 @@
+"""
+N concurrent interview sessions against the fake provider.
+
+Each session starts an interview and answers one question (three model
+calls). Because model calls are awaited, N concurrent sessions should
+take about as long as one. The "sequential" row is the same work done one
+session at a time, which is what blocking model calls on the event loop
+amounted to before.
+
+    python -m benchmarks.concurrent_sessions --sessions 20 --latency-ms 300
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import configure, summarize
+
+
+async def run(sessions: int) -> None:
+    import httpx
+    from app.main import app, lifespan
+
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+            turn_ms: list[float] = []
+
+            async def session(thread_id: str) -> None:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/interview/start",
+                    json={"topic": "Python basics", "thread_id": thread_id, "use_materials": False},
+                )
+                response.raise_for_status()
+                response = await client.post(
+                    "/api/v1/interview/answer",
+                    json={"thread_id": thread_id, "transcript": "Lists are mutable, tuples are not."},
+                )
+                response.raise_for_status()
+                turn_ms.append((time.perf_counter() - started) * 1000)
+
+            async def timed(label: str, runner) -> float:
+                turn_ms.clear()
+                started = time.perf_counter()
+                await runner
+                wall = time.perf_counter() - started
+                print(f"{summarize(label, turn_ms)}  wall={wall:6.2f} s")
+                return wall
+
+            async def sequential(prefix: str) -> None:
+                for i in range(sessions):
+                    await session(f"{prefix}-{i}")
+
+            single = await timed("1 session", session("single"))
+            concurrent = await timed(
+                f"{sessions} concurrent",
+                asyncio.gather(*(session(f"concurrent-{i}") for i in range(sessions))),
+            )
+            await timed(f"{sessions} sequential", sequential("sequential"))
+            print(f"\nconcurrent / single wall time: {concurrent / single:.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--latency-ms", type=int, default=300, help="fake model latency per call")
+    args = parser.parse_args()
+    configure(FAKE_LLM_LATENCY_MS=str(args.latency_ms))
+    asyncio.run(run(args.sessions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Indexing throughput and event-loop stalls: one blocking add versus the
+batched, parallel pipeline.
+
+"single add" chunks the whole document and passes every chunk to one
+collection.add call on the event loop, as index_document did before: the
+embedding runs inline and nothing else can be served meanwhile.
+"pipeline" runs index_document with embed_workers threads embedding
+batches of index_batch_size while one writer thread inserts them in
+order. Both rows report chunks per second and the longest event-loop
+stall, measured by a 10 ms ticker.
+
+By default Chroma's real embedding model is used (downloaded on first
+run). --hash-embeddings swaps in a hashing function, with --embed-ms
+emulating model cost per batch.
+
+    python -m benchmarks.embedding_throughput --chunks 2000 --workers 1 2 4
+"""
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+
+from benchmarks.common import max_stall_ms, use_hash_embeddings
+
+
+def document(chunks: int) -> str:
+    sentence = "Cloud Run scales container instances down to zero when idle. "
+    return sentence * (chunks * 1000 // len(sentence))
+
+
+async def run(args) -> None:
+    from app.services.vectorstore import VectorStoreService
+
+    text = document(args.chunks)
+
+    def slow_down(service: VectorStoreService) -> None:
+        if args.embed_ms:
+            embed = service.embedding_function
+
+            def delayed(texts):
+                time.sleep(args.embed_ms / 1000)
+                return embed(texts)
+
+            service.embedding_function = delayed
+
+    async def single_add(service: VectorStoreService) -> int:
+        chunks = list(service._iter_chunks([text], 1000, 200))
+        embeddings = []
+        for start in range(0, len(chunks), args.batch_size):
+            embeddings.extend(service.embedding_function(chunks[start:start + args.batch_size]))
+        service.collection.add(
+            ids=[f"doc_{i}" for i in range(len(chunks))],
+            documents=chunks,
+            embeddings=embeddings,
+            metadatas=[{"document_id": "doc", "chunk_index": i} for i in range(len(chunks))],
+        )
+        return len(chunks)
+
+    rows = [("single add", 1, single_add)]
+    rows += [
+        (f"pipeline x{workers}", workers, lambda service: service.index_document("doc", text))
+        for workers in args.workers
+    ]
+    for label, workers, index in rows:
+        data_dir = tempfile.mkdtemp(prefix="bench-embed-")
+        service = VectorStoreService(
+            persist_dir=data_dir, index_batch_size=args.batch_size, embed_workers=workers
+        )
+        slow_down(service)
+        service.embedding_function(["warm-up"])
+        started = time.perf_counter()
+        stall, count = await max_stall_ms(lambda: index(service))
+        elapsed = time.perf_counter() - started
+        print(
+            f"{label:<14} chunks={count:<6} {count / elapsed:8.0f} chunks/s"
+            f"  time={elapsed:6.2f} s  max loop stall={stall:8.1f} ms"
+        )
+        service.close()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--hash-embeddings", action="store_true")
+    parser.add_argument("--embed-ms", type=float, default=0, help="added delay per embedded batch")
+    args = parser.parse_args()
+    if args.hash_embeddings:
+        use_hash_embeddings()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Tail latency of one model role with and without hedging.
+
+The fake primary answers in --latency-ms, except a --tail-ratio share of
+calls that take --tail-ms. With hedging on, calls still unanswered after
+the primary's observed p90 (LLM_HEDGE_PERCENTILE) are also sent to the
+"fake-secondary" provider, which answers in --secondary-ms. Calls run
+--concurrency at a time through get_model("question").
+
+    python -m benchmarks.hedging_tail --calls 400 --tail-ratio 0.1
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import configure, summarize
+
+
+async def measure(args, hedge: bool) -> None:
+    from langchain_core.messages import HumanMessage
+
+    from app.agents import supervisor
+    from app.config import get_settings
+    from app.services.metrics import metrics
+
+    configure(
+        FAKE_LLM_LATENCY_MS=str(args.latency_ms),
+        FAKE_LLM_TAIL_MS=str(args.tail_ms),
+        FAKE_LLM_TAIL_RATIO=str(args.tail_ratio),
+        FAKE_SECONDARY_LATENCY_MS=str(args.secondary_ms),
+        LLM_HEDGE="true" if hedge else "false",
+        LLM_SECONDARY_PROVIDER="fake-secondary",
+        LLM_HEDGE_INITIAL_MS=str(args.tail_ms),
+    )
+    get_settings.cache_clear()
+    supervisor._model_registry.clear()
+    supervisor._latency_tracker._samples.clear()
+    metrics.reset()
+    model = supervisor.get_model("question")
+    samples: list[float] = []
+    slots = asyncio.Semaphore(args.concurrency)
+
+    async def call(i: int) -> None:
+        async with slots:
+            started = time.perf_counter()
+            # Distinct prompts, so the governor does not coalesce calls
+            await model.ainvoke([HumanMessage(content=f"Question {i} about Cloud Run")])
+            samples.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(call(i) for i in range(args.calls)))
+    label = "hedged" if hedge else "primary only"
+    extra = ""
+    if hedge:
+        extra = (f"  hedged={metrics.get('llm_hedge.question.hedged'):.0f}"
+                 f" won.secondary={metrics.get('llm_hedge.question.won.secondary'):.0f}")
+    print(f"{summarize(label, samples)}{extra}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    parser.add_argument("--tail-ms", type=int, default=1000)
+    parser.add_argument("--tail-ratio", type=float, default=0.1)
+    parser.add_argument("--secondary-ms", type=int, default=80)
+    args = parser.parse_args()
+    asyncio.run(measure(args, hedge=False))
+    asyncio.run(measure(args, hedge=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+PDF text extraction: pypdf on the event loop versus the process pool.
+
+"serial" extracts every page with pypdf in the calling coroutine, as
+ingestion did before: the event loop is blocked for the whole file.
+"pool xN" runs VectorStoreService.aiter_pdf_text with pdf_workers=N.
+Each row reports pages per second and the longest event-loop stall.
+A synthetic text-heavy PDF is generated unless --pdf is given.
+
+    python -m benchmarks.pdf_extraction --pages 200 --workers 1 2 4
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.common import max_stall_ms
+
+
+def write_pdf(path: str, pages: int) -> None:
+    """A PDF of `pages` pages with 70 lines of text each."""
+    from pypdf import PdfWriter
+    from pypdf.generic import DictionaryObject, NameObject, StreamObject
+
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    for i in range(pages):
+        page = writer.add_blank_page(612, 792)
+        content = StreamObject()
+        content.set_data("".join(
+            f"BT /F1 9 Tf 20 {780 - j * 11} Td (Page {i} line {j}: Cloud Run scales "
+            f"container instances down to zero when idle.) Tj ET\n"
+            for j in range(70)
+        ).encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font}),
+        })
+    with open(path, "wb") as stream:
+        writer.write(stream)
+
+
+async def run(args, path: str) -> None:
+    from pypdf import PdfReader
+
+    from app.services.vectorstore import VectorStoreService
+
+    async def serial() -> int:
+        with open(path, "rb") as stream:
+            return len([page.extract_text() for page in PdfReader(stream).pages])
+
+    stall, pages = await max_stall_ms(serial)
+    started = time.perf_counter()
+    await serial()
+    elapsed = time.perf_counter() - started
+    print(f"{'serial':<10} pages={pages:<5} {pages / elapsed:7.0f} pages/s  time={elapsed:6.2f} s"
+          f"  max loop stall={stall:8.1f} ms")
+
+    for workers in args.workers:
+        data_dir = tempfile.mkdtemp(prefix="bench-pdf-")
+        service = VectorStoreService(persist_dir=data_dir, pdf_workers=workers)
+        # Start the worker processes outside the measurement
+        async for _ in service.aiter_pdf_text(path):
+            break
+
+        async def pooled() -> int:
+            failed: list[int] = []
+            pieces = [piece async for piece in service.aiter_pdf_text(path, failed)]
+            assert not failed
+            return len(pieces[::2])
+
+        started = time.perf_counter()
+        stall, pages = await max_stall_ms(pooled)
+        elapsed = time.perf_counter() - started
+        print(f"{f'pool x{workers}':<10} pages={pages:<5} {pages / elapsed:7.0f} pages/s  time={elapsed:6.2f} s"
+              f"  max loop stall={stall:8.1f} ms")
+        service.close()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--pdf", help="benchmark this file instead of a generated one")
+    args = parser.parse_args()
+    print(f"cpus={os.cpu_count()}")
+    if args.pdf:
+        asyncio.run(run(args, args.pdf))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.pdf")
+        write_pdf(path, args.pages)
+        asyncio.run(run(args, path))
+
+
+# Worker processes are spawned and re-import this module
+if __name__ == "__main__":
+    main()
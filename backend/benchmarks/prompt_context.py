@@ -0,0 +1,90 @@
+"""
+Prompt tokens of the start-of-interview context, before and after assembly.
+
+Indexes the study guides under docs/study-guides, then for each topic
+builds the material that goes into the gather_context prompt two ways:
+the old top-5 chunks joined verbatim, and assemble_context over
+CONTEXT_CANDIDATES chunks (MMR, overlap merging, token budget). Token
+counts are the assembler's ~4 characters per token estimate.
+
+    python -m benchmarks.prompt_context --hash-embeddings
+"""
+import argparse
+import asyncio
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import use_hash_embeddings
+
+
+STUDY_GUIDES = Path(__file__).resolve().parents[2] / "docs" / "study-guides"
+
+TOPICS = [
+    "Cloud Run",
+    "Cloud Run cold starts",
+    "Artifact Registry",
+    "Docker image tagging",
+    "Compute Engine",
+    "Managed Instance Groups",
+    "GCP IAM",
+    "gcloud CLI",
+    "Vertex AI",
+    "Vertex AI model deployment",
+    "LangChain",
+    "LangGraph state and checkpoints",
+]
+
+
+async def run(args) -> None:
+    from app.config import get_settings
+    from app.services.context_assembler import PASSAGE_SEPARATOR, assemble_context, estimate_tokens
+    from app.services.vectorstore import VectorStoreService
+
+    settings = get_settings()
+    data_dir = tempfile.mkdtemp(prefix="bench-context-")
+    service = VectorStoreService(persist_dir=data_dir, query_cache_size=0)
+    for i, guide in enumerate(sorted(STUDY_GUIDES.rglob("*.md"))):
+        await service.index_document(f"guide{i}", guide.read_text(), {"filename": guide.name})
+
+    before, after, assembly_ms = [], [], []
+    print(f"{'topic':<34} {'before':>7} {'after':>7}")
+    for topic in TOPICS:
+        query = f"Information about {topic}"
+        top5 = await service.retrieve(query, n_results=5)
+        candidates = await service.retrieve(query, n_results=settings.context_candidates)
+        started = time.perf_counter()
+        context = assemble_context(
+            candidates,
+            token_budget=settings.prompt_context_tokens_context,
+            diversity=settings.context_mmr_diversity,
+        )
+        assembly_ms.append((time.perf_counter() - started) * 1000)
+        before.append(estimate_tokens(PASSAGE_SEPARATOR.join(chunk.text for chunk in top5)))
+        after.append(estimate_tokens(context))
+        print(f"{topic:<34} {before[-1]:>7} {after[-1]:>7}")
+
+    change = (statistics.mean(after) - statistics.mean(before)) / statistics.mean(before)
+    print(
+        f"mean {statistics.mean(before):.0f} -> {statistics.mean(after):.0f} tokens ({change:+.0%}), "
+        f"max {max(before)} -> {max(after)}, budget {settings.prompt_context_tokens_context}; "
+        f"assembly {statistics.mean(assembly_ms):.2f} ms"
+    )
+
+    service.close()
+    shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--hash-embeddings", action="store_true")
+    args = parser.parse_args()
+    if args.hash_embeddings:
+        use_hash_embeddings()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Retrieval latency and recall@k for each retrieval mode.
+
+Indexes the study guides under docs/study-guides, then runs short queries
+(the shape of interview topics) through VectorStoreService.retrieve in
+vector, lexical and hybrid mode, with the query cache disabled. Each
+query is labelled with the passages that answer it: a question section
+(from its heading to the next heading) or a study-guide paragraph (from
+its first line to the next blank line). A chunk is relevant when it
+overlaps a labelled passage, and recall@k is the share of a query's
+relevant chunks found in its top k, averaged over the queries.
+
+Uses Chroma's real embedding model (downloaded on first run) unless
+--hash-embeddings is given; lexical mode embeds nothing either way.
+
+    python -m benchmarks.retrieval_modes --rounds 20
+"""
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import summarize, use_hash_embeddings
+
+
+STUDY_GUIDES = Path(__file__).resolve().parents[2] / "docs" / "study-guides"
+
+# query -> [(guide path, first line of a relevant passage)]
+LABELS = {
+    "Cloud Run cold starts": [
+        ("cloud-run/interview-questions.md", "### Q8:"),
+        ("cloud-run/quiz-questions.md", "### 3."),
+        ("cloud-run/quiz-questions.md", "### 10."),
+        ("Study Guide.md", "What is scale-to-zero?"),
+    ],
+    "Cloud Run concurrency": [
+        ("cloud-run/interview-questions.md", "### Q7:"),
+        ("cloud-run/quiz-questions.md", "### 6."),
+        ("Study Guide.md", "Know the key configuration settings:"),
+    ],
+    "Cloud Run revisions and traffic splitting": [
+        ("cloud-run/interview-questions.md", "### Q4:"),
+        ("gcp/interview-questions.md", "### Q9:"),
+        ("Study Guide.md", "What are revisions in Cloud Run?"),
+    ],
+    "Artifact Registry image path format": [
+        ("artifact-registry/interview-questions.md", "### Q4:"),
+        ("artifact-registry/quiz-questions.md", "### 2."),
+        ("Study Guide.md", "Know the image path format:"),
+    ],
+    "authenticate Docker with Artifact Registry": [
+        ("artifact-registry/interview-questions.md", "### Q3:"),
+        ("artifact-registry/quiz-questions.md", "### 3."),
+        ("Study Guide.md", "How do you authenticate Docker with Artifact Registry?"),
+    ],
+    "vulnerability scanning": [
+        ("artifact-registry/interview-questions.md", "### Q7:"),
+        ("artifact-registry/quiz-questions.md", "### 5."),
+        ("Study Guide.md", "What is Container Analysis (Artifact Analysis)?"),
+    ],
+    "persistent disk versus local SSD": [
+        ("cloud-engine/interview-questions.md", "### Q4:"),
+        ("cloud-engine/quiz-questions.md", "### 3."),
+        ("cloud-engine/quiz-questions.md", "### 7."),
+    ],
+    "Spot VMs": [
+        ("cloud-engine/quiz-questions.md", "### 4."),
+        ("cloud-engine/interview-questions.md", "### Q7:"),
+        ("Study Guide.md", "What are Spot VMs (preemptible instances)?"),
+    ],
+    "Managed Instance Group autoscaling": [
+        ("cloud-engine/interview-questions.md", "### Q8:"),
+        ("cloud-engine/quiz-questions.md", "### 5."),
+        ("cloud-engine/quiz-questions.md", "### 10."),
+    ],
+    "gcloud set the active project": [
+        ("gcp/interview-questions.md", "### Q3:"),
+        ("gcp/quiz-questions.md", "### 6."),
+        ("Study Guide.md", "What is the gcloud CLI"),
+    ],
+    "environment promotion": [
+        ("gcp/interview-questions.md", "### Q5:"),
+        ("gcp/quiz-questions.md", "### 3."),
+        ("gcp/quiz-questions.md", "### 10."),
+    ],
+    "Factory pattern for model providers": [
+        ("vertex-ai/interview-questions.md", "### Q6:"),
+        ("vertex-ai/quiz-questions.md", "### 3."),
+        ("Study Guide.md", "Know the design patterns used in swappable provider design:"),
+    ],
+    "LangGraph compared to LangChain": [
+        ("langchain-langgraph/interview-questions.md", "### Q8:"),
+        ("langchain-langgraph/quiz-questions.md", "### 9."),
+        ("langchain-langgraph/quiz-questions.md", "### 10."),
+    ],
+    "multi-query retrieval": [
+        ("langchain-langgraph/interview-questions.md", "### Q6:"),
+        ("langchain-langgraph/quiz-questions.md", "### 6."),
+    ],
+    "output parsers": [
+        ("langchain-langgraph/interview-questions.md", "### Q5:"),
+        ("langchain-langgraph/quiz-questions.md", "### 4."),
+        ("langchain-langgraph/quiz-questions.md", "### 12."),
+    ],
+}
+
+
+def passage_span(text: str, first_line: str) -> tuple[int, int]:
+    """Character span of the labelled passage starting at first_line."""
+    lines = text.splitlines(keepends=True)
+    offset = 0
+    for i, line in enumerate(lines):
+        if line.startswith(first_line):
+            end = offset + len(line)
+            for following in lines[i + 1:]:
+                if following.startswith("#") or (not line.startswith("#") and not following.strip()):
+                    break
+                end += len(following)
+            return offset, end
+        offset += len(line)
+    raise ValueError(f"Labelled passage not found: {first_line!r}")
+
+
+def relevant_chunks(guide_texts: dict[str, str], chunk_spans: dict[str, tuple[str, int, int]]) -> dict[str, set]:
+    """query -> ids of the chunks overlapping one of its labelled passages."""
+    relevant = {}
+    for query, passages in LABELS.items():
+        spans = [(path, *passage_span(guide_texts[path], line)) for path, line in passages]
+        relevant[query] = {
+            chunk_id for chunk_id, (path, start, end) in chunk_spans.items()
+            if any(path == p and start < e and s < end for p, s, e in spans)
+        }
+    return relevant
+
+
+async def run(args) -> None:
+    from app.services.context_assembler import RetrievedChunk
+    from app.services.vectorstore import RETRIEVAL_MODES, VectorStoreService
+
+    data_dir = tempfile.mkdtemp(prefix="bench-retrieval-")
+    service = VectorStoreService(persist_dir=data_dir, query_cache_size=0)
+    guides = sorted(STUDY_GUIDES.rglob("*.md"))
+    guide_texts = {guide.relative_to(STUDY_GUIDES).as_posix(): guide.read_text() for guide in guides}
+    chunks = 0
+    started = time.perf_counter()
+    for i, path in enumerate(guide_texts):
+        chunks += await service.index_document(f"guide{i}", guide_texts[path], {"filename": path})
+    print(f"indexed {len(guides)} guides, {chunks} chunks in {time.perf_counter() - started:.1f} s")
+
+    # Locate every chunk in its guide to label it
+    chunk_spans = {}
+    for i, path in enumerate(guide_texts):
+        text = guide_texts[path]
+        cursor = 0
+        stored = service.collection.get(where={"document_id": f"guide{i}"}, include=["documents"])
+        for chunk in sorted(map(RetrievedChunk.from_id, stored["ids"], stored["documents"]), key=lambda c: c.chunk_index):
+            start = text.find(chunk.text, max(cursor - len(chunk.text), 0))
+            if start != -1:
+                chunk_spans[chunk.chunk_id] = (path, start, start + len(chunk.text))
+                cursor = start + len(chunk.text)
+    relevant = relevant_chunks(guide_texts, chunk_spans)
+    print(
+        f"{sum(map(len, relevant.values()))} relevant chunks over {len(LABELS)} labelled queries "
+        f"({len(chunk_spans)} of {chunks} chunks located in their guide)"
+    )
+
+    k_values = sorted({1, 5, args.n_results})
+    for mode in RETRIEVAL_MODES:
+        await service.retrieve(next(iter(LABELS)), mode=mode)  # warm-up
+        samples = []
+        recall = {k: 0.0 for k in k_values}
+        for _ in range(args.rounds):
+            for query, wanted in relevant.items():
+                started = time.perf_counter()
+                found = await service.retrieve(query, n_results=args.n_results, mode=mode)
+                samples.append((time.perf_counter() - started) * 1000)
+                for k in k_values:
+                    recall[k] += len(wanted & {chunk.chunk_id for chunk in found[:k]}) / len(wanted)
+        recalls = "  ".join(f"recall@{k}={recall[k] / len(samples):5.1%}" for k in k_values)
+        print(f"{summarize(mode, samples)}  {recalls}")
+
+    service.close()
+    shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--n-results", type=int, default=10, help="largest k")
+    parser.add_argument("--hash-embeddings", action="store_true")
+    args = parser.parse_args()
+    if args.hash_embeddings:
+        use_hash_embeddings()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
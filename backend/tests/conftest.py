@@ -0,0 +1,148 @@
+"""
+Shared fixtures for the backend test suite.
+
+Every test runs against the local fake model (LLM_PROVIDER=fake, registered
+by FAKE_LLM_ENABLED=true) with its own temporary data directory, and with a deterministic word-hashing
+embedding function so Chroma never downloads its ONNX model. Process-wide
+singletons (settings, services, pooled models, metrics) are reset around
+each test so settings changed with `monkeypatch.setenv` take effect.
+
+Async tests use the anyio pytest plugin: mark them with
+`pytest.mark.anyio`.
+"""
+import hashlib
+import os
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pytest
+from chromadb.utils import embedding_functions
+
+from app.agents import supervisor
+from app.agents.checkpointer import get_checkpointer
+from app.api import deps
+from app.config import get_settings
+from app.main import app, lifespan
+from app.services.llm_cache import get_llm_cache
+from app.services.llm_governor import get_llm_governor
+from app.services.metrics import metrics
+from app.services.question_bank import get_question_bank
+
+
+STUDY_GUIDES = Path(__file__).resolve().parents[2] / "docs" / "study-guides"
+
+EMBEDDING_DIM = 64
+
+
+def hash_embed(texts: list[str]) -> list[np.ndarray]:
+    """Bag-of-words vectors: texts sharing words are close, no model needed."""
+    vectors = []
+    for text in texts:
+        vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+        for word in text.lower().split():
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % EMBEDDING_DIM] += 1
+        norm = np.linalg.norm(vector)
+        vectors.append(vector / norm if norm else vector)
+    return vectors
+
+
+_SINGLETONS = (
+    get_settings,
+    deps.get_vectorstore_service,
+    deps.get_topic_digests,
+    deps.get_ingestion_queue,
+    deps.get_question_prefetcher,
+    deps.get_session_store,
+    get_checkpointer,
+    supervisor.get_interview_graph,
+    get_llm_cache,
+    get_llm_governor,
+    get_question_bank,
+)
+
+
+def reset_singletons() -> None:
+    """Forget cached services and pooled models (closing what holds files)."""
+    if deps.get_vectorstore_service.cache_info().currsize:
+        deps.get_vectorstore_service().close()
+    if deps.get_session_store.cache_info().currsize:
+        deps.get_session_store().close()
+    if get_llm_cache.cache_info().currsize:
+        get_llm_cache().close()
+    if get_question_bank.cache_info().currsize:
+        get_question_bank().close()
+    for getter in _SINGLETONS:
+        getter.cache_clear()
+    supervisor._model_registry.clear()
+    supervisor._structured_models.clear()
+    supervisor._latency_tracker._samples.clear()
+    metrics.reset()
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def app_env(tmp_path, monkeypatch):
+    """Fake provider, temporary data paths and fresh singletons."""
+    # A developer's backend/.env must not leak into the tests
+    monkeypatch.chdir(tmp_path)
+    env = {
+        "LLM_PROVIDER": "fake",
+        "FAKE_LLM_ENABLED": "true",
+        "FAKE_LLM_LATENCY_MS": "0",
+        "LLM_CACHE_ENABLED": "false",
+        "LLM_CACHE_PATH": str(tmp_path / "llm_cache.sqlite3"),
+        "CHROMA_PERSIST_DIR": str(tmp_path / "chroma_db"),
+        "SESSION_STORE": "memory",
+        "SESSION_DB_PATH": str(tmp_path / "sessions.sqlite3"),
+        "CHECKPOINTER": "memory",
+        "CHECKPOINT_DB_PATH": str(tmp_path / "checkpoints.sqlite3"),
+        "QUESTION_SOURCE": "llm",
+        "QUESTION_BANK_DIR": str(STUDY_GUIDES),
+        "QUESTION_BANK_PATH": str(tmp_path / "question_bank.sqlite3"),
+        "BULK_RUNS_DIR": str(tmp_path / "bulk_runs"),
+        "SPECULATIVE_QUESTIONS": "false",
+        "PREFETCH_QUESTIONS": "0",
+        "INGEST_DIGESTS": "false",
+        "LLM_HEDGE": "false",
+        "LLM_SECONDARY_PROVIDER": "",
+    }
+    for name in list(os.environ):
+        if name.startswith(("LLM_DEADLINE_MS_", "FAKE_")):
+            monkeypatch.delenv(name)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr(
+        embedding_functions.DefaultEmbeddingFunction,
+        "__call__",
+        lambda self, input: hash_embed(input),
+    )
+    reset_singletons()
+    yield
+    reset_singletons()
+
+
+@pytest.fixture
+async def client():
+    """HTTP client for the app, with its startup and shutdown run around the test."""
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as c:
+            yield c
+
+
+@pytest.fixture
+def start_session(client):
+    """Start an interview (without study materials); returns the response body."""
+    async def start(thread_id: str, topic: str = "Python basics") -> dict:
+        response = await client.post(
+            "/api/v1/interview/start",
+            json={"topic": topic, "thread_id": thread_id, "use_materials": False},
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+    return start
@@ -0,0 +1,215 @@
+"""Resumable bulk assessment runs (BulkAssessmentRun and /assessments/batch)."""
+import asyncio
+import json
+
+import pytest
+
+from app.api.routes import assessments
+from app.config import get_settings
+from app.services.bulk_assessment import BulkAssessmentRun, aiter_jsonl, record_id
+from app.services.metrics import metrics
+
+
+pytestmark = pytest.mark.anyio
+
+
+def records(count: int, start: int = 0) -> list[dict]:
+    return [
+        {"id": f"r{i}", "question": f"What is a list? ({i})", "answer": "An ordered, mutable sequence."}
+        for i in range(start, start + count)
+    ]
+
+
+def jsonl(items: list[dict]) -> str:
+    return "".join(json.dumps(item) + "\n" for item in items)
+
+
+async def collect(run: BulkAssessmentRun, lines) -> list[dict]:
+    return [result async for result in run.run(aiter_jsonl(lines))]
+
+
+def stored(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+# ── BulkAssessmentRun ──
+
+def test_record_ids_are_stable():
+    record = {"question": "Q", "answer": "A"}
+
+    assert record_id({"id": 7, **record}) == "7"
+    assert record_id(record) == record_id(dict(record))
+    assert record_id(record) == record_id({"topic": "General", **record})
+    assert record_id(record) != record_id({"topic": "Go", **record})
+
+
+async def test_run_assesses_and_saves_every_record(tmp_path):
+    path = tmp_path / "run.jsonl"
+
+    results = await collect(BulkAssessmentRun(str(path)), jsonl(records(5)).splitlines())
+
+    assert sorted(result["id"] for result in results) == [f"r{i}" for i in range(5)]
+    assert all(result["assessment"]["score"] == 80 for result in results)
+    assert sorted(result["id"] for result in stored(path)) == [f"r{i}" for i in range(5)]
+
+
+async def test_resume_skips_records_already_done(tmp_path):
+    path = tmp_path / "run.jsonl"
+    await collect(BulkAssessmentRun(str(path)), jsonl(records(3)).splitlines())
+    metrics.reset()
+
+    results = await collect(BulkAssessmentRun(str(path)), jsonl(records(5)).splitlines())
+
+    assert sorted(result["id"] for result in results) == ["r3", "r4"]
+    assert metrics.get("bulk_assessment.skipped") == 3
+    assert len(stored(path)) == 5
+
+
+async def test_failed_records_are_retried_on_resume(tmp_path):
+    path = tmp_path / "run.jsonl"
+    lines = jsonl([{"id": "bad", "question": "Q"}, *records(1)]).splitlines()
+    first = await collect(BulkAssessmentRun(str(path)), lines)
+
+    second = await collect(BulkAssessmentRun(str(path)), lines)
+
+    assert {result["id"]: "error" in result for result in first} == {"bad": True, "r0": False}
+    assert [result["id"] for result in second] == ["bad"]
+
+
+async def test_torn_last_line_is_dropped_and_its_record_redone(tmp_path):
+    path = tmp_path / "run.jsonl"
+    await collect(BulkAssessmentRun(str(path)), jsonl(records(2)).splitlines())
+    text = path.read_text()
+    # A crash cut the last result short
+    path.write_text(text[:-20])
+
+    results = await collect(BulkAssessmentRun(str(path)), jsonl(records(3)).splitlines())
+
+    torn_id = json.loads(text.splitlines()[-1])["id"]
+    assert sorted(result["id"] for result in results) == sorted([torn_id, "r2"])
+    assert sorted(result["id"] for result in stored(path)) == ["r0", "r1", "r2"]
+
+
+async def test_invalid_lines_are_reported_with_their_line_number(tmp_path):
+    lines = [json.dumps(records(1)[0]), "{not json", "", "[1, 2]"]
+
+    results = await collect(BulkAssessmentRun(str(tmp_path / "run.jsonl")), lines)
+    errors = sorted((r["line"], r["error"].split(":")[0]) for r in results if r["id"] is None)
+
+    assert errors == [(2, "Invalid JSON"), (4, "Expected a JSON object")]
+    assert metrics.get("bulk_assessment.invalid") == 2
+
+
+async def test_at_most_concurrency_records_are_in_flight(tmp_path, monkeypatch):
+    in_flight = peak = 0
+
+    async def assess(self, rid, record):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"id": rid, "assessment": {}}
+
+    monkeypatch.setattr(BulkAssessmentRun, "_assess", assess)
+
+    results = await collect(BulkAssessmentRun(str(tmp_path / "run.jsonl"), concurrency=3), jsonl(records(10)).splitlines())
+
+    assert len(results) == 10
+    assert peak == 3
+
+
+# ── /assessments/batch ──
+
+async def test_batch_streams_results_and_stores_them(client):
+    response = await client.post("/api/v1/assessments/batch", params={"run_id": "cohort"}, content=jsonl(records(3)))
+
+    assert response.status_code == 200
+    assert response.headers["x-run-id"] == "cohort"
+    assert sorted(json.loads(line)["id"] for line in response.text.splitlines()) == ["r0", "r1", "r2"]
+    stored_results = await client.get("/api/v1/assessments/batch/cohort")
+    assert len(stored_results.text.splitlines()) == 3
+    assert "cohort" not in assessments._active_runs
+
+
+async def test_reposting_a_run_only_assesses_new_records(client):
+    await client.post("/api/v1/assessments/batch", params={"run_id": "cohort"}, content=jsonl(records(2)))
+
+    response = await client.post("/api/v1/assessments/batch", params={"run_id": "cohort"}, content=jsonl(records(3)))
+
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == ["r2"]
+
+
+async def test_unknown_and_invalid_run_ids(client):
+    assert (await client.get("/api/v1/assessments/batch/missing")).status_code == 404
+    assert (await client.get("/api/v1/assessments/batch/..%2Fetc")).status_code in (400, 404)
+    response = await client.post("/api/v1/assessments/batch", params={"run_id": "a/b"}, content="")
+    assert response.status_code == 400
+
+
+async def test_concurrent_posts_for_one_run_conflict(client):
+    body_started = asyncio.Event()
+    finish_body = asyncio.Event()
+
+    async def slow_body():
+        yield jsonl(records(1)).encode()
+        body_started.set()
+        await finish_body.wait()
+        yield jsonl(records(1, start=1)).encode()
+
+    first = asyncio.create_task(
+        client.post("/api/v1/assessments/batch", params={"run_id": "cohort"}, content=slow_body())
+    )
+    await body_started.wait()
+
+    # The first request is still uploading its body
+    second = await client.post("/api/v1/assessments/batch", params={"run_id": "cohort"}, content=jsonl(records(1)))
+    finish_body.set()
+    first = await first
+
+    assert second.status_code == 409
+    assert first.status_code == 200
+    assert len(first.text.splitlines()) == 2
+
+
+@pytest.fixture
+def one_mb_limit(monkeypatch):
+    monkeypatch.setenv("MAX_UPLOAD_MB", "1")
+
+
+async def test_oversized_batch_releases_the_run(one_mb_limit, client):
+    body = jsonl(records(1)) + " " * (1024 * 1024)
+
+    response = await client.post("/api/v1/assessments/batch", params={"run_id": "cohort"}, content=body)
+
+    assert response.status_code == 413
+    assert "cohort" not in assessments._active_runs
+
+
+async def test_run_is_released_when_the_client_leaves_before_the_body(client):
+    class Body:
+        """Just enough of a Request for the route to spool."""
+
+        def __init__(self, data: bytes):
+            self.data = data
+
+        async def stream(self):
+            yield self.data
+
+    response = await assessments.assess_batch(
+        Body(jsonl(records(2)).encode()), get_settings(), run_id="cohort", concurrency=None
+    )
+    assert "cohort" in assessments._active_runs
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise OSError("connection reset")
+
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+    with pytest.raises(Exception):
+        # Sending the response headers fails: the body never starts
+        await response(scope, receive, send)
+
+    assert "cohort" not in assessments._active_runs
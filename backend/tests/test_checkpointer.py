@@ -0,0 +1,78 @@
+"""Bounded, file-backed LangGraph checkpointer (CHECKPOINTER=sqlite)."""
+import threading
+
+import pytest
+
+from app.agents.checkpointer import BoundedSqliteSaver, get_checkpointer
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def sqlite_checkpointer(monkeypatch):
+    monkeypatch.setenv("CHECKPOINTER", "sqlite")
+    monkeypatch.setenv("CHECKPOINT_KEEP_LAST", "2")
+
+
+def _count(saver: BoundedSqliteSaver, table: str, thread_id: str) -> int:
+    with saver.cursor(transaction=False) as cur:
+        cur.execute(f"SELECT COUNT(*) FROM {table} WHERE thread_id = ?", (thread_id,))
+        return cur.fetchone()[0]
+
+
+async def test_keeps_only_the_last_checkpoints_per_thread(sqlite_checkpointer, client, start_session):
+    await start_session("t1")
+    await start_session("t2")
+
+    saver = get_checkpointer()
+    assert isinstance(saver, BoundedSqliteSaver)
+    # gather_context and generate_question each checkpoint; only the newest two stay
+    assert _count(saver, "checkpoints", "t1") == 2
+    assert _count(saver, "checkpoints", "t2") == 2
+    state = saver.get_tuple({"configurable": {"thread_id": "t1"}})
+    assert state.checkpoint["channel_values"]["current_question"]
+
+
+async def test_ending_a_session_drops_its_checkpoints(sqlite_checkpointer, client, start_session):
+    await start_session("t1")
+
+    response = await client.delete("/api/v1/interview/t1")
+
+    assert response.status_code == 200
+    saver = get_checkpointer()
+    assert _count(saver, "checkpoints", "t1") == 0
+    assert _count(saver, "thread_activity", "t1") == 0
+
+
+async def test_idle_threads_expire(sqlite_checkpointer, client, start_session):
+    await start_session("idle")
+    await start_session("active")
+    saver = get_checkpointer()
+    with saver.cursor() as cur:
+        cur.execute("UPDATE thread_activity SET updated_at = 0 WHERE thread_id = 'idle'")
+
+    assert saver.delete_expired() == 1
+
+    assert _count(saver, "checkpoints", "idle") == 0
+    assert _count(saver, "checkpoints", "active") == 2
+
+
+async def test_async_methods_run_off_the_event_loop(sqlite_checkpointer, monkeypatch, client, start_session):
+    saver = get_checkpointer()
+    loop_thread = threading.get_ident()
+    threads = set()
+    for name in ("get_tuple", "put", "put_writes", "delete_thread"):
+        method = getattr(saver, name)
+
+        def recorded(*args, _method=method, **kwargs):
+            threads.add(threading.get_ident())
+            return _method(*args, **kwargs)
+
+        monkeypatch.setattr(saver, name, recorded)
+
+    await start_session("t1")
+    await client.delete("/api/v1/interview/t1")
+
+    assert threads and loop_thread not in threads
+    assert _count(saver, "checkpoints", "t1") == 0
@@ -0,0 +1,83 @@
+"""Streaming, bounded-memory chunking (TextChunker)."""
+import random
+
+import pytest
+
+from app.services.vectorstore import TextChunker
+
+
+def whole_text_chunks(text: str, chunk_size: int, chunk_overlap: int) -> list[str]:
+    """
+    The original split of a whole string, which streaming must reproduce.
+    (The original also emitted a last chunk holding nothing but the
+    previous chunk's overlap; both stop at the end of the text instead.)
+    """
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        chunk = text[start:end]
+        if end < len(text):
+            last_period = chunk.rfind(". ")
+            if last_period > chunk_size // 2:
+                chunk = chunk[:last_period + 1]
+                end = start + last_period + 1
+        if chunk.strip():
+            chunks.append(chunk.strip())
+        if end >= len(text):
+            break
+        start = end - chunk_overlap
+    return chunks
+
+
+def stream_chunks(pieces, chunk_size: int, chunk_overlap: int) -> list[str]:
+    chunker = TextChunker(chunk_size, chunk_overlap)
+    chunks = []
+    for piece in pieces:
+        chunks.extend(chunker.feed(piece))
+    return chunks + chunker.finish()
+
+
+def sample_text(rng: random.Random, sentences: int) -> str:
+    words = ["alpha", "beta", "gamma", "delta", "cloud", "run", "scales", "to", "zero"]
+    return " ".join(
+        " ".join(rng.choice(words) for _ in range(rng.randint(3, 25))) + "."
+        for _ in range(sentences)
+    )
+
+
+def split_randomly(rng: random.Random, text: str) -> list[str]:
+    pieces, start = [], 0
+    while start < len(text):
+        end = start + rng.randint(1, 700)
+        pieces.append(text[start:end])
+        start = end
+    return pieces
+
+
+@pytest.mark.parametrize("chunk_size,chunk_overlap", [(1000, 200), (300, 50), (120, 0)])
+def test_streamed_chunks_match_whole_text_chunks(chunk_size, chunk_overlap):
+    rng = random.Random(chunk_size)
+    for _ in range(20):
+        text = sample_text(rng, rng.randint(1, 300))
+
+        streamed = stream_chunks(split_randomly(rng, text), chunk_size, chunk_overlap)
+
+        assert streamed == whole_text_chunks(text, chunk_size, chunk_overlap)
+
+
+def test_buffer_stays_bounded_by_chunk_size():
+    rng = random.Random(0)
+    chunker = TextChunker(1000, 200)
+    largest = 0
+    for _ in range(5000):
+        chunker.feed(sample_text(rng, 3))
+        largest = max(largest, len(chunker._buffer))
+
+    # About 1 MB of sentences went through a buffer of a few chunk sizes
+    assert largest < 3000
+
+
+def test_empty_and_blank_input_give_no_chunks():
+    assert stream_chunks([], 1000, 200) == []
+    assert stream_chunks(["", "   ", "\n\n"], 1000, 200) == []
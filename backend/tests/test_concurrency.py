@@ -0,0 +1,54 @@
+"""Model calls are awaited, so concurrent sessions overlap instead of queueing."""
+import asyncio
+import time
+
+import pytest
+
+
+pytestmark = pytest.mark.anyio
+
+LATENCY_MS = 200
+
+
+async def _interview_turn(client, start_session, thread_id: str) -> None:
+    await start_session(thread_id)
+    response = await client.post(
+        "/api/v1/interview/answer",
+        json={"thread_id": thread_id, "transcript": "Lists are mutable, tuples are not."},
+    )
+    assert response.status_code == 200, response.text
+
+
+async def _timed_sessions(client, start_session, count: int, prefix: str) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _interview_turn(client, start_session, f"{prefix}-{i}") for i in range(count)
+    ))
+    return time.perf_counter() - started
+
+
+@pytest.fixture
+def slow_model(monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_LATENCY_MS", str(LATENCY_MS))
+
+
+async def test_concurrent_sessions_take_about_as_long_as_one(slow_model, client, start_session):
+    single = await _timed_sessions(client, start_session, 1, "single")
+    concurrent = await _timed_sessions(client, start_session, 8, "many")
+
+    # Serialised, eight sessions would take eight times as long
+    assert concurrent < single * 2.5, f"1 session {single:.2f}s, 8 sessions {concurrent:.2f}s"
+
+
+async def test_answer_returns_assessment_and_next_question(client, start_session):
+    await start_session("t1")
+
+    response = await client.post(
+        "/api/v1/interview/answer",
+        json={"thread_id": "t1", "transcript": "A decorator wraps a function."},
+    )
+
+    assert response.status_code == 200, response.text
+    question = (await client.get("/api/v1/interview/question", params={"thread_id": "t1"})).json()
+    assert question["status"] == "awaiting_answer"
+    assert question["question_number"] == 2
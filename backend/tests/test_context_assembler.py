@@ -0,0 +1,86 @@
+"""Prompt context assembly: MMR selection, overlap merging and token budgets."""
+from app.services.context_assembler import (
+    PASSAGE_SEPARATOR,
+    RetrievedChunk,
+    assemble_context,
+    estimate_tokens,
+    merge_adjacent,
+    select_mmr,
+)
+
+
+def _chunk(document_id: str, index: int, text: str) -> RetrievedChunk:
+    return RetrievedChunk(f"{document_id}_{index}", document_id, index, text)
+
+
+SCALING = _chunk("guide", 0, "Cloud Run scales container instances down to zero when idle.")
+SCALING_AGAIN = _chunk("notes", 3, "Cloud Run scales container instances down to zero, when idle!")
+REGISTRY = _chunk("guide", 7, "Images are pushed to Artifact Registry before deployment.")
+
+
+def test_chunk_ids_are_split_into_document_and_index():
+    chunk = RetrievedChunk.from_id("my_notes_12", "text")
+
+    assert (chunk.document_id, chunk.chunk_index) == ("my_notes", 12)
+
+
+def test_mmr_skips_near_duplicates():
+    chunks = [SCALING, SCALING_AGAIN, REGISTRY]
+
+    assert select_mmr(chunks, 2) == [SCALING, REGISTRY]
+    assert select_mmr(chunks, 3) == [SCALING, REGISTRY, SCALING_AGAIN]
+
+
+def test_mmr_without_diversity_is_top_k():
+    chunks = [SCALING, SCALING_AGAIN, REGISTRY]
+
+    assert select_mmr(chunks, 2, diversity=0.0) == [SCALING, SCALING_AGAIN]
+    assert select_mmr(chunks[:1], 5) == [SCALING]
+
+
+def test_consecutive_chunks_are_merged_without_their_overlap():
+    chunks = [
+        _chunk("guide", 4, "to zero when idle. Min instances keep some warm."),
+        _chunk("other", 0, "Unrelated passage."),
+        _chunk("guide", 3, "Cloud Run scales to zero when idle."),
+    ]
+
+    assert merge_adjacent(chunks) == [
+        # Ranked by the best of the merged chunks
+        (0, "Cloud Run scales to zero when idle. Min instances keep some warm."),
+        (1, "Unrelated passage."),
+    ]
+
+
+def test_neighbours_without_an_overlap_are_joined_on_a_new_line():
+    chunks = [_chunk("guide", 0, "First part."), _chunk("guide", 1, "Second part."), _chunk("guide", 5, "Later.")]
+
+    assert merge_adjacent(chunks) == [(0, "First part.\nSecond part."), (2, "Later.")]
+
+
+def test_overlap_search_is_bounded():
+    chunks = [_chunk("guide", 0, "abc shared tail"), _chunk("guide", 1, "shared tail def")]
+
+    assert merge_adjacent(chunks, max_overlap=5) == [(0, "abc shared tail\nshared tail def")]
+
+
+def test_context_fits_the_token_budget():
+    sentence = "Concurrency controls how many requests one instance serves at a time. "
+    chunks = [_chunk("guide", 0, sentence * 20), _chunk("other", 0, sentence.upper() * 20)]
+
+    context = assemble_context(chunks, token_budget=500, diversity=0.0)
+
+    assert estimate_tokens(context) <= 500
+    first, second = context.split(PASSAGE_SEPARATOR)
+    assert first == chunks[0].text
+    # The second passage is cut at a sentence boundary
+    assert second.endswith("AT A TIME.")
+    assert len(second) < len(chunks[1].text)
+
+
+def test_small_leftovers_are_dropped():
+    chunks = [_chunk("guide", 0, "x" * 1000), _chunk("other", 0, "y" * 1000)]
+
+    assert assemble_context(chunks, token_budget=260) == chunks[0].text
+    assert assemble_context(chunks, token_budget=0) == ""
+    assert assemble_context([], token_budget=500) == ""
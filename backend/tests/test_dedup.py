@@ -0,0 +1,112 @@
+"""Upload deduplication by content hash and chunk embedding reuse."""
+import asyncio
+import hashlib
+
+import pytest
+
+from app.api import deps
+from app.services.ingest_jobs import ingest_upload
+from app.services.metrics import metrics
+from app.services.uploads import SpooledUpload
+from app.services.vectorstore import VectorStoreService
+from conftest import hash_embed
+
+
+pytestmark = pytest.mark.anyio
+
+UPLOAD = "/api/v1/materials/upload"
+NOTES = b"Cloud Run scales container instances down to zero when there is no traffic."
+
+
+class CountingEmbedding:
+    """Embedding function that records every text it embeds."""
+
+    def __init__(self):
+        self.texts: list[str] = []
+
+    def __call__(self, texts):
+        self.texts.extend(texts)
+        return hash_embed(texts)
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = VectorStoreService(persist_dir=str(tmp_path / "chroma"), index_batch_size=4)
+    service.embedding_function = CountingEmbedding()
+    yield service
+    service.close()
+
+
+async def test_documents_are_found_by_content_hash(service):
+    sha256 = hashlib.sha256(NOTES).hexdigest()
+    assert await service.find_document_by_hash(sha256) is None
+
+    await service.index_document("notes", NOTES.decode(), {"filename": "notes.txt", "content_hash": sha256})
+
+    found = await service.find_document_by_hash(sha256)
+    assert (found["id"], found["chunk_count"]) == ("notes", 1)
+    await service.delete_document("notes")
+    assert await service.find_document_by_hash(sha256) is None
+
+
+async def test_identical_concurrent_ingestions_index_once(service, tmp_path):
+    def spooled(name: str) -> SpooledUpload:
+        path = tmp_path / name
+        path.write_bytes(NOTES)
+        return SpooledUpload(name, ".txt", str(path), len(NOTES), hashlib.sha256(NOTES).hexdigest())
+
+    first, second = await asyncio.gather(
+        ingest_upload(service, spooled("a.txt"), "a"),
+        ingest_upload(service, spooled("b.txt"), "b"),
+    )
+
+    assert (first.duplicate, second.duplicate) == (False, True)
+    assert second.material_id == "a"
+    assert second.chunks_created == first.chunks_created
+    assert len(service.embedding_function.texts) == 1
+    assert metrics.get("ingest.dedup.document") == 1
+
+
+async def test_identical_uploads_return_the_existing_material(client):
+    files = {"file": ("notes.txt", NOTES, "text/plain")}
+    first = (await client.post(UPLOAD, files=files)).json()
+
+    second = await client.post(UPLOAD, files={"file": ("copy.txt", NOTES, "text/plain")})
+    # Answered without queueing a job
+    background = await client.post(UPLOAD, params={"background": "true"}, files=files)
+
+    assert first["duplicate"] is False
+    for response in (second, background):
+        assert response.status_code == 200
+        assert response.json()["duplicate"] is True
+        assert response.json()["material_id"] == first["material_id"]
+    assert (await client.get("/api/v1/materials/list")).json()["count"] == 1
+    assert metrics.get("ingest.dedup.document") == 2
+    assert not deps.get_ingestion_queue()._jobs
+
+
+async def test_stored_chunk_embeddings_are_reused(service):
+    shared = ["Chunk about Cloud Run.", "Chunk about Artifact Registry."]
+    embedded = service.embedding_function.texts
+
+    first, first_hashes = service._embed_batch([*shared, shared[0]])
+    assert embedded == shared  # the repeat within the batch is embedded once
+    service._add_batch("doc", [*shared, shared[0]], 0, None, first, first_hashes)
+
+    second, second_hashes = service._embed_batch([shared[1], "A new chunk."])
+
+    assert embedded == [*shared, "A new chunk."]
+    assert second_hashes[0] == first_hashes[1]
+    assert list(second[0]) == pytest.approx(list(first[1]))
+    assert metrics.get("ingest.embed_reuse.hit") == 2
+    assert metrics.get("ingest.embed_reuse.miss") == 3
+
+
+async def test_reindexed_text_embeds_nothing_new(service):
+    text = " ".join(f"Sentence {i} explains how Cloud Run scales to zero." for i in range(100))
+    count = await service.index_document("first", text, chunk_size=200, chunk_overlap=40)
+    embedded = len(service.embedding_function.texts)
+
+    assert await service.index_document("second", text, chunk_size=200, chunk_overlap=40) == count
+    assert len(service.embedding_function.texts) == embedded
+    assert metrics.get("ingest.embed_reuse.hit") == count
@@ -0,0 +1,137 @@
+"""Hedged requests to a secondary provider and per-role deadlines."""
+import time
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from app.agents.fake_model import FAKE_RESPONSES, FakeChatModel
+from app.agents.supervisor import get_model
+from app.services.llm_hedging import HedgedChatModel, LatencyTracker, LLMDeadlineExceeded
+from app.services.metrics import metrics
+
+
+pytestmark = pytest.mark.anyio
+
+MESSAGES = [HumanMessage(content="Ask me about Cloud Run.")]
+
+
+@pytest.fixture
+def slow_primary(monkeypatch):
+    """A 500 ms primary hedged after 50 ms to a 20 ms secondary."""
+    monkeypatch.setenv("FAKE_LLM_LATENCY_MS", "500")
+    monkeypatch.setenv("FAKE_SECONDARY_LATENCY_MS", "20")
+    monkeypatch.setenv("LLM_HEDGE", "true")
+    monkeypatch.setenv("LLM_SECONDARY_PROVIDER", "fake-secondary")
+    monkeypatch.setenv("LLM_HEDGE_INITIAL_MS", "50")
+
+
+def _in_flight(provider: str, role: str = "question") -> float:
+    return metrics.snapshot()["gauges"].get(f"llm_governor.{provider}.{role}.in_flight", 0)
+
+
+async def test_slow_primary_is_hedged_to_the_secondary(slow_primary):
+    model = get_model("question")
+    assert isinstance(model, HedgedChatModel)
+
+    started = time.perf_counter()
+    response = await model.ainvoke(MESSAGES)
+    elapsed = time.perf_counter() - started
+
+    assert response.content == FAKE_RESPONSES["question"]
+    assert elapsed < 0.3
+    assert metrics.get("llm_hedge.question.hedged") == 1
+    assert metrics.get("llm_hedge.question.won.secondary") == 1
+    # The cancelled primary gave its governor slot back
+    assert _in_flight("fake") == 0
+
+
+async def test_fast_primary_is_not_hedged(monkeypatch):
+    monkeypatch.setenv("FAKE_SECONDARY_LATENCY_MS", "20")
+    monkeypatch.setenv("LLM_HEDGE", "true")
+    monkeypatch.setenv("LLM_SECONDARY_PROVIDER", "fake-secondary")
+    monkeypatch.setenv("LLM_HEDGE_INITIAL_MS", "200")
+
+    await get_model("question").ainvoke(MESSAGES)
+
+    assert metrics.get("llm_hedge.question.hedged") == 0
+    assert _in_flight("fake-secondary") == 0
+
+
+@pytest.fixture
+def slow_first_token(slow_primary, monkeypatch):
+    # The fake model spreads its latency over the tokens; hedging streams
+    # races the first one
+    monkeypatch.setenv("FAKE_LLM_LATENCY_MS", "5000")
+
+
+async def test_stream_loser_is_closed_and_releases_its_slot(slow_first_token):
+    model = get_model("question")
+
+    tokens = [chunk.content async for chunk in model.astream(MESSAGES)]
+
+    assert "".join(tokens) == FAKE_RESPONSES["question"]
+    assert metrics.get("llm_hedge.question.won.secondary") == 1
+    assert _in_flight("fake") == 0
+    assert _in_flight("fake-secondary") == 0
+
+
+async def test_failed_primary_fails_over_at_once():
+    class Unavailable:
+        async def ainvoke(self, messages, config=None, **kwargs):
+            raise ConnectionError("primary down")
+
+    model = HedgedChatModel(
+        Unavailable(),
+        FakeChatModel(role="question"),
+        "question",
+        ("primary", "secondary"),
+        LatencyTracker(),
+        hedge_initial_ms=5000,
+    )
+
+    response = await model.ainvoke(MESSAGES)
+
+    assert response.content == FAKE_RESPONSES["question"]
+    assert metrics.get("llm_hedge.question.failover") == 1
+
+
+def test_hedge_delay_follows_the_primary_latency_percentile():
+    tracker = LatencyTracker()
+    model = HedgedChatModel(
+        None, None, "question", ("primary", "secondary"), tracker,
+        hedge_percentile=0.9, hedge_min_samples=10, hedge_initial_ms=2000,
+    )
+    for latency_ms in range(100, 1000, 100):
+        tracker.record("primary", "question", latency_ms)
+    assert model.hedge_delay_ms() == 2000  # too few samples yet
+
+    tracker.record("primary", "question", 1000)
+
+    assert model.hedge_delay_ms() == 1000
+
+
+async def test_deadline_cancels_the_call(monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_LATENCY_MS", "500")
+    monkeypatch.setenv("LLM_DEADLINE_MS_QUESTION", "50")
+
+    with pytest.raises(LLMDeadlineExceeded):
+        await get_model("question").ainvoke(MESSAGES)
+
+    assert metrics.get("llm_deadline.question.exceeded") == 1
+    assert _in_flight("fake") == 0
+
+
+@pytest.fixture
+def question_deadline(monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_LATENCY_MS", "300")
+    monkeypatch.setenv("LLM_DEADLINE_MS_QUESTION", "50")
+
+
+async def test_deadline_is_a_504(question_deadline, client):
+    response = await client.post(
+        "/api/v1/interview/start",
+        json={"topic": "Python basics", "thread_id": "t1", "use_materials": False},
+    )
+
+    assert response.status_code == 504
+    assert "question model" in response.json()["detail"]
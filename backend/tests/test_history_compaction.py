@@ -0,0 +1,119 @@
+"""History compaction: old turns fold into a bounded summary."""
+from typing import Annotated, TypedDict
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langgraph.graph import END, START, StateGraph
+
+from app.agents.state import merge_messages
+from app.agents.supervisor import compact_history
+from app.api import deps
+
+
+pytestmark = pytest.mark.anyio
+
+
+def _turn(n: int, score: int) -> list:
+    return [
+        AIMessage(content=f"[Question] Question {n}?"),
+        HumanMessage(content=f"Answer {n}"),
+        AIMessage(content=f"[Assessment] SCORE: {score}\nFEEDBACK: ok"),
+    ]
+
+
+def _history(turns: int) -> list:
+    messages = [SystemMessage(content="[Context] Python basics")]
+    for n in range(1, turns + 1):
+        messages += _turn(n, 50 + n)
+    return messages
+
+
+def test_nothing_to_fold():
+    assert compact_history({"messages": _history(2)}, keep_turns=2) == {}
+
+
+def test_folds_old_turns_and_keeps_the_preamble():
+    messages = _history(4)
+
+    update = compact_history({"messages": messages}, keep_turns=2)
+
+    kept = update["messages"]["replace"]
+    assert [m.content for m in kept] == [m.content for m in messages[:1] + messages[7:]]
+    assert update["history_summary"] == {
+        "turns_folded": 2,
+        "lines": ["Q: Question 1? | score: 51", "Q: Question 2? | score: 52"],
+    }
+
+
+def test_replace_update_overwrites_the_history():
+    history = _history(4)
+    update = compact_history({"messages": history}, keep_turns=1)
+
+    assert merge_messages(history, update["messages"]) == update["messages"]["replace"]
+    # Ordinary updates still append
+    extra = [AIMessage(content="[Question] Question 5?")]
+    assert merge_messages(history, extra) == history + extra
+
+
+def test_summary_accumulates_over_repeated_compaction():
+    state = {"messages": _history(3)}
+    for n in range(4, 30):
+        state["messages"] = merge_messages(state["messages"], _turn(n, n))
+        update = compact_history(state, keep_turns=2)
+        state["messages"] = merge_messages(state["messages"], update["messages"])
+        state["history_summary"] = update["history_summary"]
+
+    summary = state["history_summary"]
+    assert summary["turns_folded"] == 27
+    # Only the newest lines are kept, in order
+    assert len(summary["lines"]) == 20
+    assert summary["lines"][0] == "Q: Question 8? | score: 8"
+    assert summary["lines"][-1] == "Q: Question 27? | score: 27"
+    questions = [m.content for m in state["messages"] if m.content.startswith("[Question]")]
+    assert questions == ["[Question] Question 28?", "[Question] Question 29?"]
+
+
+class _State(TypedDict):
+    messages: Annotated[list, merge_messages]
+    history_summary: dict
+
+
+async def test_graph_applies_the_replace_reducer():
+    builder = StateGraph(_State)
+    builder.add_node("compact", lambda state: compact_history(state, keep_turns=1))
+    builder.add_edge(START, "compact")
+    builder.add_edge("compact", END)
+
+    result = await builder.compile().ainvoke({"messages": _history(3), "history_summary": {}})
+
+    assert [m.content for m in result["messages"]][1:] == [m.content for m in _turn(3, 53)]
+    assert result["history_summary"]["turns_folded"] == 2
+
+
+@pytest.fixture
+def short_history(monkeypatch):
+    monkeypatch.setenv("HISTORY_KEEP_TURNS", "1")
+    monkeypatch.setenv("ASSESSMENT_KEEP_RECENT", "2")
+
+
+async def test_assessments_survive_compaction(short_history, client, start_session):
+    await start_session("t1")
+    for _ in range(4):
+        response = await client.post(
+            "/api/v1/interview/answer",
+            json={"thread_id": "t1", "transcript": "Lists are mutable, tuples are not."},
+        )
+        assert response.status_code == 200, response.text
+
+    state = (await deps.get_session_store().aget("t1"))["graph_state"]
+    assert sum(m.content.startswith("[Question]") for m in state["messages"]) == 1
+    assert state["history_summary"]["turns_folded"] == 4
+    assert len(state["recent_assessments"]) == 2
+    totals = state["assessment_totals"]
+    assert totals["count"] == 4
+    assert totals["strengths"] == {"Clear explanation": 4, "Good structure": 4}
+
+    report = (await client.get("/api/v1/interview/assessment", params={"thread_id": "t1"})).json()
+    assert report["overall_score"] == totals["score_total"] // 4
+    assert len(report["assessments"]) == 2
+    assert set(report["strengths"]) == {"Clear explanation", "Good structure"}
@@ -0,0 +1,82 @@
+"""Batched, parallel embedding and ordered insertion (index_document)."""
+import time
+
+import pytest
+
+from app.services.vectorstore import VectorStoreService
+from conftest import hash_embed
+
+
+pytestmark = pytest.mark.anyio
+
+
+def make_service(tmp_path, **kwargs) -> VectorStoreService:
+    return VectorStoreService(persist_dir=str(tmp_path / "chroma"), **kwargs)
+
+
+def document(sentences: int) -> str:
+    return " ".join(f"Sentence {i} explains how Cloud Run scales to zero." for i in range(sentences))
+
+
+def slow_embedding(delay: float):
+    """Embedding function that takes `delay` seconds per batch (releasing the GIL)."""
+    def embed(texts):
+        time.sleep(delay)
+        return hash_embed(texts)
+    return embed
+
+
+async def test_batches_are_written_in_order(tmp_path):
+    service = make_service(tmp_path, index_batch_size=4, embed_workers=3)
+    text = document(200)
+    progress = []
+
+    count = await service.index_document(
+        "doc", text, {"filename": "doc.txt"}, chunk_size=200, chunk_overlap=40, progress=progress.append
+    )
+
+    assert count > 40  # many batches of 4
+    assert progress == sorted(progress) and progress[-1] == count
+    stored = service.collection.get(where={"document_id": "doc"})
+    assert sorted(stored["ids"]) == sorted(f"doc_{i}" for i in range(count))
+    reassembled = await service.get_document_text("doc")
+    assert reassembled.split() == text.split()
+    documents, _ = await service.list_documents()
+    assert [(d["id"], d["chunk_count"]) for d in documents] == [("doc", count)]
+    service.close()
+
+
+async def test_embedding_batches_run_in_parallel(tmp_path):
+    text = document(120)
+    elapsed = {}
+    for workers in (1, 4):
+        service = make_service(tmp_path / str(workers), index_batch_size=4, embed_workers=workers)
+        service.embedding_function = slow_embedding(0.05)
+        started = time.perf_counter()
+        count = await service.index_document("doc", text, chunk_size=200, chunk_overlap=40)
+        elapsed[workers] = time.perf_counter() - started
+        service.close()
+
+    batches = -(-count // 4)
+    assert elapsed[1] >= batches * 0.05
+    assert elapsed[4] < elapsed[1] / 2, elapsed
+
+
+async def test_failed_embedding_leaves_nothing_behind(tmp_path):
+    service = make_service(tmp_path, index_batch_size=4, embed_workers=2)
+    calls = 0
+
+    def flaky(texts):
+        nonlocal calls
+        calls += 1
+        if calls == 5:
+            raise RuntimeError("embedding backend down")
+        return hash_embed(texts)
+
+    service.embedding_function = flaky
+    with pytest.raises(RuntimeError):
+        await service.index_document("doc", document(200), chunk_size=200, chunk_overlap=40)
+
+    assert service.collection.get(where={"document_id": "doc"})["ids"] == []
+    assert service.registry.get("doc") is None
+    service.close()
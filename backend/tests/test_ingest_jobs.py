@@ -0,0 +1,122 @@
+"""Background ingestion jobs (POST /materials/upload?background=true)."""
+import asyncio
+import time
+
+import pytest
+
+from app.api import deps
+from app.services.metrics import metrics
+from conftest import hash_embed
+
+
+pytestmark = pytest.mark.anyio
+
+UPLOAD = "/api/v1/materials/upload"
+
+
+def _notes(n: int = 1, sentences: int = 50) -> bytes:
+    """A distinct text document (uploads with equal content are deduplicated)."""
+    return " ".join(
+        f"Note {n}, sentence {i}: Cloud Run scales container instances to zero." for i in range(sentences)
+    ).encode()
+
+
+async def _upload_in_background(client, content: bytes, filename: str = "notes.txt"):
+    return await client.post(
+        UPLOAD, params={"background": "true"}, files={"file": (filename, content, "text/plain")}
+    )
+
+
+async def _wait_for(client, job_id: str, *stages: str) -> dict:
+    for _ in range(500):
+        job = (await client.get(f"/api/v1/materials/jobs/{job_id}")).json()
+        if job["stage"] in stages:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job stayed {job['stage']}")
+
+
+async def test_background_upload_returns_a_job_to_poll(client):
+    response = await _upload_in_background(client, _notes())
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["stage"] == "queued"
+    assert response.headers["location"].endswith(f"/api/v1/materials/jobs/{job['job_id']}")
+
+    done = await _wait_for(client, job["job_id"], "completed", "failed")
+    assert done["stage"] == "completed"
+    assert done["progress"] == 1.0
+    assert done["chunks_indexed"] > 0
+    materials = (await client.get("/api/v1/materials/list")).json()["materials"]
+    assert [(m["id"], m["chunk_count"]) for m in materials] == [(job["material_id"], done["chunks_indexed"])]
+    assert metrics.get("ingest_jobs.completed") == 1
+
+
+async def test_unknown_jobs_are_404(client):
+    assert (await client.get("/api/v1/materials/jobs/nope")).status_code == 404
+    assert (await client.delete("/api/v1/materials/jobs/nope")).status_code == 404
+
+
+@pytest.fixture
+def one_slot(monkeypatch):
+    monkeypatch.setenv("INGEST_WORKERS", "1")
+    monkeypatch.setenv("INGEST_MAX_QUEUED", "1")
+
+
+async def test_queued_jobs_can_be_cancelled(one_slot, client):
+    jobs = deps.get_ingestion_queue()
+    async with jobs.slots:  # keeps the job waiting for a slot
+        job = (await _upload_in_background(client, _notes())).json()
+
+        response = await client.delete(f"/api/v1/materials/jobs/{job['job_id']}")
+        assert response.status_code == 200
+        await _wait_for(client, job["job_id"], "cancelled")
+
+    # Already finished
+    assert (await client.delete(f"/api/v1/materials/jobs/{job['job_id']}")).status_code == 409
+    assert (await client.get("/api/v1/materials/list")).json()["count"] == 0
+
+
+async def test_full_queue_is_429(one_slot, client):
+    jobs = deps.get_ingestion_queue()
+    async with jobs.slots:
+        assert (await _upload_in_background(client, _notes(1))).status_code == 202
+
+        response = await _upload_in_background(client, _notes(2))
+
+        assert response.status_code == 429
+        assert "queued" in response.json()["detail"]
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    monkeypatch.setenv("INDEX_BATCH_SIZE", "4")
+
+
+async def test_cancelled_ingestion_leaves_nothing_behind(small_batches, client):
+    service = deps.get_vectorstore_service()
+
+    def slow_embed(texts):
+        time.sleep(0.05)
+        return hash_embed(texts)
+    service.embedding_function = slow_embed
+
+    job = (await _upload_in_background(client, _notes(sentences=2000))).json()
+    running = await _wait_for(client, job["job_id"], "indexing", "completed")
+    assert running["stage"] == "indexing"
+    while (await client.get(f"/api/v1/materials/jobs/{job['job_id']}")).json()["chunks_indexed"] == 0:
+        await asyncio.sleep(0.01)
+
+    await client.delete(f"/api/v1/materials/jobs/{job['job_id']}")
+    cancelled = await _wait_for(client, job["job_id"], "cancelled", "completed")
+
+    assert cancelled["stage"] == "cancelled"
+    material_id = job["material_id"]
+    assert service.collection.get(where={"document_id": material_id})["ids"] == []
+    assert service.registry.get(material_id) is None
+    with service.lexical._lock:
+        lexical_chunks = service.lexical.conn.execute(
+            "SELECT COUNT(*) FROM lex_chunks WHERE document_id = ?", (material_id,)
+        ).fetchone()[0]
+    assert lexical_chunks == 0
@@ -0,0 +1,211 @@
+"""LLM response cache (LLM_CACHE_ENABLED): keys, tiers, eviction and bypass."""
+import json
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from app.agents import supervisor
+from app.agents.fake_model import FakeChatModel
+from app.agents.supervisor import AssessmentOutput
+from app.services import llm_cache
+from app.services.llm_cache import CachedChatModel, LLMResponseCache, bypass_llm_cache, make_cache_key
+from app.services.metrics import metrics
+
+
+pytestmark = pytest.mark.anyio
+
+MESSAGES = [SystemMessage(content="You are an interviewer."), HumanMessage(content="Ask about Python.")]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controls the time the cache sees; advance with clock[0] += seconds."""
+    now = [1_000_000.0]
+
+    class Clock:
+        @staticmethod
+        def time():
+            return now[0]
+    monkeypatch.setattr(llm_cache, "time", Clock)
+    return now
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    caches = []
+
+    def make(**kwargs) -> LLMResponseCache:
+        cache = LLMResponseCache(db_path=str(tmp_path / "llm_cache.sqlite3"), **kwargs)
+        caches.append(cache)
+        return cache
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def _rows(cache: LLMResponseCache) -> list[str]:
+    cache.flush()
+    with cache._db_lock:
+        return [key for (key,) in cache._conn.execute("SELECT key FROM llm_cache ORDER BY created_at")]
+
+
+def test_key_hashes_model_role_and_messages():
+    key = make_cache_key("gpt-4o-mini", "question", MESSAGES)
+
+    assert len(key) == 64 and int(key, 16) >= 0
+    assert key == make_cache_key("gpt-4o-mini", "question", list(MESSAGES))
+    assert key != make_cache_key("gpt-4o", "question", MESSAGES)
+    assert key != make_cache_key("gpt-4o-mini", "assessment", MESSAGES)
+    assert key != make_cache_key("gpt-4o-mini", "question", MESSAGES[:1])
+    # The message type is part of the key, not just its text
+    assert key != make_cache_key(
+        "gpt-4o-mini", "question", [MESSAGES[0], AIMessage(content="Ask about Python.")]
+    )
+
+
+async def test_memory_tier_is_an_lru():
+    cache = LLMResponseCache(memory_entries=2)
+    cache.set("a", "question", "A")
+    cache.set("b", "question", "B")
+    assert await cache.aget("a") == "A"  # now most recent
+    cache.set("c", "question", "C")
+
+    assert await cache.aget("b") is None
+    assert await cache.aget("a") == "A"
+    assert await cache.aget("c") == "C"
+
+
+async def test_disk_hits_are_promoted_to_memory(disk_cache):
+    cache = disk_cache(memory_entries=1)
+    cache.set("a", "question", "A")
+    cache.set("b", "question", "B")  # pushes "a" out of memory
+    cache.flush()
+    assert "a" not in cache._memory
+
+    assert await cache.aget("a") == "A"
+    assert "a" in cache._memory
+    # Another worker sharing the file sees both
+    assert disk_cache().get("b") == "B"
+
+
+async def test_entries_expire_after_the_ttl(disk_cache, clock):
+    cache = disk_cache(ttl_seconds=60, evict_every=1)
+    cache.set("old", "question", "A")
+    clock[0] += 59
+    assert await cache.aget("old") == "A"
+
+    clock[0] += 2
+    assert await cache.aget("old") is None
+    assert "old" not in cache._memory
+    assert disk_cache(ttl_seconds=60).get("old") is None
+
+    # The next write's eviction pass deletes the expired row
+    cache.set("new", "question", "B")
+    assert _rows(cache) == ["new"]
+
+
+async def test_disk_tier_is_trimmed_when_full(disk_cache, clock):
+    cache = disk_cache(memory_entries=1, disk_entries=10)
+    for i in range(11):
+        cache.set(f"k{i}", "question", str(i))
+        clock[0] += 1
+
+    # Trimmed to 90%, oldest first
+    assert _rows(cache) == [f"k{i}" for i in range(2, 11)]
+    assert cache._disk_count == 9
+
+
+def test_clear_empties_both_tiers(disk_cache):
+    cache = disk_cache()
+    cache.set("a", "question", "A")
+
+    cache.clear()
+
+    assert cache.get("a") is None
+    assert _rows(cache) == []
+
+
+@pytest.fixture
+def cached_model():
+    model = FakeChatModel(role="assessment")
+    return CachedChatModel(model, LLMResponseCache(), "fake-assessment", "assessment")
+
+
+async def test_hits_and_misses_are_counted_per_role(cached_model):
+    first = await cached_model.ainvoke(MESSAGES)
+    second = await cached_model.ainvoke(MESSAGES)
+    streamed = [chunk.content async for chunk in cached_model.astream(MESSAGES)]
+
+    assert second.content == first.content
+    assert streamed == [first.content]
+    assert metrics.get("llm_cache.assessment.miss") == 1
+    assert metrics.get("llm_cache.assessment.hit") == 2
+    assert metrics.get("llm_cache.question.hit") == 0
+
+
+async def test_bypass_skips_the_lookup_but_refreshes_the_entry(cached_model):
+    await cached_model.ainvoke(MESSAGES)
+    cached_model.model.response = "SCORE: 90"
+
+    token = bypass_llm_cache.set(True)
+    try:
+        fresh = await cached_model.ainvoke(MESSAGES)
+    finally:
+        bypass_llm_cache.reset(token)
+
+    assert fresh.content == "SCORE: 90"
+    assert metrics.get("llm_cache.assessment.bypass") == 1
+    assert metrics.get("llm_cache.assessment.hit") == 0
+    assert (await cached_model.ainvoke(MESSAGES)).content == "SCORE: 90"
+
+
+async def test_structured_output_is_cached(cached_model):
+    runnable = cached_model.with_structured_output(AssessmentOutput, method="json_schema", include_raw=True)
+
+    first = await runnable.ainvoke(MESSAGES)
+    cached_model.model.structured_outputs.append("must not be called")
+    second = await runnable.ainvoke(MESSAGES)
+
+    assert second["parsed"] == first["parsed"]
+    assert second["parsing_error"] is None
+    assert json.loads(second["raw"].content)["score"] == 80
+    assert metrics.get("llm_cache.assessment.hit") == 1
+    # Kept apart from the text response to the same prompt
+    assert (await cached_model.ainvoke(MESSAGES)).content.startswith("SCORE: 80")
+
+
+async def test_invalid_structured_output_is_not_cached(cached_model):
+    runnable = cached_model.with_structured_output(AssessmentOutput, include_raw=True)
+    cached_model.model.structured_outputs.append(json.dumps({"score": 150}))
+
+    assert (await runnable.ainvoke(MESSAGES))["parsed"] is None
+    assert (await runnable.ainvoke(MESSAGES))["parsed"].score == 80
+    assert metrics.get("llm_cache.assessment.miss") == 2
+
+
+@pytest.fixture
+def cache_enabled(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+
+
+async def test_header_bypasses_the_cache(cache_enabled, client, start_session):
+    await start_session("t1")
+    misses = metrics.get("llm_cache.question.miss")
+    await start_session("t2")
+    assert metrics.get("llm_cache.question.hit") >= 1
+    assert metrics.get("llm_cache.question.miss") == misses
+
+    hits = metrics.get("llm_cache.question.hit")
+    response = await client.post(
+        "/api/v1/interview/start",
+        json={"topic": "Python basics", "thread_id": "t3", "use_materials": False},
+        headers={"X-Bypass-LLM-Cache": "true"},
+    )
+
+    assert response.status_code == 200
+    assert metrics.get("llm_cache.question.bypass") >= 1
+    assert metrics.get("llm_cache.question.hit") == hits
+
+
+async def test_pooled_models_are_cached_when_enabled(cache_enabled):
+    assert isinstance(supervisor.get_model("question"), CachedChatModel)
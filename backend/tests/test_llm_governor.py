@@ -0,0 +1,213 @@
+"""Concurrency limits, rate budgets and singleflight coalescing (LLMGovernor)."""
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.agents.supervisor import get_model
+from app.services.llm_governor import LLMGovernor, TokenBucket
+from app.services.metrics import metrics
+
+
+pytestmark = pytest.mark.anyio
+
+
+def _gauge(name: str) -> float:
+    return metrics.snapshot()["gauges"].get(name, 0)
+
+
+class Upstream:
+    """Fake upstream call that blocks until released and tracks concurrency."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+
+    def __call__(self, result="ok"):
+        async def call():
+            self.calls += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            try:
+                await self.release.wait()
+                return result
+            finally:
+                self.running -= 1
+        return call
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_provider_limit_queues_excess_calls():
+    governor = LLMGovernor(max_concurrent=2)
+    upstream = Upstream()
+
+    tasks = [asyncio.create_task(governor.call("p", "question", [], upstream())) for _ in range(5)]
+    await _settle()
+
+    assert upstream.running == 2
+    assert _gauge("llm_governor.p.question.in_flight") == 2
+    assert _gauge("llm_governor.p.question.queued") == 3
+    upstream.release.set()
+    assert await asyncio.gather(*tasks) == ["ok"] * 5
+    assert upstream.peak == 2
+    assert _gauge("llm_governor.p.question.in_flight") == 0
+    assert _gauge("llm_governor.p.question.queued") == 0
+    assert _gauge("llm_governor.p.question.queued_peak") == 3
+    assert metrics.get("llm_governor.p.question.calls") == 5
+
+
+async def test_role_limit_does_not_hold_back_other_roles():
+    governor = LLMGovernor(max_concurrent=10, role_concurrency={"assessment": 1, "question": 0})
+    assessments, questions = Upstream(), Upstream()
+
+    tasks = [asyncio.create_task(governor.call("p", "assessment", [], assessments())) for _ in range(3)]
+    tasks += [asyncio.create_task(governor.call("p", "question", [], questions())) for _ in range(3)]
+    await _settle()
+
+    assert assessments.running == 1
+    assert questions.running == 3
+    assert _gauge("llm_governor.p.assessment.queued") == 2
+    assessments.release.set()
+    questions.release.set()
+    await asyncio.gather(*tasks)
+    assert assessments.peak == 1
+
+
+async def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(per_minute=600)  # 10 per second
+    await bucket.acquire(600)
+
+    started = time.perf_counter()
+    await bucket.acquire(2)
+
+    assert 0.15 <= time.perf_counter() - started < 0.5
+
+
+async def test_unlimited_bucket_never_waits():
+    bucket = TokenBucket(per_minute=0)
+    started = time.perf_counter()
+    for _ in range(1000):
+        await bucket.acquire(10**6)
+    assert time.perf_counter() - started < 0.1
+
+
+async def test_tpm_budget_is_corrected_from_reported_usage():
+    governor = LLMGovernor(tpm=6000)  # 100 per second, bucket starts full
+
+    def reply(total_tokens: int):
+        async def call():
+            return AIMessage(content="ok", usage_metadata={
+                "input_tokens": total_tokens - 10, "output_tokens": 10, "total_tokens": total_tokens,
+            })
+        return call
+
+    # ~6000 tokens charged up front, 5900 refunded once usage is reported
+    await governor.call("p", "question", [HumanMessage(content="x" * 24000)], reply(100))
+    started = time.perf_counter()
+    await governor.call("p", "question", [HumanMessage(content="x" * 23600)], reply(5920))
+    assert time.perf_counter() - started < 0.1
+
+    # That call used 20 tokens more than estimated: the bucket is in debt
+    started = time.perf_counter()
+    await governor.call("p", "question", [HumanMessage(content="x" * 4)], reply(1))
+    assert 0.15 <= time.perf_counter() - started < 1
+
+
+async def test_rpm_budget_spaces_requests():
+    governor = LLMGovernor(rpm=60)  # one per second, bucket starts full
+
+    async def call():
+        return "ok"
+
+    await asyncio.gather(*(governor.call("p", "question", [], call) for _ in range(60)))
+    started = time.perf_counter()
+    await governor.call("p", "question", [], call)
+
+    assert time.perf_counter() - started >= 0.5
+
+
+async def test_identical_calls_share_one_upstream_call():
+    governor = LLMGovernor()
+    upstream = Upstream()
+
+    tasks = [asyncio.create_task(governor.call("p", "context", [], upstream(), "key")) for _ in range(3)]
+    await _settle()
+    upstream.release.set()
+
+    assert await asyncio.gather(*tasks) == ["ok"] * 3
+    assert upstream.calls == 1
+    assert metrics.get("llm_governor.p.context.calls") == 1
+    assert metrics.get("llm_governor.p.context.coalesced") == 2
+
+
+async def test_coalescing_can_be_turned_off():
+    governor = LLMGovernor(coalesce=False)
+    upstream = Upstream()
+    upstream.release.set()
+
+    await asyncio.gather(*(governor.call("p", "context", [], upstream(), "key") for _ in range(3)))
+
+    assert upstream.calls == 3
+
+
+async def test_a_cancelled_waiter_leaves_the_flight_to_the_others():
+    governor = LLMGovernor()
+    upstream = Upstream()
+    first = asyncio.create_task(governor.call("p", "context", [], upstream(), "key"))
+    second = asyncio.create_task(governor.call("p", "context", [], upstream(), "key"))
+    await _settle()
+
+    first.cancel()
+    await asyncio.gather(first, return_exceptions=True)
+    assert upstream.running == 1
+    upstream.release.set()
+
+    assert await second == "ok"
+    assert first.cancelled()
+    assert upstream.calls == 1
+
+
+async def test_the_flight_is_cancelled_when_every_waiter_leaves():
+    governor = LLMGovernor()
+    upstream = Upstream()
+    running_when_left = []
+
+    async def waiter():
+        try:
+            return await governor.call("p", "context", [], upstream(), "key")
+        finally:
+            running_when_left.append(upstream.running)
+
+    waiters = [asyncio.create_task(waiter()) for _ in range(2)]
+    await _settle()
+    for task in waiters:
+        task.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+
+    # The last waiter to leave only returned once the upstream call had
+    # unwound and given back its slot
+    assert running_when_left[-1] == 0
+    assert _gauge("llm_governor.p.context.in_flight") == 0
+    # A new identical request starts a fresh flight
+    upstream.release.set()
+    assert await governor.call("p", "context", [], upstream(), "key") == "ok"
+    assert upstream.calls == 2
+
+
+async def test_pooled_models_coalesce_identical_requests(monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_LATENCY_MS", "100")
+    model = get_model("context")
+    messages = [HumanMessage(content="Outline Cloud Run.")]
+
+    results = await asyncio.gather(*(model.ainvoke(messages) for _ in range(4)))
+
+    assert len({result.content for result in results}) == 1
+    assert metrics.get("llm_governor.fake.context.calls") == 1
+    assert metrics.get("llm_governor.fake.context.coalesced") == 3
@@ -0,0 +1,129 @@
+"""Persistent material registry: two-phase status, keyset pagination, stale cleanup."""
+import time
+
+import pytest
+
+from app.api import deps
+from app.services.material_registry import MaterialRegistry, decode_cursor
+from app.services.vectorstore import STALE_INDEXING_SECONDS, VectorStoreService
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = MaterialRegistry(str(tmp_path / "registry.sqlite3"))
+    yield registry
+    registry.close()
+
+
+def test_materials_are_hidden_while_indexing(registry):
+    registry.begin("m1", {"filename": "notes.txt", "type": ".txt", "content_hash": "abc"})
+
+    assert registry.get("m1") is None
+    assert registry.find_by_hash("abc") is None
+    assert registry.list_page() == ([], None)
+    generation = registry.generation()
+
+    registry.complete("m1", 12)
+
+    material = registry.get("m1")
+    assert (material["filename"], material["chunk_count"]) == ("notes.txt", 12)
+    assert registry.find_by_hash("abc")["id"] == "m1"
+    assert registry.generation() == generation + 1
+
+
+def test_pages_follow_the_cursor(registry):
+    registry.insert_ready([
+        {"id": f"m{i}", "chunk_count": 1, "created_at": 1000.0 + i // 2} for i in range(7)
+    ])
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = registry.list_page(limit=3, cursor=cursor)
+        pages.append([m["id"] for m in page])
+        if cursor is None:
+            break
+
+    # Newest first; ties on created_at are broken by id
+    assert pages == [["m6", "m5", "m4"], ["m3", "m2", "m1"], ["m0"]]
+
+
+def test_cursor_is_stable_across_inserts(registry):
+    registry.insert_ready([{"id": f"m{i}", "chunk_count": 1, "created_at": 1000.0 + i} for i in range(4)])
+    first, cursor = registry.list_page(limit=2)
+
+    registry.insert_ready([{"id": "newer", "chunk_count": 1, "created_at": 2000.0}])
+    second, _ = registry.list_page(limit=2, cursor=cursor)
+
+    assert [m["id"] for m in first + second] == ["m3", "m2", "m1", "m0"]
+
+
+def test_malformed_cursors_are_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("no-separator")
+    with pytest.raises(ValueError):
+        decode_cursor("yesterday|m1")
+
+
+def test_stale_ids_are_old_indexing_rows(registry):
+    registry.begin("crashed")
+    registry.begin("running")
+    registry.begin("done")
+    registry.complete("done", 3)
+    with registry._lock:
+        registry.conn.execute(
+            "UPDATE materials SET updated_at = ? WHERE material_id IN ('crashed', 'done')",
+            (time.time() - 3600,),
+        )
+        registry.conn.commit()
+
+    assert registry.stale_ids(600) == ["crashed"]
+
+
+async def test_crashed_ingestions_are_removed_on_first_use(tmp_path):
+    persist_dir = str(tmp_path / "chroma")
+    service = VectorStoreService(persist_dir=persist_dir)
+    await service.index_document("kept", "Artifact Registry stores container images.")
+    # A worker that died after writing a batch
+    service.registry.begin("crashed")
+    embeddings, hashes = service._embed_batch(["Cloud Run scales to zero."])
+    service._add_batch("crashed", ["Cloud Run scales to zero."], 0, None, embeddings, hashes)
+    with service.registry._lock:
+        service.registry.conn.execute(
+            "UPDATE materials SET updated_at = ? WHERE material_id = 'crashed'",
+            (time.time() - STALE_INDEXING_SECONDS - 1,),
+        )
+        service.registry.conn.commit()
+    service.close()
+
+    reopened = VectorStoreService(persist_dir=persist_dir)
+    try:
+        documents, _ = await reopened.list_documents()
+        assert [d["id"] for d in documents] == ["kept"]
+        assert reopened.collection.get(where={"document_id": "crashed"})["ids"] == []
+        assert [c.document_id for c in await reopened.retrieve("Cloud Run scales", mode="lexical")] == ["kept"]
+        assert reopened.registry.stale_ids(0) == []
+    finally:
+        reopened.close()
+
+
+async def test_list_route_pages_with_cursors(client):
+    service = deps.get_vectorstore_service()
+    for i in range(5):
+        await service.index_document(f"m{i}", f"Study notes number {i} about Cloud Run.", {"filename": f"{i}.txt"})
+
+    ids, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = (await client.get("/api/v1/materials/list", params=params)).json()
+        assert page["count"] == len(page["materials"]) <= 2
+        ids += [m["id"] for m in page["materials"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert ids == ["m4", "m3", "m2", "m1", "m0"]
+    bad = await client.get("/api/v1/materials/list", params={"cursor": "garbage"})
+    assert bad.status_code == 400
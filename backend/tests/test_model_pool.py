@@ -0,0 +1,48 @@
+"""Pooled, reused chat-model clients (get_model)."""
+import pytest
+
+from app.agents import supervisor
+from app.agents.supervisor import close_model_clients, get_model
+
+
+def test_get_model_reuses_one_client_per_role():
+    question = get_model("question")
+
+    assert get_model("question") is question
+    assert get_model("assessment") is not question
+    assert len([key for key in supervisor._model_registry if key[0] != "role"]) == 2
+
+
+def test_openai_clients_share_one_connection_pool(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    supervisor.get_settings.cache_clear()
+
+    models = [get_model(role).model for role in ("context", "question", "assessment")]
+
+    assert len({id(model.http_async_client) for model in models}) == 1
+    assert len({id(model.http_client) for model in models}) == 1
+    assert models[0].http_async_client is supervisor._http_clients["async"]
+
+
+@pytest.mark.anyio
+async def test_close_model_clients_drops_the_pool(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    supervisor.get_settings.cache_clear()
+    pool = get_model("question").model.http_async_client
+
+    await close_model_clients()
+
+    assert pool.is_closed
+    assert not supervisor._model_registry
+    assert not supervisor._http_clients
+
+
+def test_fake_providers_need_the_flag(monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_ENABLED", "false")
+    supervisor.get_settings.cache_clear()
+
+    assert "fake" not in supervisor.MODEL_MAP
+    with pytest.raises(ValueError, match="Unknown model provider: 'fake'"):
+        get_model("question")
@@ -0,0 +1,88 @@
+"""Process-pool PDF text extraction (aiter_pdf_text)."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pypdf import PageObject, PdfWriter
+from pypdf.generic import DictionaryObject, NameObject, StreamObject
+
+from app.services.vectorstore import VectorStoreService
+
+
+pytestmark = pytest.mark.anyio
+
+
+def write_pdf(path, pages: int) -> str:
+    """A PDF whose page i reads "Page i line j ..." on a few lines."""
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    for i in range(pages):
+        page = writer.add_blank_page(612, 792)
+        content = StreamObject()
+        content.set_data("".join(
+            f"BT /F1 9 Tf 20 {780 - j * 11} Td (Page {i} line {j} explains scaling.) Tj ET\n"
+            for j in range(5)
+        ).encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font}),
+        })
+    with open(path, "wb") as stream:
+        writer.write(stream)
+    return str(path)
+
+
+async def test_pages_are_yielded_in_order(tmp_path):
+    path = write_pdf(tmp_path / "guide.pdf", 23)
+    service = VectorStoreService(persist_dir=str(tmp_path / "chroma"), pdf_workers=2, pdf_pages_per_task=3)
+    progress = []
+
+    text = "".join([
+        piece async for piece in service.aiter_pdf_text(path, progress=lambda done, total: progress.append((done, total)))
+    ])
+    service.close()
+
+    pages = text.split("\n\n")
+    assert len(pages) == 23
+    assert all(page.startswith(f"Page {i} line 0") for i, page in enumerate(pages))
+    assert progress == [(done, 23) for done in range(1, 24)]
+
+
+async def test_failed_pages_are_reported_and_skipped(tmp_path, monkeypatch):
+    path = write_pdf(tmp_path / "guide.pdf", 10)
+    extract_text = PageObject.extract_text
+
+    def flaky_extract(self, *args, **kwargs):
+        text = extract_text(self, *args, **kwargs)
+        if text.startswith(("Page 3 ", "Page 7 ")):
+            raise ValueError("bad content stream")
+        return text
+
+    # Patching only reaches this process, so extract in threads instead
+    monkeypatch.setattr(PageObject, "extract_text", flaky_extract)
+    service = VectorStoreService(persist_dir=str(tmp_path / "chroma"), pdf_pages_per_task=4)
+    service._pdf_pool = ThreadPoolExecutor(2)
+    failed_pages = []
+
+    text = "".join([piece async for piece in service.aiter_pdf_text(path, failed_pages)])
+    service.close()
+
+    assert failed_pages == [4, 8]
+    pages = text.split("\n\n")
+    assert len(pages) == 10
+    assert pages[3] == pages[7] == ""
+    assert pages[4].startswith("Page 4 line 0")
+
+
+async def test_unreadable_file_is_a_value_error(tmp_path):
+    path = tmp_path / "notes.pdf"
+    path.write_bytes(b"not a pdf")
+    service = VectorStoreService(persist_dir=str(tmp_path / "chroma"), pdf_workers=1)
+
+    with pytest.raises(ValueError, match="Error processing PDF"):
+        async for _ in service.aiter_pdf_text(str(path)):
+            pass
+    service.close()
@@ -0,0 +1,94 @@
+"""Retrieval query cache: generation-tagged LRU of retrieve() results."""
+import pytest
+
+from app.services.metrics import metrics
+from app.services.vectorstore import VectorStoreService
+
+
+pytestmark = pytest.mark.anyio
+
+GUIDE = " ".join([
+    "Cloud Run scales container instances down to zero when there is no traffic.",
+    "Container images are pushed to Artifact Registry before deployment.",
+    "Concurrency controls how many requests one instance serves at a time.",
+] * 3)
+
+
+@pytest.fixture
+async def service(tmp_path):
+    service = VectorStoreService(persist_dir=str(tmp_path / "chroma"), query_cache_size=2)
+    await service.index_document("guide", GUIDE, chunk_size=120, chunk_overlap=20)
+    yield service
+    service.close()
+
+
+def _counts() -> tuple[float, float]:
+    return metrics.get("query_cache.hit"), metrics.get("query_cache.miss")
+
+
+async def test_repeated_query_is_a_hit(service, monkeypatch):
+    first = await service.retrieve("Artifact Registry", n_results=2)
+
+    def no_search(*args):
+        raise AssertionError("a cached query must not search")
+    monkeypatch.setattr(service, "_search", no_search)
+    second = await service.retrieve("Artifact Registry", n_results=2)
+
+    assert second == first
+    assert _counts() == (1, 1)
+    # Callers get their own list
+    second.clear()
+    assert await service.retrieve("Artifact Registry", n_results=2) == first
+
+
+async def test_key_covers_every_parameter(service):
+    await service.retrieve("Artifact Registry", n_results=2)
+    await service.retrieve("Artifact Registry", n_results=3)
+    await service.retrieve("Artifact Registry", n_results=2, mode="lexical")
+    await service.retrieve("Artifact Registry", n_results=2, document_id="guide")
+
+    assert _counts() == (0, 4)
+
+
+async def test_reindexing_invalidates_cached_results(service):
+    await service.retrieve("Artifact Registry", n_results=2, mode="lexical")
+
+    await service.index_document("other", "Artifact Registry stores Helm charts and Python packages.")
+    chunks = await service.retrieve("Artifact Registry", n_results=2, mode="lexical")
+
+    assert _counts() == (0, 2)
+    assert "other" in {chunk.document_id for chunk in chunks}
+
+
+async def test_deleting_invalidates_cached_results(service):
+    await service.retrieve("Artifact Registry", n_results=2, mode="lexical")
+
+    await service.delete_document("guide")
+
+    assert await service.retrieve("Artifact Registry", n_results=2, mode="lexical") == []
+    assert _counts() == (0, 2)
+
+
+async def test_least_recently_used_entry_is_evicted(service):
+    await service.retrieve("Cloud Run", n_results=1)
+    await service.retrieve("Artifact Registry", n_results=1)
+    await service.retrieve("Cloud Run", n_results=1)  # hit: now most recent
+    await service.retrieve("Concurrency", n_results=1)  # evicts Artifact Registry
+
+    assert list(key[0] for key in service._query_cache) == ["Cloud Run", "Concurrency"]
+    await service.retrieve("Cloud Run", n_results=1)
+    await service.retrieve("Artifact Registry", n_results=1)
+    assert _counts() == (2, 4)
+
+
+async def test_disabled_cache_always_searches(tmp_path):
+    service = VectorStoreService(persist_dir=str(tmp_path / "chroma"), query_cache_size=0)
+    try:
+        await service.index_document("guide", GUIDE, chunk_size=120, chunk_overlap=20)
+        await service.retrieve("Cloud Run", n_results=1)
+        await service.retrieve("Cloud Run", n_results=1)
+    finally:
+        service.close()
+
+    assert _counts() == (0, 0)
+    assert not service._query_cache
@@ -0,0 +1,192 @@
+"""Study-guide question bank: parsing, sync and serving (QUESTION_SOURCE)."""
+import pytest
+
+from app.agents import supervisor
+from app.services.metrics import metrics
+from app.services.question_bank import QuestionBank, parse_questions
+
+
+pytestmark = pytest.mark.anyio
+
+QUIZ = """\
+# Weekly Knowledge Check: Cloud Run
+
+## Part 1: Multiple Choice
+
+### 1. What is the default port Cloud Run expects?
+- [ ] A) 3000
+- [ ] B) 8080
+
+<details>
+<summary>Click to Reveal Answer</summary>
+
+**Correct Answer:** B) 8080
+
+**Explanation:** Cloud Run sets PORT to 8080.
+It routes incoming traffic there.
+
+</details>
+
+## Part 2: True/False
+
+### 2. Cloud Run can only run containers built from a Dockerfile.
+<details>
+<summary>Click to Reveal Answer</summary>
+
+**Answer:** False
+
+**Explanation:** Buildpacks can build the image too.
+</details>
+"""
+
+INTERVIEW = """\
+# Interview Questions: Cloud Run
+
+## Beginner (Foundational)
+
+### Q1: What is Cloud Run?
+**Keywords:** Serverless, Container
+<details>
+<summary>Click to Reveal Answer</summary>
+
+Cloud Run runs stateless containers
+and scales them to zero.
+</details>
+
+### Q2: How does Cloud Run handle cold starts?
+**Keywords:** Cold Start, Min Instances
+<details>
+<summary>Click to Reveal Answer</summary>
+
+A new instance starts; min instances keep some warm.
+</details>
+
+## Advanced (Deep Dive)
+
+### Q3: How would you tune concurrency for a CPU-bound service?
+**Keywords:** Concurrency, CPU
+<details>
+<summary>Click to Reveal Answer</summary>
+
+Lower it towards the number of cores.
+</details>
+"""
+
+
+@pytest.fixture
+def guides(tmp_path):
+    """A study-guide tree with one topic, cloud-run."""
+    topic = tmp_path / "guides" / "cloud-run"
+    topic.mkdir(parents=True)
+    (topic / "quiz-questions.md").write_text(QUIZ, encoding="utf-8")
+    (topic / "interview-questions.md").write_text(INTERVIEW, encoding="utf-8")
+    return tmp_path / "guides"
+
+
+@pytest.fixture
+def bank(guides, tmp_path):
+    bank = QuestionBank(str(tmp_path / "bank.sqlite3"), str(guides))
+    bank.sync()
+    yield bank
+    bank.close()
+
+
+def test_quiz_questions_are_parsed(guides):
+    multiple_choice, true_false = parse_questions(guides / "cloud-run" / "quiz-questions.md")
+
+    assert multiple_choice.question_id == "cloud-run/quiz/1"
+    assert multiple_choice.topic_title == "Cloud Run"
+    assert (multiple_choice.kind, multiple_choice.difficulty) == ("quiz", "beginner")
+    assert multiple_choice.question == "What is the default port Cloud Run expects?\nA) 3000\nB) 8080"
+    assert multiple_choice.answer == "B) 8080"
+    assert multiple_choice.explanation == "Cloud Run sets PORT to 8080.\nIt routes incoming traffic there."
+
+    assert true_false.section == "Part 2: True/False"
+    assert true_false.question == "True or false: Cloud Run can only run containers built from a Dockerfile."
+    assert true_false.answer == "False"
+    assert true_false.explanation == "Buildpacks can build the image too."
+
+
+def test_interview_questions_are_parsed(guides):
+    questions = parse_questions(guides / "cloud-run" / "interview-questions.md")
+
+    assert [q.difficulty for q in questions] == ["beginner", "beginner", "advanced"]
+    first = questions[0]
+    assert first.question == "What is Cloud Run?"
+    # Without an **Answer:** line the whole <details> body is the answer
+    assert first.answer == "Cloud Run runs stateless containers\nand scales them to zero."
+    assert first.explanation == ""
+    assert first.keywords == "Serverless, Container"
+
+
+def test_sync_reparses_only_changed_files(bank, guides):
+    assert bank.size() == 5
+    assert bank.sync() == 0
+
+    with open(guides / "cloud-run" / "quiz-questions.md", "a", encoding="utf-8") as f:
+        f.write(
+            "\n### 3. Cloud Run services get HTTPS by default.\n"
+            "<details>\n\n**Answer:** True\n</details>\n"
+        )
+    assert bank.sync() == 1
+    assert bank.size() == 6
+    assert bank.questions(section="Part 2: True/False")[-1].answer == "True"
+
+    (guides / "cloud-run" / "interview-questions.md").unlink()
+    assert bank.sync() == 0
+    assert {q.kind for q in bank.questions()} == {"quiz"}
+    assert bank.size() == 3
+
+
+def test_next_question_goes_from_beginner_to_advanced(bank):
+    asked = []
+    while (question := bank.next_question("Cloud Run cold starts", asked)) is not None:
+        asked.append(question.question_id)
+
+    assert asked == [
+        "cloud-run/interview/2",  # shares "cold starts" with the topic
+        "cloud-run/interview/1",
+        "cloud-run/quiz/1",
+        "cloud-run/quiz/2",
+        "cloud-run/interview/3",
+    ]
+
+
+def test_unknown_topics_have_no_bank_questions(bank):
+    assert bank.match_topic("Cloud Run") == "cloud-run"
+    assert bank.match_topic("Kubernetes networking") is None
+    assert bank.next_question("Kubernetes networking") is None
+
+
+@pytest.fixture
+def hybrid(guides, monkeypatch):
+    monkeypatch.setenv("QUESTION_SOURCE", "hybrid")
+    monkeypatch.setenv("QUESTION_BANK_DIR", str(guides))
+
+
+def _state(**overrides) -> dict:
+    state = supervisor.create_interview_session()
+    state.update(topic="Cloud Run cold starts", context="General knowledge.", **overrides)
+    return state
+
+
+async def test_hybrid_mode_alternates_bank_and_model_questions(hybrid):
+    state = _state()
+
+    for _ in range(4):
+        state.update(await supervisor.generate_question_node(state))
+
+    assert state["question_count"] == 4
+    assert state["bank_asked"] == ["cloud-run/interview/2", "cloud-run/interview/1"]
+    assert metrics.get("question_source.bank") == 2
+    assert metrics.get("question_source.llm") == 2
+
+
+async def test_hybrid_mode_generates_follow_ups(hybrid):
+    state = _state(needs_followup=True)
+
+    update = await supervisor.generate_question_node(state)
+
+    assert update["followup_count"] == 1
+    assert "bank_asked" not in update
+    assert metrics.get("question_source.llm") == 1
@@ -0,0 +1,235 @@
+"""Background prefetch of upcoming questions (PREFETCH_QUESTIONS > 0)."""
+import asyncio
+
+import pytest
+
+from app.agents import supervisor
+from app.api import deps
+from app.services import question_prefetch
+from app.services.metrics import metrics
+from app.services.question_prefetch import QuestionPrefetcher
+
+
+pytestmark = pytest.mark.anyio
+
+
+class Generator:
+    """Stands in for generate_question_node; blocks while `gate` is clear."""
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.started: list[int] = []
+        self.cancelled: list[int] = []
+        self.fail = False
+
+    async def __call__(self, state: dict) -> dict:
+        count = state["question_count"]
+        self.started.append(count)
+        try:
+            await self.gate.wait()
+        except asyncio.CancelledError:
+            self.cancelled.append(count)
+            raise
+        if self.fail:
+            raise RuntimeError("model down")
+        return {"current_question": f"Question {count + 1}", "question_count": count + 1}
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    generator = Generator()
+    monkeypatch.setattr(supervisor, "generate_question_node", generator)
+    return generator
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controls the prefetcher's monotonic clock; advance with clock[0] += seconds."""
+    now = [1000.0]
+
+    class Clock:
+        perf_counter = staticmethod(lambda: now[0])
+        monotonic = staticmethod(lambda: now[0])
+    monkeypatch.setattr(question_prefetch, "time", Clock)
+    return now
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _state(count: int, topic: str = "Python basics") -> dict:
+    return {"topic": topic, "context": "General knowledge.", "question_count": count}
+
+
+async def test_filled_questions_are_taken(generator):
+    prefetcher = QuestionPrefetcher(depth=2)
+
+    prefetcher.fill("t1", _state(1))
+    await _settle()
+
+    assert prefetcher.ready("t1", _state(1))
+    assert await prefetcher.take("t1", _state(1)) == {"current_question": "Question 2", "question_count": 2}
+    assert await prefetcher.take("t1", _state(2)) == {"current_question": "Question 3", "question_count": 3}
+    assert generator.started == [1, 2]
+    assert metrics.get("prefetch.hit") == 2
+
+
+async def test_fill_tops_up_without_regenerating(generator):
+    prefetcher = QuestionPrefetcher(depth=2)
+    prefetcher.fill("t1", _state(1))
+    await _settle()
+    await prefetcher.take("t1", _state(1))
+
+    prefetcher.fill("t1", _state(2))
+    await _settle()
+
+    assert generator.started == [1, 2, 3]
+    assert sorted(prefetcher._sessions["t1"]) == [2, 3]
+
+
+async def test_stale_entries_miss(generator):
+    prefetcher = QuestionPrefetcher(depth=1)
+    prefetcher.fill("t1", _state(1))
+    await _settle()
+
+    assert not prefetcher.ready("t1", _state(1, topic="Go"))
+    assert await prefetcher.take("t1", _state(1, topic="Go")) is None
+    assert await prefetcher.take("t1", _state(1)) is None  # the stale entry is gone
+    assert await prefetcher.take("t2", _state(1)) is None
+    assert metrics.get("prefetch.miss") == 3
+    assert metrics.get("prefetch.hit") == 0
+
+
+async def test_refill_drops_entries_from_other_context(generator):
+    prefetcher = QuestionPrefetcher(depth=1)
+    generator.gate.clear()
+    prefetcher.fill("t1", _state(1))
+    await _settle()
+
+    prefetcher.fill("t1", _state(1, topic="Go"))
+    await _settle()
+
+    assert generator.cancelled == [1]
+    assert prefetcher._sessions["t1"][1].key == ("Go", "General knowledge.", 1)
+
+
+async def test_entries_still_waiting_for_a_slot_are_cancelled_not_awaited(generator):
+    prefetcher = QuestionPrefetcher(depth=2, max_concurrent=1)
+    generator.gate.clear()
+    prefetcher.fill("t1", _state(1))
+    await _settle()
+    waiting = prefetcher._sessions["t1"][2]
+    assert generator.started == [1]
+    assert not waiting.started
+    assert not prefetcher.ready("t1", _state(2))
+
+    assert await asyncio.wait_for(prefetcher.take("t1", _state(2)), timeout=1) is None
+    await _settle()
+
+    assert waiting.task.cancelled()
+    assert generator.started == [1]
+    assert metrics.get("prefetch.miss") == 1
+
+
+async def test_started_entries_are_awaited(generator):
+    prefetcher = QuestionPrefetcher(depth=1)
+    generator.gate.clear()
+    prefetcher.fill("t1", _state(1))
+    await _settle()
+
+    take = asyncio.create_task(prefetcher.take("t1", _state(1)))
+    await _settle()
+    assert not take.done()
+    generator.gate.set()
+
+    assert (await take)["current_question"] == "Question 2"
+
+
+async def test_failed_prefetch_misses(generator):
+    prefetcher = QuestionPrefetcher(depth=1)
+    generator.fail = True
+    prefetcher.fill("t1", _state(1))
+    await _settle()
+
+    assert await prefetcher.take("t1", _state(1)) is None
+    assert metrics.get("prefetch.failed") == 1
+
+
+async def test_idle_sessions_expire(generator, clock):
+    prefetcher = QuestionPrefetcher(depth=1, ttl_seconds=60)
+    generator.gate.clear()
+    prefetcher.fill("idle", _state(1))
+    clock[0] += 30
+    prefetcher.fill("active", _state(1))
+    await _settle()
+
+    clock[0] += 31
+    prefetcher.fill("new", _state(1))
+    await _settle()
+
+    assert list(prefetcher._sessions) == ["active", "new"]
+    assert generator.cancelled == [1]
+    assert metrics.get("prefetch.expired") == 1
+
+
+async def test_least_recently_used_sessions_are_evicted(generator):
+    prefetcher = QuestionPrefetcher(depth=1, max_sessions=2)
+    prefetcher.fill("t1", _state(1))
+    prefetcher.fill("t2", _state(1))
+    await _settle()
+    await prefetcher.take("t1", _state(1))  # t1 is now the most recent
+    prefetcher.fill("t1", _state(2))
+
+    prefetcher.fill("t3", _state(1))
+
+    assert list(prefetcher._sessions) == ["t1", "t3"]
+    assert metrics.get("prefetch.evicted") == 1
+
+
+async def test_shutdown_cancels_everything(generator):
+    prefetcher = QuestionPrefetcher(depth=2)
+    generator.gate.clear()
+    prefetcher.fill("t1", _state(1))
+    prefetcher.fill("t2", _state(1))
+    await _settle()
+    tasks = [entry.task for queue in prefetcher._sessions.values() for entry in queue.values()]
+
+    await prefetcher.shutdown()
+
+    assert not prefetcher._sessions
+    assert all(task.done() for task in tasks)
+    # Both slots were taken by t1; t2's entries never started
+    assert sorted(generator.cancelled) == sorted(generator.started) == [1, 2]
+
+
+@pytest.fixture
+def prefetch_enabled(monkeypatch):
+    monkeypatch.setenv("PREFETCH_QUESTIONS", "2")
+
+
+async def test_sessions_are_discarded_when_they_end(prefetch_enabled, client, start_session):
+    prefetcher = deps.get_question_prefetcher()
+    await start_session("deleted")
+    await start_session("assessed")
+    assert {"deleted", "assessed"} <= set(prefetcher._sessions)
+
+    await client.delete("/api/v1/interview/deleted")
+    await client.get("/api/v1/interview/assessment", params={"thread_id": "assessed"})
+
+    assert not prefetcher._sessions
+
+
+async def test_answers_use_the_prefetched_question(prefetch_enabled, client, start_session):
+    await start_session("t1")
+    await asyncio.sleep(0.05)  # let the prefetches run
+
+    response = await client.post(
+        "/api/v1/interview/answer",
+        json={"thread_id": "t1", "transcript": "Lists are mutable, tuples are not."},
+    )
+
+    assert response.status_code == 200
+    assert metrics.get("prefetch.hit") == 1
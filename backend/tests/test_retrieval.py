@@ -0,0 +1,110 @@
+"""Vector, lexical (BM25) and hybrid retrieval modes."""
+import threading
+
+import pytest
+
+from app.api.deps import get_vectorstore_service
+from app.config import get_settings
+from app.services.metrics import metrics
+from app.services.vectorstore import VectorStoreService, _fuse_ranks
+
+
+pytestmark = pytest.mark.anyio
+
+GUIDE = " ".join([
+    "Cloud Run scales container instances down to zero when there is no traffic.",
+    "Cold starts happen when a request arrives and no instance is warm.",
+    "Container images are pushed to Artifact Registry before deployment.",
+    "Concurrency controls how many requests one instance serves at a time.",
+    "Minimum instances keep a warm pool and avoid cold starts for latency sensitive services.",
+] * 4)
+
+
+@pytest.fixture
+async def service(tmp_path):
+    service = VectorStoreService(persist_dir=str(tmp_path / "chroma"))
+    await service.index_document("guide", GUIDE, chunk_size=120, chunk_overlap=20)
+    yield service
+    service.close()
+
+
+def test_default_mode_is_vector():
+    assert get_settings().retrieval_mode == "vector"
+    assert get_vectorstore_service().retrieval_mode == "vector"
+
+
+async def test_lexical_mode_matches_exact_terms(service):
+    chunks = await service.retrieve("Artifact Registry", n_results=3, mode="lexical")
+
+    assert chunks
+    assert all("Artifact Registry" in chunk.text for chunk in chunks)
+    assert all(chunk.document_id == "guide" for chunk in chunks)
+    assert metrics.get("retrieval.lexical_fallback") == 0
+
+
+async def test_lexical_mode_falls_back_to_vector_without_term_matches(service):
+    chunks = await service.retrieve("kubernetes", n_results=2, mode="lexical")
+
+    assert len(chunks) == 2
+    assert metrics.get("retrieval.lexical_fallback") == 1
+
+
+async def test_hybrid_mode_returns_fused_chunks(service):
+    chunks = await service.retrieve("Artifact Registry deployment", n_results=4, mode="hybrid")
+
+    assert len(chunks) == 4
+    assert len({chunk.chunk_id for chunk in chunks}) == 4
+    assert "Artifact Registry" in chunks[0].text
+
+
+def test_rank_fusion_prefers_chunks_both_rankers_agree_on():
+    vector = [("a", "A"), ("b", "B"), ("c", "C")]
+    lexical = [("c", "C"), ("d", "D"), ("b", "B")]
+
+    assert _fuse_ranks([vector, lexical], 3) == [("c", "C"), ("b", "B"), ("a", "A")]
+
+
+async def test_deleted_documents_leave_the_lexical_index(service):
+    await service.delete_document("guide")
+
+    assert await service.retrieve("Artifact Registry", mode="lexical") == []
+
+
+async def test_unknown_mode_is_rejected(service):
+    with pytest.raises(ValueError, match="Unknown retrieval mode"):
+        await service.retrieve("Cloud Run", mode="semantic")
+
+
+async def test_searches_run_off_the_event_loop(service, monkeypatch):
+    loop_thread = threading.get_ident()
+    threads = []
+    for name in ("_vector_search", "_lexical_search"):
+        search = getattr(service, name)
+
+        def recording(*args, _search=search):
+            threads.append(threading.get_ident())
+            return _search(*args)
+        monkeypatch.setattr(service, name, recording)
+
+    await service.retrieve("Artifact Registry deployment", n_results=2, mode="hybrid")
+
+    assert len(threads) == 2
+    assert loop_thread not in threads
+
+
+async def test_first_use_registry_setup_runs_off_the_event_loop(service, tmp_path, monkeypatch):
+    service.close()
+    reopened = VectorStoreService(persist_dir=str(tmp_path / "chroma"))
+    threads = []
+    ensure_registry = reopened._ensure_registry
+
+    def recording():
+        threads.append(threading.get_ident())
+        return ensure_registry()
+    monkeypatch.setattr(reopened, "_ensure_registry", recording)
+    try:
+        assert await reopened.retrieve("Artifact Registry", n_results=1, mode="lexical")
+    finally:
+        reopened.close()
+
+    assert threads and threading.get_ident() not in threads
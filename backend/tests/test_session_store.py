@@ -0,0 +1,191 @@
+"""Interview session stores (SESSION_STORE=memory and sqlite)."""
+import asyncio
+import threading
+
+import pytest
+
+from app.agents import supervisor
+from app.api import deps
+from app.models.schemas import InterviewStatus
+from app.services.session_store import (
+    InMemorySessionStore,
+    SessionConflictError,
+    SQLiteSessionStore,
+)
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store_backend(request, monkeypatch):
+    """Runs a test against each SESSION_STORE backend."""
+    monkeypatch.setenv("SESSION_STORE", request.param)
+    return request.param
+
+
+@pytest.fixture
+def store(store_backend, tmp_path):
+    if store_backend == "memory":
+        yield InMemorySessionStore()
+        return
+    sqlite_store = SQLiteSessionStore(str(tmp_path / "store.sqlite3"))
+    yield sqlite_store
+    sqlite_store.close()
+
+
+def _session(thread_id: str = "t1", **extra) -> dict:
+    return {
+        "thread_id": thread_id,
+        "topic": "Python basics",
+        "status": InterviewStatus.AWAITING_ANSWER,
+        "graph_state": {"messages": [], "question_count": 1},
+        "config": {"configurable": {"thread_id": thread_id}},
+        **extra,
+    }
+
+
+async def test_saving_without_a_version_creates_then_replaces(store):
+    assert (await store.asave(_session()))["version"] == 1
+    # A replacement keeps counting up, so no stale copy can match it
+    replaced = await store.asave(_session(topic="Go"))
+    assert replaced["version"] == 2
+    stored = await store.aget("t1")
+    assert stored["version"] == 2
+    assert stored["topic"] == "Go"
+
+
+async def test_saving_a_stale_version_conflicts(store):
+    await store.asave(_session())
+    first = await store.aget("t1")
+    second = await store.aget("t1")
+
+    first["topic"] = "Go"
+    await store.asave(first)
+    second["topic"] = "Rust"
+    with pytest.raises(SessionConflictError):
+        await store.asave(second)
+
+    stored = await store.aget("t1")
+    assert stored["topic"] == "Go"
+    assert stored["version"] == 2
+
+
+async def test_get_returns_a_copy(store):
+    await store.asave(_session())
+    session = await store.aget("t1")
+    session["graph_state"]["question_count"] = 5
+
+    assert (await store.aget("t1"))["graph_state"]["question_count"] == 1
+
+
+async def test_delete(store):
+    await store.asave(_session())
+
+    assert await store.adelete("t1") is True
+    assert await store.aget("t1") is None
+    assert await store.adelete("t1") is False
+
+
+async def test_hot_tier_follows_other_workers(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    worker_a, worker_b = SQLiteSessionStore(path), SQLiteSessionStore(path)
+    try:
+        worker_a.save(_session())
+        assert worker_a.get("t1")["topic"] == "Python basics"  # now in A's hot tier
+
+        updated = worker_b.get("t1")
+        updated["topic"] = "Go"
+        worker_b.save(updated)
+        assert worker_a.get("t1")["topic"] == "Go"
+
+        worker_b.delete("t1")
+        assert worker_a.get("t1") is None
+        assert "t1" not in worker_a._hot
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+async def test_conflict_drops_the_hot_copy(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    worker_a, worker_b = SQLiteSessionStore(path), SQLiteSessionStore(path)
+    try:
+        worker_a.save(_session())
+        stale = worker_a.get("t1")
+        worker_b.save(worker_b.get("t1"))
+
+        with pytest.raises(SessionConflictError):
+            worker_a.save(stale)
+        assert "t1" not in worker_a._hot
+        assert worker_a.get("t1")["version"] == 2
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+async def test_sqlite_calls_run_off_the_event_loop(tmp_path, monkeypatch):
+    store = SQLiteSessionStore(str(tmp_path / "store.sqlite3"))
+    threads = []
+    for name in ("get", "save", "delete"):
+        method = getattr(store, name)
+
+        def recording(*args, _method=method):
+            threads.append(threading.get_ident())
+            return _method(*args)
+        monkeypatch.setattr(store, name, recording)
+    try:
+        await store.asave(_session())
+        await store.aget("t1")
+        await store.adelete("t1")
+    finally:
+        store.close()
+
+    assert len(threads) == 3
+    assert threading.get_ident() not in threads
+
+
+@pytest.fixture
+def slow_model(monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_LATENCY_MS", "300")
+
+
+async def test_concurrent_update_answers_409(store_backend, slow_model, client, start_session):
+    await start_session("t1")
+    sessions = deps.get_session_store()
+
+    answer = asyncio.create_task(client.post(
+        "/api/v1/interview/answer",
+        json={"thread_id": "t1", "transcript": "Lists are mutable, tuples are not."},
+    ))
+    while (await sessions.aget("t1"))["status"] != InterviewStatus.ASSESSING:
+        await asyncio.sleep(0.01)
+    # Another request updates the session while the answer is assessed
+    other = await sessions.aget("t1")
+    other["topic"] = "Go"
+    await sessions.asave(other)
+
+    response = await answer
+
+    assert response.status_code == 409
+    stored = await sessions.aget("t1")
+    assert stored["topic"] == "Go"
+    assert stored["status"] == InterviewStatus.ASSESSING  # the newer save stands
+
+
+async def test_failed_turn_restores_the_status(store_backend, client, start_session, monkeypatch):
+    await start_session("t1")
+
+    async def failing_assessment(state):
+        raise RuntimeError("model down")
+    monkeypatch.setattr(supervisor, "assess_answer_node", failing_assessment)
+
+    with pytest.raises(RuntimeError):
+        await client.post(
+            "/api/v1/interview/answer",
+            json={"thread_id": "t1", "transcript": "Lists are mutable, tuples are not."},
+        )
+
+    stored = await deps.get_session_store().aget("t1")
+    assert stored["status"] == InterviewStatus.AWAITING_ANSWER
+    assert stored["graph_state"]["question_count"] == 1
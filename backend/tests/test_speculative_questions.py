@@ -0,0 +1,124 @@
+"""Speculative next-question generation (SPECULATIVE_QUESTIONS=true)."""
+import asyncio
+
+import pytest
+
+from app.agents import supervisor
+from app.services.metrics import metrics
+
+
+pytestmark = pytest.mark.anyio
+
+LATENCY_MS = 100
+ANSWER = {"thread_id": "t1", "transcript": "Lists are mutable, tuples are not."}
+
+
+@pytest.fixture
+def speculative(monkeypatch):
+    monkeypatch.setenv("SPECULATIVE_QUESTIONS", "true")
+    monkeypatch.setenv("FAKE_LLM_LATENCY_MS", str(LATENCY_MS))
+
+
+class SpeculativeGenerator:
+    """
+    Wraps generate_question_node: the first call (the speculative one)
+    waits `delay` seconds first, or raises if `fail`; later calls are live.
+    """
+
+    def __init__(self, node, delay: float = 0.0, fail: bool = False):
+        self.node = node
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.speculative_done = False
+        self.done_before_live = []
+
+    async def __call__(self, state: dict) -> dict:
+        self.calls += 1
+        if self.calls > 1:
+            self.done_before_live.append(self.speculative_done)
+            return await self.node(state)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("model down")
+            return await self.node(state)
+        finally:
+            self.speculative_done = True
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    def install(**kwargs) -> SpeculativeGenerator:
+        generator = SpeculativeGenerator(supervisor.generate_question_node, **kwargs)
+        monkeypatch.setattr(supervisor, "generate_question_node", generator)
+        return generator
+    return install
+
+
+def _saved_ms() -> dict:
+    return metrics.snapshot()["timings"]["speculative_question.saved"]
+
+
+async def test_speculative_question_is_used_when_no_follow_up_is_needed(speculative, client, start_session):
+    await start_session("t1")
+
+    response = await client.post("/api/v1/interview/answer", json=ANSWER)
+
+    assert response.status_code == 200
+    assert response.json()["has_followup"] is False
+    assert metrics.get("speculative_question.hit") == 1
+    assert metrics.get("question_source.llm") == 2  # the first question and the speculative one
+    # Generated entirely while the assessment ran
+    assert _saved_ms()["count"] == 1
+    assert _saved_ms()["total_ms"] >= LATENCY_MS * 0.5
+
+
+async def test_saved_time_excludes_waiting_after_the_assessment(speculative, generator, client, start_session):
+    await start_session("t1")
+    generator(delay=0.3)
+
+    response = await client.post("/api/v1/interview/answer", json=ANSWER)
+
+    assert response.status_code == 200
+    assert metrics.get("speculative_question.hit") == 1
+    # ~400 ms of generation, ~300 ms of it after the ~100 ms assessment
+    assert _saved_ms()["total_ms"] < 250
+
+
+@pytest.fixture
+def needs_followup(monkeypatch):
+    assess = supervisor.assess_answer_node
+
+    async def assess_needing_followup(state: dict) -> dict:
+        return {**await assess(state), "needs_followup": True}
+    monkeypatch.setattr(supervisor, "assess_answer_node", assess_needing_followup)
+
+
+async def test_follow_up_cancels_the_speculative_question(speculative, needs_followup, generator, client, start_session):
+    await start_session("t1")
+    speculative_generator = generator(delay=5)
+
+    response = await client.post("/api/v1/interview/answer", json=ANSWER)
+
+    assert response.status_code == 200
+    assert metrics.get("speculative_question.miss") == 1
+    assert metrics.get("speculative_question.hit") == 0
+    # Cancelled and finished before the follow-up was generated
+    assert speculative_generator.done_before_live == [True]
+    question = (await client.get("/api/v1/interview/question", params={"thread_id": "t1"})).json()
+    assert question["question_number"] == 1  # follow-ups don't advance the count
+
+
+async def test_failed_speculation_falls_back_to_live_generation(speculative, generator, client, start_session):
+    await start_session("t1")
+    speculative_generator = generator(fail=True)
+
+    response = await client.post("/api/v1/interview/answer", json=ANSWER)
+
+    assert response.status_code == 200
+    assert speculative_generator.calls == 2
+    assert metrics.get("speculative_question.failed") == 1
+    assert metrics.get("speculative_question.hit") == 0
+    question = (await client.get("/api/v1/interview/question", params={"thread_id": "t1"})).json()
+    assert question["question_number"] == 2
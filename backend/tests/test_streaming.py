@@ -0,0 +1,97 @@
+"""SSE streaming of assessment and next-question tokens (/interview/{thread_id}/stream)."""
+import json
+import time
+
+import pytest
+
+from app.agents import supervisor
+from app.agents.fake_model import FAKE_RESPONSES
+from app.api.deps import get_question_prefetcher, get_session_store
+from app.api.routes.interview import stream_answer
+from app.models.schemas import StreamAnswerRequest
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def _stream(client, thread_id: str) -> list[tuple[str, dict]]:
+    """(event, data) for each SSE frame."""
+    events = []
+    async with client.stream(
+        "POST", f"/api/v1/interview/{thread_id}/stream", json={"transcript": "Generators yield lazily."}
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                events.append((event, json.loads(line[len("data: "):])))
+    return events
+
+
+async def _status(client, thread_id: str) -> str:
+    response = await client.get("/api/v1/interview/question", params={"thread_id": thread_id})
+    return response.json()["status"]
+
+
+async def test_stream_sends_tokens_before_final_events(client, start_session):
+    await start_session("s1")
+
+    events = await _stream(client, "s1")
+    names = [name for name, _ in events]
+
+    assert names[-2:] == ["question", "done"]
+    assert names.index("assessment") < names.index("question_token")
+    assert all(name == "assessment_token" for name in names[:names.index("assessment")])
+    tokens = "".join(data["token"] for name, data in events if name == "assessment_token")
+    assert tokens == FAKE_RESPONSES["assessment"]
+    question = events[-2][1]
+    assert question["question"] == FAKE_RESPONSES["question"]
+    assert question["question_number"] == 2
+    assert await _status(client, "s1") == "awaiting_answer"
+
+
+@pytest.fixture
+def slow_model(monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_LATENCY_MS", "400")
+
+
+async def test_first_token_arrives_before_the_assessment_finishes(slow_model, client, start_session):
+    await start_session("s1")
+
+    # The test transport buffers whole responses, so read the route's body
+    # iterator directly to see when each frame is produced
+    response = await stream_answer(
+        "s1",
+        StreamAnswerRequest(transcript="Generators yield lazily."),
+        sessions=get_session_store(),
+        prefetcher=get_question_prefetcher(),
+    )
+    started = time.perf_counter()
+    produced = {}
+    async for frame in response.body_iterator:
+        produced.setdefault(frame.split("\n", 1)[0], time.perf_counter() - started)
+
+    assert produced["event: assessment_token"] < produced["event: assessment"] / 2
+
+
+async def test_stream_error_restores_session_status(monkeypatch, client, start_session):
+    await start_session("s1")
+
+    async def failing_assessment(state):
+        raise RuntimeError("model unavailable")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(supervisor, "stream_assessment", failing_assessment)
+    events = await _stream(client, "s1")
+
+    assert events[-1][0] == "error"
+    assert events[-1][1]["detail"] == "model unavailable"
+    assert await _status(client, "s1") == "awaiting_answer"
+
+
+async def test_stream_unknown_session_is_404(client):
+    response = await client.post("/api/v1/interview/missing/stream", json={"transcript": "hi"})
+    assert response.status_code == 404
@@ -0,0 +1,149 @@
+"""Structured assessment output (ASSESSMENT_OUTPUT=json_schema / function_calling)."""
+import json
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from app.agents import supervisor
+from app.agents.fake_model import FakeChatModel
+from app.services.metrics import metrics
+
+
+pytestmark = pytest.mark.anyio
+
+VALID = json.dumps({
+    "score": 65,
+    "feedback": "Correct but brief.",
+    "strengths": ["Accurate"],
+    "weaknesses": ["No example"],
+    "needs_followup": True,
+})
+# Score out of range, so validation fails
+INVALID = json.dumps({**json.loads(VALID), "score": 150})
+
+
+@pytest.fixture(params=["json_schema", "function_calling"])
+def mode(request, monkeypatch):
+    monkeypatch.setenv("ASSESSMENT_OUTPUT", request.param)
+    monkeypatch.setenv("ASSESSMENT_MAX_RETRIES", "1")
+    return request.param
+
+
+class RecordingFakeModel(FakeChatModel):
+    """Fake that records the prompts of its structured-output calls."""
+    prompts: list = []
+
+    def with_structured_output(self, schema, **kwargs):
+        runnable = super().with_structured_output(schema, **kwargs)
+
+        async def record(messages):
+            self.prompts.append(messages)
+            return await runnable.ainvoke(messages)
+        return RunnableLambda(runnable.invoke, afunc=record)
+
+
+@pytest.fixture
+def fake_outputs(monkeypatch):
+    """Queue structured outputs on the assessment model; returns the prompts it got."""
+    model = RecordingFakeModel(role="assessment")
+    monkeypatch.setattr(supervisor, "get_model", lambda role: model)
+
+    def queue(*outputs: str) -> list:
+        model.structured_outputs.extend(outputs)
+        return model.prompts
+    return queue
+
+
+def _state() -> dict:
+    state = supervisor.create_interview_session()
+    state.update(
+        topic="Python basics",
+        current_question="What is the difference between a list and a tuple?",
+        current_answer="Lists are mutable, tuples are not.",
+    )
+    return state
+
+
+async def test_structured_assessment(mode):
+    update = await supervisor.assess_answer_node(_state())
+
+    assert update["last_assessment"] == {
+        "score": 80,
+        "feedback": "Solid answer that covers the main points.",
+        "strengths": ["Clear explanation", "Good structure"],
+        "weaknesses": ["Could include a concrete example"],
+        "needs_followup": False,
+    }
+    assert update["messages"][0].content.startswith("[Assessment] SCORE: 80\nFEEDBACK: Solid answer")
+    assert metrics.get(f"assessment.{mode}.calls") == 1
+    assert metrics.get(f"assessment.{mode}.output_tokens") > 0
+    assert metrics.snapshot()["timings"][f"assessment.{mode}.latency"]["count"] == 1
+    assert metrics.get(f"assessment.{mode}.invalid") == 0
+    assert metrics.get("assessment.text.calls") == 0
+
+
+async def test_invalid_output_is_retried_with_the_error(mode, fake_outputs):
+    prompts = fake_outputs(INVALID, VALID)
+
+    update = await supervisor.assess_answer_node(_state())
+
+    assert update["last_assessment"]["score"] == 65
+    assert update["needs_followup"] is True
+    assert metrics.get(f"assessment.{mode}.calls") == 2
+    assert metrics.get(f"assessment.{mode}.invalid") == 1
+    assert metrics.get("assessment.structured_fallback") == 0
+    retry = prompts[1][-1].content
+    assert retry.startswith("The previous output was invalid:")
+    assert "score" in retry
+    assert len(prompts[1]) == len(prompts[0]) + 1
+
+
+async def test_falls_back_to_text_after_the_retries(mode, fake_outputs):
+    fake_outputs(INVALID, INVALID)
+
+    update = await supervisor.assess_answer_node(_state())
+
+    # Parsed from the fake's text-format answer
+    assert update["last_assessment"]["score"] == 80
+    assert metrics.get(f"assessment.{mode}.calls") == 2
+    assert metrics.get(f"assessment.{mode}.invalid") == 2
+    assert metrics.get("assessment.structured_fallback") == 1
+    assert metrics.get("assessment.text.calls") == 1
+
+
+async def test_streaming_yields_the_structured_assessment_whole(mode, fake_outputs):
+    fake_outputs(INVALID, VALID)
+
+    events = [event async for event in supervisor.stream_assessment(_state())]
+
+    assert [kind for kind, _ in events] == ["token", "update"]
+    assert events[0][1].startswith("SCORE: 65\n")
+    assert events[1][1]["last_assessment"]["score"] == 65
+    assert metrics.get(f"assessment.{mode}.invalid") == 1
+
+
+async def test_streaming_falls_back_to_streamed_text(mode, fake_outputs):
+    fake_outputs(INVALID, INVALID)
+
+    events = [event async for event in supervisor.stream_assessment(_state())]
+
+    assert [kind for kind, _ in events].count("token") > 1
+    assert events[-1][1]["last_assessment"]["score"] == 80
+    assert metrics.get("assessment.structured_fallback") == 1
+    assert metrics.get("assessment.text.calls") == 1
+
+
+async def test_text_mode_records_text_metrics():
+    update = await supervisor.assess_answer_node(_state())
+
+    assert update["last_assessment"]["score"] == 80
+    assert metrics.get("assessment.text.calls") == 1
+    assert metrics.get("assessment.text.output_tokens") > 0
+    assert not any(name.startswith("assessment.json_schema") for name in metrics.snapshot()["counters"])
+
+
+async def test_unknown_mode_is_rejected(monkeypatch):
+    monkeypatch.setenv("ASSESSMENT_OUTPUT", "xml")
+
+    with pytest.raises(ValueError, match="Unknown assessment output"):
+        await supervisor.assess_answer_node(_state())
@@ -0,0 +1,203 @@
+"""Precomputed topic digests: section splitting, building and matching."""
+import pytest
+
+from app.agents import supervisor
+from app.agents.fake_model import FAKE_RESPONSES
+from app.services.metrics import metrics
+from app.services.topic_digests import MIN_SECTION_CHARS, TopicDigests, key_terms, split_parts, split_sections
+from app.services.vectorstore import VectorStoreService
+
+
+pytestmark = pytest.mark.anyio
+
+
+def body(subject: str, sentences: int = 12) -> str:
+    return " ".join(f"{subject} detail number {i} matters in production." for i in range(sentences))
+
+
+GUIDE = f"""# Cloud Run Guide
+
+{body("Overview")}
+
+## Cold Starts
+
+{body("Cold start")}
+
+### Minimum instances
+
+{body("Minimum instance", 2)}
+
+## Pricing
+
+too short
+
+## Concurrency
+
+{body("Concurrency")}
+
+## Cold Starts
+
+{body("Startup probe", 4)}
+"""
+
+
+# ── split_sections / split_parts ──
+
+def test_split_sections_on_level_one_and_two_headings():
+    title, sections = split_sections(GUIDE)
+
+    assert title == "Cloud Run Guide"
+    assert [heading for heading, _ in sections] == ["Cloud Run Guide", "Cold Starts", "Concurrency"]
+    cold_starts = dict(sections)["Cold Starts"]
+    # Level-3 headings stay inside their section; repeated headings are merged
+    assert "### Minimum instances" in cold_starts
+    assert "Startup probe detail" in cold_starts
+    assert all(len(text) >= MIN_SECTION_CHARS for _, text in sections)
+
+
+def test_split_sections_limits_and_plain_text():
+    assert split_sections(GUIDE, max_sections=1)[1][0][0] == "Cloud Run Guide"
+    assert split_sections("No headings here.\n\nJust text.") == (None, [])
+
+
+def test_split_parts_cover_the_text_at_paragraph_breaks():
+    paragraphs = [body(f"Paragraph {i}", 3) for i in range(20)]
+    text = "\n\n".join(paragraphs)
+
+    parts = split_parts(text, max_chars=600, max_parts=100)
+
+    assert all(len(part) <= 600 for part in parts)
+    assert "\n\n".join(parts).split() == text.split()
+    # Cut at paragraph breaks: no paragraph is split between two parts
+    assert all(part.split("\n\n")[0] in paragraphs for part in parts)
+
+
+def test_split_parts_keep_evenly_spaced_parts_past_the_limit():
+    text = "\n\n".join(f"Part {i}. " + "x" * 90 for i in range(40))
+
+    parts = split_parts(text, max_chars=100, max_parts=5)
+
+    assert [part.split(".")[0] for part in parts] == ["Part 0", "Part 10", "Part 20", "Part 29", "Part 39"]
+    assert split_parts(text, 100, 1) == parts[:1]
+    assert split_parts("", 100, 5) == []
+
+
+# ── building ──
+
+@pytest.fixture
+async def vectorstore(tmp_path):
+    service = VectorStoreService(persist_dir=str(tmp_path / "chroma"))
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def recorded_calls(monkeypatch):
+    """Replace the context model calls with ones that echo their input."""
+    calls = {"analyze": [], "combine": []}
+
+    async def analyze_context(topic, context):
+        calls["analyze"].append((topic, context))
+        return f"Key areas of {topic}: {context.split()[0]}"
+
+    async def combine_key_areas(topic, analyses):
+        calls["combine"].append(list(analyses))
+        return f"Combined key areas of {topic} from {len(analyses)} parts"
+
+    monkeypatch.setattr(supervisor, "analyze_context", analyze_context)
+    monkeypatch.setattr(supervisor, "combine_key_areas", combine_key_areas)
+    return calls
+
+
+async def test_material_digest_covers_the_whole_material(monkeypatch, vectorstore, recorded_calls):
+    monkeypatch.setenv("PROMPT_CONTEXT_TOKENS_CONTEXT", "100")  # 400 characters per part
+    text = "\n\n".join(f"Topic{i} " + body(f"Section {i}", 4) for i in range(12))
+    await vectorstore.index_document("guide", text, {"filename": "long-guide.md"})
+
+    stored = await TopicDigests(vectorstore, max_parts=50).build("guide", "long-guide.md")
+
+    assert stored == 1  # no headings: only the whole-material digest
+    analyzed = " ".join(context for _, context in recorded_calls["analyze"])
+    assert "Topic0" in analyzed and "Topic11" in analyzed
+    assert all(len(context) <= 400 for _, context in recorded_calls["analyze"])
+    # Part analyses are combined until a single digest is left
+    assert recorded_calls["combine"]
+    digest = vectorstore.registry.digests()[0]
+    assert digest["digest"].startswith("Combined key areas of long guide")
+    assert metrics.get("digests.parts") == len(recorded_calls["analyze"])
+
+
+async def test_map_reduce_with_the_context_model(monkeypatch, vectorstore):
+    monkeypatch.setenv("PROMPT_CONTEXT_TOKENS_CONTEXT", "100")
+    text = "\n\n".join(body(f"Section {i}", 4) for i in range(12))
+    await vectorstore.index_document("guide", text, {"filename": "guide.md"})
+
+    assert await TopicDigests(vectorstore).build("guide", "guide.md") == 1
+
+    assert vectorstore.registry.digests()[0]["digest"] == FAKE_RESPONSES["context"]
+    assert metrics.get("llm_governor.fake.context.calls") > 2
+
+
+async def test_short_material_needs_no_combine_step(vectorstore, recorded_calls):
+    await vectorstore.index_document("guide", GUIDE, {"filename": "cloud-run.md"})
+
+    stored = await TopicDigests(vectorstore).build("guide", "cloud-run.md")
+
+    assert stored == 4  # the material and its three sections
+    assert recorded_calls["combine"] == []
+    headings = sorted(row["heading"] for row in vectorstore.registry.digests())
+    assert headings == ["", "Cloud Run Guide", "Cold Starts", "Concurrency"]
+
+
+async def test_digests_of_a_material_deleted_meanwhile_are_discarded(monkeypatch, vectorstore, recorded_calls):
+    await vectorstore.index_document("guide", GUIDE, {"filename": "cloud-run.md"})
+    analyze = supervisor.analyze_context
+
+    async def delete_then_analyze(topic, context):
+        await vectorstore.delete_document("guide")
+        return await analyze(topic, context)
+
+    monkeypatch.setattr(supervisor, "analyze_context", delete_then_analyze)
+
+    assert await TopicDigests(vectorstore).build("guide", "cloud-run.md") == 0
+    assert vectorstore.registry.digests() == []
+
+
+# ── matching ──
+
+@pytest.fixture
+async def digests(vectorstore, recorded_calls):
+    await vectorstore.index_document("guide", GUIDE, {"filename": "cloud-run.md"})
+    digests = TopicDigests(vectorstore)
+    await digests.build("guide", "cloud-run.md")
+    return digests
+
+
+async def test_find_prefers_the_most_specific_digest(digests):
+    assert digests.find("Cloud Run cold starts").startswith("Key areas of Cold Starts")
+    assert digests.find("cold starts").startswith("Key areas of Cold Starts")
+    assert digests.find("Cloud Run").startswith("Key areas of Cloud Run Guide")
+    assert digests.find("Kubernetes") is None
+    assert digests.find("the of and") is None  # stopwords only
+    assert metrics.get("digests.hit") == 3
+    assert metrics.get("digests.miss") == 1
+
+
+def test_key_terms_are_normalized():
+    assert key_terms("Cloud Run: the Cold-Starts guide") == "cloud cold guide run starts"
+
+
+async def test_deleting_a_material_drops_its_digests(vectorstore, digests):
+    assert digests.find("concurrency") is not None
+
+    await vectorstore.delete_document("guide")
+
+    assert digests.find("concurrency") is None
+
+
+async def test_reindexing_a_material_drops_its_digests(vectorstore, digests):
+    assert digests.find("concurrency") is not None
+
+    await vectorstore.index_document("guide", "# Replaced\n\n" + body("New"), {"filename": "cloud-run.md"})
+
+    assert digests.find("concurrency") is None
@@ -0,0 +1,127 @@
+"""Streaming multipart uploads (spool_upload)."""
+import glob
+import hashlib
+import os
+import tempfile
+
+import pytest
+from starlette.requests import Request
+
+from app.services.uploads import UploadError, UploadTooLargeError, spool_upload
+
+
+pytestmark = pytest.mark.anyio
+
+BOUNDARY = "testboundary"
+ALLOWED = {".txt", ".md", ".pdf"}
+
+
+def _multipart(content: bytes, filename: str = "notes.txt", field: str = "file") -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        "Content-Type: text/plain\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def _request(body: bytes, piece: int = 1000, content_type: str = f"multipart/form-data; boundary={BOUNDARY}",
+             content_length: bool = False) -> Request:
+    """A request whose body arrives in `piece`-byte messages (chunked unless content_length)."""
+    headers = [(b"content-type", content_type.encode())]
+    if content_length:
+        headers.append((b"content-length", str(len(body)).encode()))
+    messages = [
+        {"type": "http.request", "body": body[i:i + piece], "more_body": i + piece < len(body)}
+        for i in range(0, len(body), piece)
+    ] or [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        return messages.pop(0)
+    return Request({"type": "http", "method": "POST", "headers": headers}, receive)
+
+
+def _spooled_files() -> set[str]:
+    return set(glob.glob(os.path.join(tempfile.gettempdir(), "upload_*")))
+
+
+async def test_file_is_spooled_with_its_hash():
+    content = os.urandom(50_000)
+
+    upload = await spool_upload(_request(_multipart(content)), max_bytes=100_000, allowed_extensions=ALLOWED)
+
+    try:
+        assert (upload.filename, upload.extension, upload.size) == ("notes.txt", ".txt", len(content))
+        assert upload.sha256 == hashlib.sha256(content).hexdigest()
+        with open(upload.path, "rb") as f:
+            assert f.read() == content
+    finally:
+        upload.cleanup()
+    assert not os.path.exists(upload.path)
+
+
+async def test_declared_size_over_the_limit_is_rejected_before_reading():
+    received = []
+    request = _request(_multipart(b"x" * 2000), content_length=True)
+    receive = request._receive
+
+    async def tracking_receive():
+        received.append(True)
+        return await receive()
+    request._receive = tracking_receive
+
+    with pytest.raises(UploadTooLargeError):
+        await spool_upload(request, max_bytes=1000, allowed_extensions=ALLOWED)
+    assert not received
+
+
+async def test_streamed_size_over_the_limit_is_rejected():
+    before = _spooled_files()
+
+    with pytest.raises(UploadTooLargeError):
+        await spool_upload(_request(_multipart(b"x" * 5000)), max_bytes=4096, allowed_extensions=ALLOWED)
+
+    assert _spooled_files() == before
+
+
+@pytest.mark.parametrize("body, content_type, message", [
+    (b"file=notes.txt", "application/x-www-form-urlencoded", "Expected a multipart"),
+    (b"--testboundary\r\nContent-Disposition: form-data; name", None, "Invalid multipart data"),
+    (b"garbage\r\n", None, "Invalid multipart data"),
+    # Truncated inside the file's data
+    (_multipart(b"notes")[:-20], None, "Invalid multipart data"),
+])
+async def test_malformed_requests_are_rejected(body, content_type, message):
+    before = _spooled_files()
+    kwargs = {"content_type": content_type} if content_type else {}
+
+    with pytest.raises(UploadError, match=message):
+        await spool_upload(_request(body, **kwargs), max_bytes=100_000, allowed_extensions=ALLOWED)
+
+    assert _spooled_files() == before
+
+
+async def test_missing_field_and_bad_extension_are_rejected():
+    with pytest.raises(UploadError, match="Missing file field 'file'"):
+        await spool_upload(_request(_multipart(b"notes", field="other")), max_bytes=1000, allowed_extensions=ALLOWED)
+    with pytest.raises(UploadError, match="Invalid file type"):
+        await spool_upload(_request(_multipart(b"notes", filename="run.exe")), max_bytes=1000, allowed_extensions=ALLOWED)
+
+
+@pytest.fixture
+def one_mb_uploads(monkeypatch):
+    monkeypatch.setenv("MAX_UPLOAD_MB", "1")
+
+
+async def test_upload_route_maps_errors_to_status_codes(one_mb_uploads, client):
+    too_large = await client.post(
+        "/api/v1/materials/upload", files={"file": ("big.txt", b"x" * (1024 * 1024 + 1), "text/plain")}
+    )
+    malformed = await client.post(
+        "/api/v1/materials/upload",
+        content=b"--testboundary\r\nbroken",
+        headers={"content-type": f"multipart/form-data; boundary={BOUNDARY}"},
+    )
+
+    assert too_large.status_code == 413
+    assert malformed.status_code == 400
+    assert malformed.json()["detail"] == "Invalid multipart data"
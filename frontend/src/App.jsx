@@ -9,6 +9,7 @@ import { VoiceRecorder } from './components/VoiceRecorder';
 import { AssessmentReport } from './components/AssessmentReport';
 import { LoadingBar } from './components/LoadingBar';
 import { Button } from './components/ui/Button';
+import { Card, CardHeader, CardTitle, CardContent } from './components/ui/Card';
 import { useSpeechToText } from './hooks/useSpeechToText';
 import { useInterview } from './hooks/useInterview';
 
@@ -20,6 +21,7 @@ function App() {
         session,
         currentQuestion,
         assessment,
+        feedback,
         isLoading,
         error: interviewError,
         status,
@@ -172,8 +174,27 @@ function App() {
                                 disabled={isLoading}
                             />
 
-                            {/* Loading State - Assessing Answer */}
-                            {isLoading && status === 'assessing' && (
+                            {/* Assessment of the last answer, shown as it streams in */}
+                            {feedback && (
+                                <motion.div
+                                    initial={{ opacity: 0, y: 10 }}
+                                    animate={{ opacity: 1, y: 0 }}
+                                >
+                                    <Card glass>
+                                        <CardHeader>
+                                            <CardTitle className="text-base">Feedback on your answer</CardTitle>
+                                        </CardHeader>
+                                        <CardContent>
+                                            <p className="text-sm leading-relaxed text-muted-foreground whitespace-pre-wrap">
+                                                {feedback}
+                                            </p>
+                                        </CardContent>
+                                    </Card>
+                                </motion.div>
+                            )}
+
+                            {/* Loading State - Assessing Answer (until the first tokens arrive) */}
+                            {isLoading && status === 'assessing' && !feedback && (
                                 <motion.div
                                     initial={{ opacity: 0, y: 10 }}
                                     animate={{ opacity: 1, y: 0 }}
@@ -70,6 +70,52 @@ export async function submitAnswer(threadId, transcript) {
     });
 }
 
+/**
+ * Submit an answer and stream the assessment and next question as
+ * Server-Sent Events. `onEvent(event, data)` is called for every event
+ * (assessment_token, assessment, question_token, question, done, error).
+ */
+export async function streamAnswer(threadId, transcript, onEvent) {
+    const response = await fetch(`${API_BASE}/interview/${threadId}/stream`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ transcript })
+    });
+
+    if (!response.ok) {
+        const error = await response.json().catch(() => ({ detail: 'Unknown error' }));
+        throw new Error(error.detail || `Request failed: ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const frame = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            for (const line of frame.split('\n')) {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            }
+            const payload = data ? JSON.parse(data) : null;
+            if (event === 'error') {
+                throw new Error(payload?.detail || 'Streaming failed');
+            }
+            onEvent(event, payload);
+        }
+    }
+}
+
 export async function approveAssessment(threadId, action = 'approve') {
     return request(`/interview/approve?thread_id=${threadId}&action=${action}`, {
         method: 'POST'
@@ -9,6 +9,7 @@ export function useInterview() {
     const [session, setSession] = useState(null);
     const [currentQuestion, setCurrentQuestion] = useState(null);
     const [assessment, setAssessment] = useState(null);
+    const [feedback, setFeedback] = useState(''); // assessment of the last answer, streamed
     const [isLoading, setIsLoading] = useState(false);
     const [error, setError] = useState(null);
     const [status, setStatus] = useState('idle'); // idle, starting, questioning, recording, assessing, complete
@@ -52,25 +53,32 @@ export function useInterview() {
 
         setIsLoading(true);
         setError(null);
+        setFeedback('');
         setStatus('assessing');
 
         try {
-            const response = await api.submitAnswer(session.thread_id, transcript);
-
-            // Always try to get the next question after submitting
-            try {
-                const questionData = await api.getQuestion(session.thread_id);
-                setCurrentQuestion(prev => ({
-                    ...questionData,
-                    // Increment question number if not a follow-up
-                    question_number: questionData.is_followup
-                        ? prev?.question_number || 1
-                        : (prev?.question_number || 0) + 1
-                }));
-            } catch (questionErr) {
-                console.log('No more questions or error getting next:', questionErr);
-                // Keep current question if we can't get a new one
-            }
+            // Stream assessment and next-question tokens as they are generated
+            let response = null;
+            let streamedQuestion = '';
+            let streamedFeedback = '';
+            await api.streamAnswer(session.thread_id, transcript, (event, data) => {
+                if (event === 'assessment_token') {
+                    streamedFeedback += data.token;
+                    setFeedback(streamedFeedback);
+                } else if (event === 'assessment') {
+                    response = { thread_id: session.thread_id, has_followup: data.needs_followup };
+                } else if (event === 'question_token') {
+                    streamedQuestion += data.token;
+                    setCurrentQuestion(prev => ({ ...prev, question: streamedQuestion }));
+                } else if (event === 'question') {
+                    setCurrentQuestion(prev => ({
+                        ...prev,
+                        question: data.question,
+                        question_number: data.question_number,
+                        is_followup: data.is_followup
+                    }));
+                }
+            });
 
             setStatus('questioning');
             return response;
@@ -155,6 +163,7 @@ export function useInterview() {
         setSession(null);
         setCurrentQuestion(null);
         setAssessment(null);
+        setFeedback('');
         setStatus('idle');
         setError(null);
     }, [session]);
@@ -167,6 +176,7 @@ export function useInterview() {
         session,
         currentQuestion,
         assessment,
+        feedback,
         isLoading,
         error,
         status,